@@ -1,18 +1,139 @@
+import importlib
+import importlib.util
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 from typing import Callable
 
 from qiskit import QiskitError
 
 from api.CircuitComponent import CircuitComponent
 from api.CircuitNotSupportedError import CircuitNotSupportedError
-from api.Metrics import default_metric, gate_count_cache, gate_depth_cache, cz_count_cache, cz_depth_cache
+from api.ComponentCache import ComponentCache
+from api.Metrics import default_metric, get_metric_name, is_persistable_metric_name, get_cached_metric_value, \
+    merge_metric_cache_entries, metric_caches
 from api.NameFilters import default_name_filter
+from api.PersistentCache import get_persistent_cache, enable_persistent_cache, disable_persistent_cache
+from resource_estimation.automatic_optimisation import configure_pass_manager, get_pass_manager_configuration
+
+
+# Implementations per circuit type as class paths, only imported once a choice needs them.
+# The order matters: on equal metric values the last implementation is chosen.
+default_registry = {
+    "QCIncrementer": [
+        "impl.addition.qc.incrementer.BasicIncrementer.BasicIncrementer",
+        "impl.addition.qc.incrementer.HRSIncrementer.HRSIncrementer",
+        "impl.addition.qc.incrementer.HRSCleanIncrementer.HRSCleanIncrementer",
+        "impl.addition.qc.incrementer.GidneyIncrementer.GidneyIncrementer",
+    ],
+    "QCAdderIP": [
+        # Not a classical circuit (rotations), so it is listed first and never chosen on a tie.
+        "impl.addition.qc.BeauregardConstantAdderIP.BeauregardConstantAdderIP",
+        "impl.addition.qc.BasicConstantAdderIP.BasicConstantAdderIP",
+        "impl.addition.qc.HRSConstantAdderIP.HRSConstantAdderIP",
+        "impl.addition.qc.HRSCleanConstantAdderIP.HRSCleanConstantAdderIP",
+        "impl.addition.qc.copy_controlling.CopyCTRLConstantAdderIP.CopyCTRLConstantAdderIP",
+    ],
+    "QCComparator": [
+        "impl.comparator.qc.QiskitComparator.QiskitComparator",
+        "impl.comparator.qc.HRSComparator.HRSComparator",
+    ],
+    "QCModAdderIP": [
+        "impl.addition.qc.modular.HRSConstantModularAdderIP.HRSConstantModularAdderIP",
+        "impl.addition.qc.modular.RCConstantModularAdderIP.RCConstantModularAdderIP",
+    ],
+    "QQAdderIP": [
+        # Not a classical circuit (rotations), so it is listed first and never chosen on a tie.
+        "impl.addition.qq.DraperAdderIP.DraperAdderIP",
+        # Listed first so that it is only chosen if it scores strictly better than the other classical adders.
+        "impl.addition.qq.CDKMLogicalAndAdderIP.CDKMLogicalAndAdderIP",
+        "impl.addition.qq.TTKAdderIP.TTKAdderIP",
+        "impl.addition.qq.CDKMAdderIP.CDKMAdderIP",
+        "impl.addition.qq.DKRSAdderIP.DKRSAdderIP",
+        "impl.addition.qq.OTUSAdderIP.OTUSAdderIP",
+    ],
+    "QQComparator": [
+        "impl.comparator.qq.CDKMComparator.CDKMComparator",
+        "impl.comparator.qq.FullSubtractionComparator.FullSubtractionComparator",
+        "impl.comparator.qq.ParallelComparator.ParallelComparator",
+        "impl.comparator.qq.XLZLXComparator.XLZLXComparator",
+    ],
+    "QQModAdderIP": [
+        "impl.addition.qq.modular.RNSLModularAdderIP.RNSLModularAdderIP",
+    ],
+    "QCModDoublerIP": [
+        "impl.multiplication.qc.modular.doubling.RNSLModularDoublerIP.RNSLModularDoublerIP",
+    ],
+    "QCModMulOOP": [
+        # Listed first so that it is only chosen if it scores strictly better than the other multipliers.
+        "impl.multiplication.qc.modular.WindowedConstantModularMultiplierOOP.WindowedConstantModularMultiplierOOP",
+        "impl.multiplication.qc.modular.HRSConstantModularMultiplierOOP.HRSConstantModularMultiplierOOP",
+        "impl.multiplication.qc.modular.RCConstantModularMultiplierOOP.RCConstantModularMultiplierOOP",
+    ],
+    "QCModMulIP": [
+        "impl.multiplication.qc.modular.HRSConstantModularMultiplierIP.HRSConstantModularMultiplierIP",
+    ],
+    "QQModInversionOOP": [
+        # Listed first so that it is only chosen if it scores strictly better than Fermat's inversion.
+        "impl.multiplication.qq.inversion.KaliskiModularInversion.KaliskiModularInversion",
+        "impl.multiplication.qq.inversion.FermatModularInversion.FermatModularInversion",
+    ],
+    "QQModMulOOP": [
+        # Listed first so that they are only chosen if they score strictly better than the PZ multiplier.
+        "impl.multiplication.qq.modular.MontgomeryModularMultiplierOOP.MontgomeryModularMultiplierOOP",
+        "impl.multiplication.qq.modular.KaratsubaModularMultiplierOOP.KaratsubaModularMultiplierOOP",
+        "impl.multiplication.qq.modular.PZModularMultiplierOOP.PZModularMultiplierOOP",
+    ],
+    "QCModSquaringOOP": [
+        "impl.multiplication.qc.modular.squaring.RNSLModularSquaringOOP.RNSLModularSquaringOOP",
+    ],
+    "QCModularNegationIP": [
+        "impl.addition.qc.modular.negation.RNSLModularNegationIP.RNSLModularNegationIP",
+    ],
+    "QCModExpIP": [
+        # Listed first so that it is only chosen if it scores strictly better than the HRS exponentiation.
+        "impl.exponentiation.qc.modular.WindowedConstantModExpIP.WindowedConstantModExpIP",
+        "impl.exponentiation.qc.modular.HRSConstantModExpIP.HRSConstantModExpIP",
+    ],
+    "QCECPointAdderIP": [
+        "impl.ec_point_addition.qc.RNSLECPointAdderIP.RNSLECPointAdderIP",
+    ],
+    "QCWindowedECPointAdderIP": [
+        "impl.ec_point_addition.qc.WindowedECPointAdderIP.WindowedECPointAdderIP",
+    ],
+}
 
 
 class CircuitChooser:
     _instance = None
-    _name_filter: Callable[[str], bool] = default_name_filter.__call__
-    _metric: Callable[[CircuitComponent], float] = default_metric.__call__
-    cache = {}
+    __name_filter: Callable[[str], bool] = default_name_filter.__call__
+    __metric: Callable[[CircuitComponent], float] = default_metric.__call__
+    # Circuits of the components by identifier, unbounded unless configured otherwise.
+    cache = ComponentCache()
+    # Chosen components per (circuit_type, args, dirty_available, clean_available).
+    decision_cache = {}
+    # Optional pool of worker processes to score candidates concurrently.
+    _executor: ProcessPoolExecutor = None
+    _executor_max_workers: int = None
+
+    @property
+    def _name_filter(self) -> Callable[[str], bool]:
+        return self.__name_filter
+
+    @_name_filter.setter
+    def _name_filter(self, name_filter: Callable[[str], bool]):
+        # Decisions made under another filter are no longer valid.
+        self.__name_filter = name_filter
+        self.decision_cache.clear()
+
+    @property
+    def _metric(self) -> Callable[[CircuitComponent], float]:
+        return self.__metric
+
+    @_metric.setter
+    def _metric(self, metric: Callable[[CircuitComponent], float]):
+        # Decisions made under another metric are no longer valid.
+        self.__metric = metric
+        self.decision_cache.clear()
 
     def __new__(cls, *args, **kwargs):
         """Ensures only one instance of CircuitChooser is created (Singleton pattern)."""
@@ -26,149 +147,93 @@ class CircuitChooser:
             return
         self._initialized = True
 
+        # Registered implementations per circuit type (class paths or classes).
+        self.registry = {circuit_type: list(paths) for circuit_type, paths in default_registry.items()}
+        # Imported implementation classes per circuit type by class name (filled lazily).
         self.circuit_types = {}
 
-        from impl.addition.qc.incrementer.BasicIncrementer import BasicIncrementer
-        from impl.addition.qc.incrementer.HRSIncrementer import HRSIncrementer
-        from impl.addition.qc.incrementer.HRSCleanIncrementer import HRSCleanIncrementer
-        from impl.addition.qc.incrementer.GidneyIncrementer import GidneyIncrementer
-
-        # Register all the circuit types we have.
-        self.circuit_types["QCIncrementer"] = [
-            type(BasicIncrementer(0, 0, 0, 0, 0)),
-            type(HRSIncrementer(0, 0, 0, 0, 0)),
-            type(HRSCleanIncrementer(0, 0, 0, 0, 0)),
-            type(GidneyIncrementer(2, 0, 0, 0, 0))
-        ]
-
-        from impl.addition.qc.BasicConstantAdderIP import BasicConstantAdderIP
-        from impl.addition.qc.HRSConstantAdderIP import HRSConstantAdderIP
-        from impl.addition.qc.HRSCleanConstantAdderIP import HRSCleanConstantAdderIP
-        from impl.addition.qc.copy_controlling.CopyCTRLConstantAdderIP import CopyCTRLConstantAdderIP
-
-        self.circuit_types["QCAdderIP"] = [
-            type(BasicConstantAdderIP(0, 0, 0, 0, 0)),
-            type(HRSConstantAdderIP(0, 0, 0, 0, 0)),
-            type(HRSCleanConstantAdderIP(0, 0, 0, 0, 0)),
-            type(CopyCTRLConstantAdderIP(0, 0, 0, 0, 0)),
-        ]
-
-        from impl.comparator.qc.HRSComparator import HRSComparator
-        from impl.comparator.qc.QiskitComparator import QiskitComparator
-
-        self.circuit_types["QCComparator"] = [
-            type(QiskitComparator(0, 0, 0, 0, 0)),
-            type(HRSComparator(0, 0, 0, 0, 0)),
-        ]
-
-        from impl.addition.qc.modular.HRSConstantModularAdderIP import HRSConstantModularAdderIP
-        from impl.addition.qc.modular.RCConstantModularAdderIP import RCConstantModularAdderIP
-
-        self.circuit_types["QCModAdderIP"] = [
-            type(HRSConstantModularAdderIP(0, 0, 0, 0, 0)),
-            type(RCConstantModularAdderIP(0, 0, 0, 0, 0))
-        ]
-
-        from impl.addition.qq.TTKAdderIP import TTKAdderIP
-        from impl.addition.qq.CDKMAdderIP import CDKMAdderIP
-        from impl.addition.qq.DKRSAdderIP import DKRSAdderIP
-        from impl.addition.qq.OTUSAdderIP import OTUSAdderIP
-
-        self.circuit_types["QQAdderIP"] = [
-            type(TTKAdderIP(0, 0, 0)),
-            type(CDKMAdderIP(0, 1, 0)),
-            type(DKRSAdderIP(0, 0, 0)),
-            type(OTUSAdderIP(0, 0, 0)),
-        ]
-
-        from impl.comparator.qq.CDKMComparator import CDKMComparator
-        from impl.comparator.qq.FullSubtractionComparator import FullSubtractionComparator
-        from impl.comparator.qq.ParallelComparator import ParallelComparator
-        from impl.comparator.qq.XLZLXComparator import XLZLXComparator
-
-        self.circuit_types["QQComparator"] = [
-            type(CDKMComparator(0, 0, 0, 0)),
-            type(FullSubtractionComparator(0, 0, 0, 0)),
-            type(ParallelComparator(0, 0, 0, 0)),
-            type(XLZLXComparator(0, 0, 0, 0))
-        ]
-
-        from impl.addition.qq.modular.RNSLModularAdderIP import RNSLModularAdderIP
-
-        self.circuit_types["QQModAdderIP"] = [
-            type(RNSLModularAdderIP(0, 0, 0, 0, 0))
-        ]
-
-        from impl.multiplication.qc.modular.doubling.RNSLModularDoublerIP import RNSLModularDoublerIP
-
-        self.circuit_types["QCModDoublerIP"] = [
-            type(RNSLModularDoublerIP(0, 0, 0, 1, 0))
-        ]
-
-        from impl.multiplication.qc.modular.HRSConstantModularMultiplierOOP import HRSConstantModularMultiplierOOP
-        from impl.multiplication.qc.modular.RCConstantModularMultiplierOOP import RCConstantModularMultiplierOOP
-
-        self.circuit_types["QCModMulOOP"] = [
-            type(HRSConstantModularMultiplierOOP(0, 0, 4, 3, 5, 0)),
-            type(RCConstantModularMultiplierOOP(0, 0, 4, 3, 5, 0))
-        ]
-
-        from impl.multiplication.qc.modular.HRSConstantModularMultiplierIP import HRSConstantModularMultiplierIP
-
-        self.circuit_types["QCModMulIP"] = [
-            type(HRSConstantModularMultiplierIP(0, 5, 4, 3, 5, 0))
-        ]
-
-        from impl.multiplication.qq.inversion.FermatModularInversion import FermatModularInversion
-
-        self.circuit_types["QQModInversionOOP"] = [
-            type(FermatModularInversion(0, 0, 4, 7, 0))
-        ]
-
-        from impl.multiplication.qq.modular.PZModularMultiplierOOP import PZModularMultiplierOOP
-
-        self.circuit_types["QQModMulOOP"] = [
-            type(PZModularMultiplierOOP(0, 0, 0, 0, 0))
-        ]
-
-        from impl.multiplication.qc.modular.squaring.RNSLModularSquaringOOP import RNSLModularSquaringOOP
-
-        self.circuit_types["QCModSquaringOOP"] = [
-            type(RNSLModularSquaringOOP(0, 0, 0, 1, 0))
-        ]
-
-        from impl.addition.qc.modular.negation.RNSLModularNegationIP import RNSLModularNegationIP
-
-        self.circuit_types["QCModularNegationIP"] = [
-            type(RNSLModularNegationIP(0, 0, 0, 0, 0))
-        ]
-
-        from impl.exponentiation.qc.modular.HRSConstantModExpIP import HRSConstantModExpIP
-
-        self.circuit_types["QCModExpIP"] = [
-            type(HRSConstantModExpIP(0, 0, 0, 0, 7, 0))
-        ]
-
-        from impl.ec_point_addition.qc.RNSLECPointAdderIP import RNSLECPointAdderIP
-
-        self.circuit_types["QCECPointAdderIP"] = [
-            type(RNSLECPointAdderIP(0, 0, 0, (0, 0), 7))
-        ]
+    def register_component(self, circuit_type: str, component: str | type):
+        """
+        Registers an implementation for a circuit type.
+        :param circuit_type: e.g. "QQAdderIP".
+        :param component: The class or its path, e.g. "impl.addition.qq.TTKAdderIP.TTKAdderIP".
+        """
+        if isinstance(component, str):
+            # Only check that the module exists, it is imported once a choice needs it.
+            module_path, _, class_name = component.rpartition(".")
+            try:
+                module_found = module_path != "" and importlib.util.find_spec(module_path) is not None
+            except ImportError:
+                module_found = False
+            if not module_found:
+                raise ValueError(f"Cannot find the module of {component}.")
+        elif not isinstance(component, type):
+            raise ValueError(f"Expected a class or a class path, got {component!r}.")
+        self.registry.setdefault(circuit_type, []).append(component)
+        self.circuit_types.pop(circuit_type, None)
+        self.decision_cache.clear()
+
+    def _get_constructors(self, circuit_type: str) -> list[type]:
+        """
+        Imports the implementations of a circuit type which pass the name filter.
+        """
+        resolved = self.circuit_types.setdefault(circuit_type, {})
+        constructors = []
+        for component in self.registry[circuit_type]:
+            name = component.rsplit(".", 1)[-1] if isinstance(component, str) else component.__name__
+            if not self._name_filter(name):
+                continue
+            if name not in resolved:
+                if isinstance(component, str):
+                    module_path, class_name = component.rsplit(".", 1)
+                    module = importlib.import_module(module_path)
+                    if not hasattr(module, class_name):
+                        raise ValueError(f"Module {module_path} has no implementation {class_name}.")
+                    resolved[name] = getattr(module, class_name)
+                else:
+                    resolved[name] = component
+            constructors.append(resolved[name])
+        return constructors
 
     def choose_component(self, circuit_type, args: (), dirty_available: int = 0,
                          clean_available: int = 0) -> CircuitComponent:
         if self._metric is None:
             raise ValueError("Metric is not set")
 
+        decision_key = (circuit_type, args, dirty_available, clean_available)
+        try:
+            if decision_key in self.decision_cache:
+                return self.decision_cache[decision_key]
+        except TypeError:
+            # Unhashable arguments, do not memoize.
+            decision_key = None
+
+        constructors = self._get_constructors(circuit_type)
+
+        # A previous run (possibly another process) may have already made this choice.
+        persistent_cache = get_persistent_cache()
+        metric_name = get_metric_name(self._metric)
+        if not is_persistable_metric_name(metric_name):
+            # Another metric with the same name may have made the persisted selection.
+            persistent_cache = None
+        selection_key = (circuit_type, args, dirty_available, clean_available, metric_name,
+                         tuple(constructor.__name__ for constructor in constructors))
+        if persistent_cache is not None:
+            selected_name = persistent_cache.get("selection", selection_key)
+            for constructor in constructors:
+                if constructor.__name__ == selected_name:
+                    try:
+                        component = constructor(dirty_available, clean_available, *args)
+                    except Exception as e:
+                        break
+                    if decision_key is not None:
+                        self.decision_cache[decision_key] = component
+                    return component
+
         components_to_consider = []
-        for constructor in self.circuit_types[circuit_type]:
+        for constructor in constructors:
             try:
-                name = constructor.__name__
-                if self._name_filter(name):
-                    components_to_consider.append(constructor(dirty_available, clean_available, *args))
-                else:
-                    # print(f"{name} was not chosen due to name filter.")
-                    continue
+                components_to_consider.append(constructor(dirty_available, clean_available, *args))
             except CircuitNotSupportedError as e:
                 # print(e) # Debugging
                 continue
@@ -181,13 +246,8 @@ class CircuitChooser:
         best_component = None
         best_value = float('inf')
 
-        for component in components_to_consider:
-            try:
-                value = self._metric(component)
-            except Exception as e:
-                # print(component) # Debugging
-                # import traceback  # Debugging
-                # traceback.print_exception(type(e), e, e.__traceback__)  # Debugging
+        for component, value in zip(components_to_consider, self._evaluate_metric(components_to_consider)):
+            if value is None:
                 continue
             # Check if there are even enough clean qubits
             # Then check the metric (expensive)
@@ -198,12 +258,125 @@ class CircuitChooser:
         if best_component is None:
             raise ValueError("No circuit could be found.")
 
+        if persistent_cache is not None:
+            persistent_cache.put("selection", selection_key, type(best_component).__name__)
+        if decision_key is not None:
+            self.decision_cache[decision_key] = best_component
+
         return best_component
 
+    def _evaluate_metric(self, components: list[CircuitComponent]) -> list:
+        """
+        Evaluates the metric on each component, using the worker pool if parallel evaluation is enabled.
+        :return: The metric value per component, or None if the metric could not be evaluated.
+        """
+        values = [None] * len(components)
+        pending = []
+        for i, component in enumerate(components):
+            value = get_cached_metric_value(self._metric, component)
+            if value is not None:
+                values[i] = value
+            else:
+                pending.append(i)
+
+        futures = {}
+        # Only worth it if there are at least two expensive evaluations.
+        if (self._executor is not None and len(pending) > 1
+                and get_metric_name(self._metric) != get_metric_name(default_metric)):
+            for i in pending:
+                futures[i] = self._executor.submit(_evaluate_metric_in_worker, self._metric, self._name_filter,
+                                                   components[i])
+
+        for i in pending:
+            if i in futures:
+                try:
+                    values[i], new_entries = futures[i].result()
+                    merge_metric_cache_entries(new_entries)
+                    continue
+                except Exception as e:
+                    # Fall back to evaluating it here (e.g. if the metric cannot be pickled).
+                    pass
+            try:
+                values[i] = self._metric(components[i])
+            except Exception as e:
+                # print(components[i]) # Debugging
+                # import traceback  # Debugging
+                # traceback.print_exception(type(e), e, e.__traceback__)  # Debugging
+                continue
+        return values
+
+    def enable_parallel_evaluation(self, max_workers: int = None):
+        """
+        Scores the candidates of each choice concurrently in a pool of worker processes.
+        Metric values computed by the workers (including those of sub-components) are merged into the metric caches.
+        The metric and name filter must be picklable, e.g. module-level functions or custom_name_filter.
+        :param max_workers: Number of worker processes, defaults to the number of CPUs.
+        """
+        self.disable_parallel_evaluation()
+        persistent_cache = get_persistent_cache()
+        CircuitChooser._executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_initialize_worker,
+            initargs=(None if persistent_cache is None else persistent_cache.path, get_pass_manager_configuration())
+        )
+        CircuitChooser._executor_max_workers = max_workers
+
+    def disable_parallel_evaluation(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            CircuitChooser._executor = None
+
+    def configure_pass_manager(self, basis_gates: list[str] = None, optimization_level: int = None,
+                               seed: int = None):
+        """
+        Changes the pass manager used by the transpilation based metrics (see automatic_optimisation.py).
+        Metric values and decisions of the previous configuration are discarded and running workers are restarted.
+        :param basis_gates: Basis gates to transpile to, None to keep the current ones.
+        :param optimization_level: Preset optimization level (0 to 3), None to keep the current one.
+        :param seed: Seed of the transpiler's stochastic passes, None to keep the current one.
+        """
+        configure_pass_manager(basis_gates, optimization_level, seed)
+        self.decision_cache.clear()
+        for metric_cache in metric_caches.values():
+            metric_cache.clear()
+        if self._executor is not None:
+            self.enable_parallel_evaluation(self._executor_max_workers)
+
     def clear_caches(self):
         self.cache.clear()
-
-        gate_count_cache.clear()
-        gate_depth_cache.clear()
-        cz_count_cache.clear()
-        cz_depth_cache.clear()
+        self.decision_cache.clear()
+
+        for metric_cache in metric_caches.values():
+            metric_cache.clear()
+
+
+def _initialize_worker(persistent_cache_path: str, pass_manager_configuration: dict):
+    # Workers evaluate sequentially and need their own database connection.
+    CircuitChooser._executor = None
+    # Only configured here, the pass manager itself is built on the worker's first transpilation.
+    configure_pass_manager(**pass_manager_configuration)
+    if persistent_cache_path is not None:
+        enable_persistent_cache(persistent_cache_path)
+    else:
+        disable_persistent_cache()
+
+
+def _evaluate_metric_in_worker(metric: Callable[[CircuitComponent], float], name_filter: Callable[[str], bool],
+                               component: CircuitComponent) -> (float, dict[str, list]):
+    """
+    Evaluates the metric on the component in a worker process.
+    :return: The metric value and the metric cache entries that were added while evaluating it.
+    """
+    chooser = CircuitChooser()
+    # Only assign on change, as assigning invalidates the worker's decisions.
+    if chooser._metric != metric:
+        chooser._metric = metric
+    if chooser._name_filter != name_filter:
+        chooser._name_filter = name_filter
+
+    sizes = {cache_name: len(cache) for cache_name, cache in metric_caches.items()}
+    value = metric(component)
+    # Dicts keep insertion order, so the new entries are at the end.
+    new_entries = {cache_name: list(islice(cache.items(), sizes[cache_name], None))
+                   for cache_name, cache in metric_caches.items()}
+    return value, new_entries
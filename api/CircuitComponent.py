@@ -1,3 +1,4 @@
+from collections import Counter
 from typing import Hashable
 
 from qiskit import QuantumCircuit
@@ -19,6 +20,33 @@ class CircuitComponent:
         """
         raise NotImplementedError()
 
+    def get_reversed_circuit(self) -> QuantumCircuit:
+        """
+        The reversed circuit (see QuantumCircuit.reverse_ops), which uncomputes the circuit (e.g. subtracts).
+        It is built once and cached alongside the circuit, so repeated uncomputations do not copy it again.
+        :return: QuantumCircuit
+        """
+        # Imported here, as the CircuitChooser imports this module.
+        from api.CircuitChooser import CircuitChooser
+        cache = CircuitChooser().cache
+
+        reversed_identifier = (self.get_global_identifier(), "reversed")
+        if cache.get(reversed_identifier, None) is not None:
+            return cache[reversed_identifier]
+
+        reversed_circuit = self.get_circuit().reverse_ops()
+        cache[reversed_identifier] = reversed_circuit
+
+        return reversed_circuit
+
+    def get_cost_model(self) -> Counter | None:
+        """
+        Optional method to define the logical cost of the circuit in closed form, without building it.
+        The cost is a Counter mapping k to the number of X gates with k controls (see api/CostModel.py).
+        :return: The cost or None if there is no model for these parameters.
+        """
+        return None
+
     def get_global_identifier(self) -> Hashable:
         """
         Abstract method to define the global identifier.
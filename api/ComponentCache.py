@@ -0,0 +1,209 @@
+from collections import OrderedDict
+from typing import Hashable
+
+from qiskit import QuantumCircuit
+
+from api.StructuralHash import is_composite_operation
+
+# Rough memory footprint of one (nested) instruction of a QuantumCircuit.
+_bytes_per_instruction = 256
+
+
+def estimate_circuit_size(circuit: QuantumCircuit) -> int:
+    """
+    Estimates the memory footprint of a circuit in bytes.
+    Appended circuits are stored as copies of their definitions, so nested instructions are counted as well.
+    An instruction appended several times is only stored once, so its definition is only counted once.
+    :param circuit: The circuit.
+    :return: Estimated size in bytes.
+    """
+    if not isinstance(circuit, QuantumCircuit):
+        return _bytes_per_instruction
+
+    # Counted operations by id, they are kept alive as their ids could otherwise be reused.
+    counted = {}
+
+    def count(counted_circuit: QuantumCircuit) -> int:
+        instructions = 0
+        for instruction in counted_circuit.data:
+            instructions += 1
+            operation = instruction.operation
+            if is_composite_operation(operation) and id(operation) not in counted:
+                counted[id(operation)] = operation
+                instructions += count(operation.definition)
+        return instructions
+
+    return _bytes_per_instruction * (1 + count(circuit))
+
+
+class EvictionPolicy:
+    """
+    Decides which unpinned entries of a ComponentCache are evicted.
+    The default policy never evicts anything.
+    """
+
+    # Whether the policy needs the sizes of the entries (these are expensive to estimate).
+    needs_size = False
+
+    def admit(self, key: Hashable, size: int):
+        pass
+
+    def touch(self, key: Hashable):
+        pass
+
+    def remove(self, key: Hashable):
+        pass
+
+    def victims(self) -> list:
+        """
+        :return: Keys which should be evicted now.
+        """
+        return []
+
+    def clear(self):
+        pass
+
+
+class LRUSizePolicy(EvictionPolicy):
+    """
+    Evicts the least recently used entries once the estimated size of all entries exceeds the budget.
+    """
+
+    needs_size = True
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.sizes = OrderedDict()
+        self.total_bytes = 0
+
+    def admit(self, key: Hashable, size: int):
+        self.remove(key)
+        self.sizes[key] = size
+        self.total_bytes += size
+
+    def touch(self, key: Hashable):
+        if key in self.sizes:
+            self.sizes.move_to_end(key)
+
+    def remove(self, key: Hashable):
+        if key in self.sizes:
+            self.total_bytes -= self.sizes.pop(key)
+
+    def victims(self) -> list:
+        victims = []
+        total_bytes = self.total_bytes
+        for key, size in self.sizes.items():
+            # Never evict the most recent entry, it is about to be used.
+            if total_bytes <= self.max_bytes or len(victims) == len(self.sizes) - 1:
+                break
+            victims.append(key)
+            total_bytes -= size
+        return victims
+
+    def clear(self):
+        self.sizes.clear()
+        self.total_bytes = 0
+
+
+class ComponentCache:
+    """
+    Dictionary-like cache of component circuits by identifier, with a pluggable eviction policy.
+
+    Pinned entries form a separate tier which is never evicted, entries can be pinned explicitly
+    or automatically once they have been hit pin_after_hits times (useful for high-reuse leaves).
+    Only get() counts hits and misses, as components call get() before indexing.
+    """
+
+    def __init__(self, policy: EvictionPolicy = None, pin_after_hits: int = None):
+        self.entries = {}
+        self.pinned = set()
+        self.policy = EvictionPolicy() if policy is None else policy
+        self.pin_after_hits = pin_after_hits
+        self.entry_hits = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def configure(self, policy: EvictionPolicy = None, pin_after_hits: int = None):
+        """
+        Replaces the eviction policy, e.g. CircuitChooser().cache.configure(LRUSizePolicy(4 * 1024 ** 3), 10).
+        :param policy: The new policy, None for an unbounded cache.
+        :param pin_after_hits: Number of hits after which an entry is pinned, None to only pin explicitly.
+        """
+        self.policy = EvictionPolicy() if policy is None else policy
+        self.pin_after_hits = pin_after_hits
+        for key, value in self.entries.items():
+            if key not in self.pinned:
+                self.policy.admit(key, estimate_circuit_size(value) if self.policy.needs_size else 0)
+        self._evict()
+
+    def get(self, key: Hashable, default=None):
+        if key not in self.entries:
+            self.misses += 1
+            return default
+        self.hits += 1
+        if key not in self.pinned:
+            self.entry_hits[key] = self.entry_hits.get(key, 0) + 1
+            if self.pin_after_hits is not None and self.entry_hits[key] >= self.pin_after_hits:
+                self.pin(key)
+            else:
+                self.policy.touch(key)
+        return self.entries[key]
+
+    def __getitem__(self, key: Hashable):
+        value = self.entries[key]
+        self.policy.touch(key)
+        return value
+
+    def __setitem__(self, key: Hashable, value):
+        self.entries[key] = value
+        if key not in self.pinned:
+            self.policy.admit(key, estimate_circuit_size(value) if self.policy.needs_size else 0)
+            self._evict()
+
+    def __delitem__(self, key: Hashable):
+        del self.entries[key]
+        self.pinned.discard(key)
+        self.entry_hits.pop(key, None)
+        self.policy.remove(key)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def pin(self, key: Hashable):
+        """
+        Moves an entry to the pinned tier, where it is never evicted.
+        """
+        if key in self.entries:
+            self.pinned.add(key)
+            self.policy.remove(key)
+
+    def unpin(self, key: Hashable):
+        if key in self.pinned:
+            self.pinned.discard(key)
+            self.entry_hits.pop(key, None)
+            self.policy.admit(key, estimate_circuit_size(self.entries[key]) if self.policy.needs_size else 0)
+            self._evict()
+
+    def clear(self):
+        self.entries.clear()
+        self.pinned.clear()
+        self.entry_hits.clear()
+        self.policy.clear()
+
+    def statistics(self) -> dict:
+        return {
+            "entries": len(self.entries),
+            "pinned": len(self.pinned),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def _evict(self):
+        for key in self.policy.victims():
+            del self[key]
+            self.evictions += 1
@@ -0,0 +1,82 @@
+from collections import Counter
+
+from qiskit import QuantumCircuit
+from qiskit.circuit import ControlledGate
+
+from api.CircuitComponent import CircuitComponent
+
+
+# A (logical) cost is a Counter mapping k to the number of X gates with k controls,
+# i.e. cost[0] are X gates, cost[1] CNOTs, cost[2] Toffolis and cost[k] for k > 2 multi-controlled X gates.
+
+
+def controlled_cost(cost: Counter, c: int) -> Counter:
+    """
+    Cost of a circuit, if every X gate of it receives c additional controls.
+    :param cost: Cost of the uncontrolled circuit.
+    :param c: Number of additional controls.
+    :return: Cost of the controlled circuit.
+    """
+    return Counter({k + c: count for k, count in cost.items()})
+
+
+def toffoli_count(cost: Counter) -> int:
+    """
+    Toffoli count, where an X gate with k > 2 controls is counted as 2k - 3 Toffolis (V-chain decomposition).
+    """
+    return sum(count * (2 * k - 3) for k, count in cost.items() if k >= 2)
+
+
+def cnot_count(cost: Counter) -> int:
+    return cost[1]
+
+
+def logical_cost_circuit(circuit: QuantumCircuit) -> Counter:
+    """
+    Counts the (multi-)controlled X gates of a circuit by walking its instruction hierarchy, without transpiling.
+    Each distinct sub-circuit is only walked once. Gates which are neither X gates nor have a definition
+    (e.g. H, T, measurements) are not counted. A temporary logical-AND is counted as a Toffoli gate
+    and its uncomputation is free.
+    :param circuit: The circuit.
+    :return: Cost of the circuit.
+    """
+    memo = {}
+
+    def walk(walked_circuit: QuantumCircuit) -> Counter:
+        cost = Counter()
+        for instruction in walked_circuit.data:
+            operation = instruction.operation
+            if operation.name == 'x':
+                cost[0] += 1
+            elif operation.name == 'logical_and':
+                # See impl/util/logical_and.py, its uncomputation is measurement-based.
+                cost[2] += 1
+            elif operation.name == 'logical_and_dg':
+                pass
+            elif isinstance(operation, ControlledGate) and operation.base_gate.name == 'x':
+                cost[operation.num_ctrl_qubits] += 1
+                # Open controls are implemented by X gates before and after.
+                open_controls = operation.num_ctrl_qubits - bin(operation.ctrl_state).count('1')
+                cost[0] += 2 * open_controls
+            elif getattr(operation, 'definition', None) is not None:
+                if id(operation) not in memo:
+                    definition = operation.definition
+                    # Keep the definition alive, as its id could otherwise be reused.
+                    memo[id(operation)] = (operation, definition, walk(definition))
+                cost.update(memo[id(operation)][2])
+        return cost
+
+    return walk(circuit)
+
+
+def validate_cost_model(component: CircuitComponent) -> (Counter, Counter):
+    """
+    Compares the cost model of a component against the cost of its generated circuit.
+    :param component: Component which declares a cost model.
+    :return: The modelled cost and the counted cost (which should be equal).
+    """
+    model = component.get_cost_model()
+    if model is None:
+        raise ValueError(f"{type(component).__name__} has no cost model for these parameters.")
+    # Remove zero entries, so that the Counters compare equal.
+    return +model, +logical_cost_circuit(component.get_circuit())
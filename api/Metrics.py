@@ -1,8 +1,12 @@
+from collections import Counter
 from typing import Hashable
 
 from qiskit import QuantumCircuit
 
 from api.CircuitComponent import CircuitComponent
+from api.CostModel import logical_cost_circuit, toffoli_count, cnot_count
+from api.PersistentCache import get_persistent_cache
+from api.StructuralHash import structural_hash
 from resource_estimation.automatic_optimisation import auto_opt  # , auto_opt_solovay_kitaev, remove_cl_operations
 
 
@@ -10,80 +14,189 @@ def default_metric(component: CircuitComponent) -> float:
     return 0
 
 
-def gate_count_metric(component: CircuitComponent) -> float:
-    return gate_count_metric_circuit(component.get_circuit(), component.get_global_identifier())
+def get_metric_name(metric) -> str:
+    """
+    Returns the name of a metric (module and qualified name), used to key cached metric values and selections.
+    :param metric: Metric function, or its bound __call__.
+    :return: Name of the metric, e.g. api.Metrics.gate_count_metric.
+    """
+    # Unwrap e.g. gate_count_metric.__call__
+    metric = getattr(metric, '__self__', metric)
+    if hasattr(metric, '__qualname__'):
+        return f"{metric.__module__}.{metric.__qualname__}"
+    # Metric objects, their representation has to tell their parameters apart.
+    return f"{type(metric).__module__}.{metric!r}"
+
+
+def is_persistable_metric_name(name: str) -> bool:
+    """
+    Whether selections made with a metric may be persisted, lambdas and local functions have no stable name
+    (e.g. all lambdas are called <lambda>).
+    """
+    return "<lambda>" not in name and "<locals>" not in name
+
+
+def _lookup(cache_name: str, cache: dict, identifier: Hashable):
+    """
+    Looks up a value in the in-memory cache and then in the persistent cache (if enabled).
+    """
+    if identifier is None:
+        return None
+    value = cache.get(identifier, None)
+    persistent_cache = get_persistent_cache()
+    if value is None and persistent_cache is not None:
+        value = persistent_cache.get(cache_name, identifier)
+        if value is not None:
+            cache[identifier] = value
+    return value
+
+
+def _store(cache_name: str, cache: dict, identifier: Hashable, value):
+    if identifier is None:
+        return
+    cache[identifier] = value
+    persistent_cache = get_persistent_cache()
+    if persistent_cache is not None:
+        persistent_cache.put(cache_name, identifier, value)
+
+
+metric_bundle_cache = {}
+
+
+def metric_bundle(component: CircuitComponent) -> dict:
+    # Avoid building the circuit if the values are already known.
+    bundle = _lookup("metric_bundle", metric_bundle_cache, component.get_global_identifier())
+    if bundle is not None:
+        return bundle
+    return metric_bundle_circuit(component.get_circuit(), component.get_global_identifier())
+
+
+def metric_bundle_circuit(circuit: QuantumCircuit, identifier: Hashable = None) -> dict:
+    """
+    Transpiles the circuit once and derives all transpilation based metrics from the result.
+    Results are also cached by the structural hash of the circuit, so that identical circuits are only
+    transpiled once.
+    :param circuit: The circuit.
+    :param identifier: Optional identifier to cache the result under.
+    :return: Dictionary with the keys gate_count, gate_depth, cz_count and cz_depth.
+    """
+    bundle = _lookup("metric_bundle", metric_bundle_cache, identifier)
+    if bundle is None:
+        # Components with other identifiers (e.g. other ancilla budgets) may have built the same circuit.
+        structural_identifier = ("structural_hash", structural_hash(circuit))
+        bundle = _lookup("metric_bundle", metric_bundle_cache, structural_identifier)
+        if bundle is None:
+            optimized = auto_opt(circuit)
+            gate_counts = dict(optimized.count_ops())
+            bundle = {
+                "gate_count": sum(gate_counts.values()),
+                "gate_depth": optimized.depth(),
+                "cz_count": gate_counts.get('cz', 0),
+                "cz_depth": optimized.depth(lambda gate: gate[0].name in ['cz']),
+            }
+            _store("metric_bundle", metric_bundle_cache, structural_identifier, bundle)
+        _store("metric_bundle", metric_bundle_cache, identifier, bundle)
+    return bundle
 
 
-gate_count_cache = {}
+def gate_count_metric(component: CircuitComponent) -> float:
+    return metric_bundle(component)["gate_count"]
 
 
 def gate_count_metric_circuit(circuit: QuantumCircuit, identifier: Hashable = None) -> float:
-    if identifier is None or gate_count_cache.get(identifier, None) is None:
-        result = sum(dict(auto_opt(circuit).count_ops()).values())
-        if identifier is not None:
-            gate_count_cache[identifier] = result
-            return result
-        else:
-            return result
-    else:
-        return gate_count_cache[identifier]
+    return metric_bundle_circuit(circuit, identifier)["gate_count"]
 
 
 def gate_depth_metric(component: CircuitComponent) -> float:
-    return gate_depth_metric_circuit(component.get_circuit(), component.get_global_identifier())
-
-
-gate_depth_cache = {}
+    return metric_bundle(component)["gate_depth"]
 
 
 def gate_depth_metric_circuit(circuit: QuantumCircuit, identifier: Hashable = None) -> float:
-    if identifier is None or gate_depth_cache.get(identifier, None) is None:
-        result = auto_opt(circuit).depth()
-        if identifier is not None:
-            gate_depth_cache[identifier] = result
-            return result
-        else:
-            return result
-    else:
-        return gate_depth_cache[identifier]
+    return metric_bundle_circuit(circuit, identifier)["gate_depth"]
 
 
 def cz_count_metric(component: CircuitComponent) -> float:
-    return cz_count_metric_circuit(component.get_circuit(), component.get_global_identifier())
-
-
-cz_count_cache = {}
+    return metric_bundle(component)["cz_count"]
 
 
 def cz_count_metric_circuit(circuit: QuantumCircuit, identifier: Hashable = None) -> float:
-    if identifier is None or cz_count_cache.get(identifier, None) is None:
-        result = dict(auto_opt(circuit).count_ops()).get('cz', 0)
-        if identifier is not None:
-            cz_count_cache[identifier] = result
-            return result
-        else:
-            return result
-    else:
-        return cz_count_cache[identifier]
+    return metric_bundle_circuit(circuit, identifier)["cz_count"]
 
 
 def cz_depth_metric(component: CircuitComponent) -> float:
-    return cz_depth_metric_circuit(component.get_circuit(), component.get_global_identifier())
-
-
-cz_depth_cache = {}
+    return metric_bundle(component)["cz_depth"]
 
 
 def cz_depth_metric_circuit(circuit: QuantumCircuit, identifier: Hashable = None) -> float:
-    if identifier is None or cz_depth_cache.get(identifier, None) is None:
-        result = auto_opt(circuit).depth(lambda gate: gate[0].name in ['cz'])
-        if identifier is not None:
-            cz_depth_cache[identifier] = result
-            return result
-        else:
-            return result
-    else:
-        return cz_depth_cache[identifier]
+    return metric_bundle_circuit(circuit, identifier)["cz_depth"]
+
+
+logical_cost_cache = {}
+
+
+def logical_cost(component: CircuitComponent) -> Counter:
+    """
+    Logical cost of a component (see api/CostModel.py).
+    Uses the cost model of the component if it has one, otherwise the circuit is counted without transpiling it.
+    :param component: The component.
+    :return: Counter mapping k to the number of X gates with k controls.
+    """
+    cost = _lookup("logical_cost", logical_cost_cache, component.get_global_identifier())
+    if cost is None:
+        cost = component.get_cost_model()
+        if cost is None:
+            cost = logical_cost_circuit(component.get_circuit())
+        _store("logical_cost", logical_cost_cache, component.get_global_identifier(), cost)
+    return cost
+
+
+def toffoli_count_metric(component: CircuitComponent) -> float:
+    return toffoli_count(logical_cost(component))
+
+
+def cnot_count_metric(component: CircuitComponent) -> float:
+    return cnot_count(logical_cost(component))
+
+
+# Caches of the metrics above by name, values are cached per component identifier.
+metric_caches = {
+    "metric_bundle": metric_bundle_cache,
+    "logical_cost": logical_cost_cache,
+}
+
+# For each cached metric: the cache it uses and how its value is derived from the cached entry.
+_cached_metrics = {
+    __name__ + ".gate_count_metric": ("metric_bundle", lambda bundle: bundle["gate_count"]),
+    __name__ + ".gate_depth_metric": ("metric_bundle", lambda bundle: bundle["gate_depth"]),
+    __name__ + ".cz_count_metric": ("metric_bundle", lambda bundle: bundle["cz_count"]),
+    __name__ + ".cz_depth_metric": ("metric_bundle", lambda bundle: bundle["cz_depth"]),
+    __name__ + ".toffoli_count_metric": ("logical_cost", toffoli_count),
+    __name__ + ".cnot_count_metric": ("logical_cost", cnot_count),
+}
+
+
+def get_cached_metric_value(metric, component: CircuitComponent):
+    """
+    Looks up the value of a metric for a component without building or transpiling its circuit.
+    :param metric: One of the metrics above (other metrics are never cached).
+    :param component: The component.
+    :return: The cached value or None.
+    """
+    metric_name = get_metric_name(metric)
+    if metric_name not in _cached_metrics:
+        return None
+    cache_name, derive = _cached_metrics[metric_name]
+    entry = _lookup(cache_name, metric_caches[cache_name], component.get_global_identifier())
+    return None if entry is None else derive(entry)
+
+
+def merge_metric_cache_entries(entries: dict[str, list]):
+    """
+    Merges metric values computed elsewhere (e.g. in a worker process) into the metric caches.
+    :param entries: Lists of (identifier, value) pairs by cache name.
+    """
+    for cache_name, items in entries.items():
+        metric_caches[cache_name].update(items)
 
 # def t_count_metric(component: CircuitComponent) -> float:
 #     return t_count_metric_circuit(component.get_circuit())
@@ -14,11 +14,24 @@ def default_name_filter(name: str) -> bool:
     return True
 
 
-def custom_name_filter(names: set[str]) -> Callable[[str], float]:
-    def delta(name: str) -> bool:
-        if name in names:
-            return True
-        else:
-            return False
-
-    return delta
+class CustomNameFilter:
+    """
+    Name filter that only accepts the given names.
+    Implemented as a class (rather than a closure) so that it can be sent to worker processes.
+    """
+
+    def __init__(self, names: set[str]):
+        self.names = frozenset(names)
+
+    def __call__(self, name: str) -> bool:
+        return name in self.names
+
+    def __eq__(self, other):
+        return isinstance(other, CustomNameFilter) and self.names == other.names
+
+    def __hash__(self):
+        return hash(self.names)
+
+
+def custom_name_filter(names: set[str]) -> Callable[[str], bool]:
+    return CustomNameFilter(names)
@@ -0,0 +1,133 @@
+import hashlib
+import os
+import pickle
+import sqlite3
+from importlib.metadata import version
+from typing import Hashable, Any
+
+import qiskit
+
+from resource_estimation.automatic_optimisation import get_pass_manager_configuration
+
+# Source directories whose contents influence the circuits and metric values.
+_fingerprinted_directories = ["api", "impl", "resource_estimation"]
+
+
+def library_fingerprint() -> str:
+    """
+    Computes a fingerprint of the library sources and the Qiskit versions.
+    Any change to a component implementation, the optimisation pipeline or Qiskit invalidates all entries.
+    :return: Hex digest identifying the current library state.
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    digest = hashlib.sha256()
+    digest.update(f"qiskit={qiskit.__version__};qiskit_aer={version('qiskit-aer')}".encode())
+    for directory in _fingerprinted_directories:
+        for dir_path, dir_names, file_names in os.walk(os.path.join(root, directory)):
+            dir_names.sort()
+            for file_name in sorted(file_names):
+                if not file_name.endswith(".py"):
+                    continue
+                path = os.path.join(dir_path, file_name)
+                digest.update(os.path.relpath(path, root).encode())
+                with open(path, "rb") as f:
+                    digest.update(f.read())
+    return digest.hexdigest()
+
+
+class PersistentCache:
+    """
+    On-disk key-value store backed by SQLite, which can be shared by several processes.
+
+    Entries are stored under (namespace, key, fingerprint), where the key is the repr of a hashable identifier.
+    Entries written with a different library fingerprint or pass manager configuration are never returned.
+    """
+
+    def __init__(self, path: str, fingerprint: str = None):
+        self.path = path
+        self.fingerprint = library_fingerprint() if fingerprint is None else fingerprint
+
+        directory = os.path.dirname(os.path.abspath(path))
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+
+        # Autocommit mode, every put is immediately visible to other processes.
+        self.connection = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "namespace TEXT NOT NULL, "
+            "key TEXT NOT NULL, "
+            "fingerprint TEXT NOT NULL, "
+            "value BLOB NOT NULL, "
+            "PRIMARY KEY (namespace, key, fingerprint))"
+        )
+
+    def get(self, namespace: str, key: Hashable) -> Any:
+        """
+        Looks up an entry.
+        :param namespace: Namespace of the entry, e.g. the metric name.
+        :param key: Hashable key of the entry, e.g. the global identifier of a component.
+        :return: The stored value or None if there is no entry.
+        """
+        row = self.connection.execute(
+            "SELECT value FROM entries WHERE namespace = ? AND key = ? AND fingerprint = ?",
+            (namespace, repr(key), self._entry_fingerprint())
+        ).fetchone()
+        if row is None:
+            return None
+        return pickle.loads(row[0])
+
+    def put(self, namespace: str, key: Hashable, value: Any):
+        """
+        Stores an entry, replacing any previous value.
+        :param namespace: Namespace of the entry, e.g. the metric name.
+        :param key: Hashable key of the entry, e.g. the global identifier of a component.
+        :param value: Picklable value.
+        """
+        self.connection.execute(
+            "INSERT OR REPLACE INTO entries (namespace, key, fingerprint, value) VALUES (?, ?, ?, ?)",
+            (namespace, repr(key), self._entry_fingerprint(), pickle.dumps(value))
+        )
+
+    def _entry_fingerprint(self) -> str:
+        # Metric values and selections also depend on the (runtime) configuration of auto_opt.
+        return f"{self.fingerprint}:{sorted(get_pass_manager_configuration().items())}"
+
+    def clear(self):
+        """
+        Removes all entries, including those of other fingerprints.
+        """
+        self.connection.execute("DELETE FROM entries")
+
+    def close(self):
+        self.connection.close()
+
+
+_persistent_cache: PersistentCache = None
+
+
+def enable_persistent_cache(path: str) -> PersistentCache:
+    """
+    Enables the persistent cache for metric values and component selections.
+    :param path: Path of the SQLite database file, created if it does not exist.
+    :return: The enabled cache.
+    """
+    global _persistent_cache
+    disable_persistent_cache()
+    _persistent_cache = PersistentCache(path)
+    return _persistent_cache
+
+
+def disable_persistent_cache():
+    global _persistent_cache
+    if _persistent_cache is not None:
+        _persistent_cache.close()
+        _persistent_cache = None
+
+
+def get_persistent_cache() -> PersistentCache:
+    """
+    :return: The enabled persistent cache or None if it is disabled.
+    """
+    return _persistent_cache
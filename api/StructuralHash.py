@@ -0,0 +1,65 @@
+import hashlib
+
+from qiskit import QuantumCircuit
+from qiskit.circuit import ControlledGate, ControlFlowOp
+from qiskit.circuit.library import get_standard_gate_name_mapping
+
+_standard_gate_names = set(get_standard_gate_name_mapping().keys())
+
+
+def is_composite_operation(operation) -> bool:
+    """
+    Whether an operation is a composite block (e.g. an appended circuit) rather than a standard gate.
+    """
+    if isinstance(operation, ControlFlowOp) or operation.name in _standard_gate_names:
+        return False
+    if isinstance(operation, ControlledGate) and operation.base_gate.name in _standard_gate_names:
+        # e.g. multi-controlled X or phase gates.
+        return False
+    return getattr(operation, 'definition', None) is not None
+
+
+def structural_hash(circuit: QuantumCircuit) -> str:
+    """
+    Canonical hash of the gates a circuit applies.
+
+    Qubits are relabeled in the order of their first use and idle qubits are ignored, so that e.g. the same
+    component built with a larger ancilla budget (but the same gates) has the same hash.
+    Composite blocks are hashed by their contents, their names and labels are ignored.
+    :param circuit: The circuit.
+    :return: Hex digest.
+    """
+    return _structural_digest(circuit, {})[0]
+
+
+def _structural_digest(circuit: QuantumCircuit, memo: dict) -> (str, tuple):
+    """
+    :param memo: Operation, digest and used qubits by id of the operation, so that every block
+     (e.g. an instruction appended several times) is only hashed once.
+    :return: The digest and the indices of the used qubits in the order of their first use.
+    """
+    qubit_indices = {qubit: i for i, qubit in enumerate(circuit.qubits)}
+    clbit_indices = {clbit: i for i, clbit in enumerate(circuit.clbits)}
+    first_use = {}
+
+    entries = []
+    for instruction in circuit.data:
+        operation = instruction.operation
+        qubits = [qubit_indices[qubit] for qubit in instruction.qubits]
+        if is_composite_operation(operation):
+            if id(operation) not in memo:
+                # Keep the operation alive, as its id could otherwise be reused.
+                memo[id(operation)] = (operation, *_structural_digest(operation.definition, memo))
+            _, key, active = memo[id(operation)]
+            # Only the qubits the block actually uses.
+            qubits = [qubits[i] for i in active]
+        elif isinstance(operation, ControlFlowOp):
+            key = (operation.name, tuple(_structural_digest(block, memo)[0] for block in operation.blocks),
+                   repr(getattr(operation, 'condition', None)))
+        else:
+            key = (operation.name, repr(operation.params), getattr(operation, 'ctrl_state', None))
+        labels = tuple(first_use.setdefault(qubit, len(first_use)) for qubit in qubits)
+        entries.append((key, labels, tuple(clbit_indices[clbit] for clbit in instruction.clbits)))
+
+    digest = hashlib.sha1(repr(entries).encode()).hexdigest()
+    return digest, tuple(first_use.keys())
@@ -0,0 +1,26 @@
+from qiskit import QuantumRegister
+
+from api.CircuitComponent import CircuitComponent
+
+
+class QuantumClassicalWindowedECPointAdderIP(CircuitComponent):
+    """
+    This class denotes an n-bit quantum-classical windowed elliptic-curve point adder with a window of w qubits.
+
+    It will apply the following unitary transformation: |e>|x_1>|y_1> --> |e>|x_3>|y_3>.
+    Where (x_1, y_1) + sum of e_i * P_i = (x_3, y_3) for the w points ec_points = (P_0, ..., P_{w-1}).
+    """
+
+    def __init__(self, dqa: int, cqa: int, n: int, ec_points: tuple, p: int, w: int):
+        super().__init__((type(self).__name__, dqa, cqa, n, ec_points, p, w))
+        self.dqa = dqa
+        self.cqa = cqa
+        self.n = n
+        self.ec_points = ec_points
+        self.p = p
+        self.w = w
+        self.register_e = QuantumRegister(w, 'e')
+        self.register_x = QuantumRegister(n, 'x')
+        self.register_y = QuantumRegister(n, 'y')
+        self.register_g = QuantumRegister(dqa, 'g')
+        self.register_anc = QuantumRegister(cqa, 'anc')
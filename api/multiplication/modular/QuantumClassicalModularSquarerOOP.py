@@ -19,7 +19,6 @@ class QuantumClassicalModularSquarerOOP(CircuitComponent):
         self.c = c
         self.register_c = QuantumRegister(c, 'c')
         self.register_x = QuantumRegister(n, 'x')
-        self.register_y = QuantumRegister(n, 'y')
         self.register_r = QuantumRegister(n, 'r')
         self.register_g = QuantumRegister(dqa, 'g')
         self.register_anc = QuantumRegister(cqa, 'anc')
@@ -0,0 +1,71 @@
+import math
+
+from qiskit import QuantumCircuit
+
+from api.CircuitChooser import CircuitChooser
+from api.addition.QuantumClassicalAdderIP import QuantumClassicalAdderIP
+from impl.encoding.fourier_encoding import fourier_encoding, fourier_rotation_kept
+
+
+class BeauregardConstantAdderIP(QuantumClassicalAdderIP):
+    """
+    QFT constant addition circuit by Beauregard (https://arxiv.org/pdf/quant-ph/0205095, Fig 3.),
+    based on the adder by Draper (see DraperAdderIP).
+
+    x is transformed into the Fourier encoding, a single (controlled) phase rotation per qubit adds a
+    and the encoding is transformed back.
+    Needs no ancillae, but it is not a classical circuit (it cannot be simulated by classical_simulation.py).
+
+    The approximation_degree smallest rotations (of the QFTs and of the addition) are dropped, which gives an
+    approximate adder with fewer gates. The chooser constructs it with default_approximation_degree,
+    which can be changed before choosing.
+    """
+    default_approximation_degree: int = 0
+
+    def __init__(self, dqa: int, cqa: int, n: int, a: int, c: int = 0, approximation_degree: int = None):
+        self.approximation_degree = (self.default_approximation_degree if approximation_degree is None
+                                     else approximation_degree)
+        if self.approximation_degree < 0:
+            raise ValueError(f"The approximation degree must be non-negative, got {self.approximation_degree}.")
+        super().__init__(dqa, cqa, n, a % (1 << n), c)
+
+    def get_global_identifier(self):
+        # The circuit (and hence its metrics) depends on the approximation degree.
+        return self.identifier, self.approximation_degree
+
+    def get_circuit(self, *args) -> QuantumCircuit:
+        if self.n == 0 or self.a == 0:
+            return QuantumCircuit(self.register_c, self.register_x, self.register_g, self.register_anc,
+                                  name=f"[+{self.a}]_{{QFT}}")
+
+        cache = CircuitChooser().cache
+
+        param_identifier = self.get_global_identifier()
+        if cache.get(param_identifier, None) is not None:
+            return cache[param_identifier]
+
+        circuit = QuantumCircuit(
+            self.register_c,
+            self.register_x,
+            self.register_g,
+            self.register_anc,
+            name=f"[+{self.a}]_{{QFT}}"
+        )
+
+        qft = fourier_encoding(self.n, self.approximation_degree).to_instruction()
+        circuit.append(qft, self.register_x)
+        for j in range(0, self.n):
+            # The rotations of all bits of a on qubit j combine into one.
+            angle = sum(math.pi / 2 ** (j - k) for k in range(0, j + 1)
+                        if (self.a >> k) & 1 and fourier_rotation_kept(j - k, self.n, self.approximation_degree))
+            angle = math.remainder(angle, 2 * math.pi)
+            if angle != 0:
+                if self.c == 0:
+                    circuit.p(angle, self.register_x[j])
+                else:
+                    circuit.mcp(angle, list(self.register_c), self.register_x[j])
+        circuit.append(qft.inverse(), self.register_x)
+
+        cache[param_identifier] = circuit
+
+        return circuit
@@ -1,8 +1,11 @@
+from collections import Counter
+
 import numpy as np
 from qiskit import QuantumCircuit, QuantumRegister
 from qiskit.circuit import Gate
 
 from api.CircuitChooser import CircuitChooser
+from api.Metrics import logical_cost
 from api.addition.QuantumClassicalAdderIP import QuantumClassicalAdderIP
 
 
@@ -14,6 +17,40 @@ class HRSConstantAdderIP(QuantumClassicalAdderIP):
     def __init__(self, dqa: int, cqa: int, n: int, a: int, c: int = 0):
         super().__init__(dqa, cqa, n, a % (1 << n), c)
 
+    def get_cost_model(self) -> Counter | None:
+        if self.n == 0 or self.a == 0:
+            return Counter()
+
+        a_bits = [int(i) for i in np.binary_repr(self.a, self.n)[::-1]]
+
+        if self.n == 1:
+            return Counter({self.c: a_bits[0]})
+        elif self.n == 2:
+            return Counter({self.c + 1: a_bits[0], self.c: a_bits[0] + a_bits[1]})
+
+        higher_bit_size = self.n >> 1
+        lower_bit_size = ((self.n - 1) >> 1) + 1
+
+        c_h = self.a >> lower_bit_size
+        c_l = self.a & ((1 << lower_bit_size) - 1)
+
+        # Same choice as in get_circuit, the controlled incrementer is counted if it has no model.
+        incrementer_cost = logical_cost(CircuitChooser().choose_component(
+            "QCIncrementer",
+            (higher_bit_size, 0, 1),
+            self.dqa + lower_bit_size - 1,
+            self.cqa
+        ))
+        low_add_cost = HRSConstantAdderIP(self.dqa, self.cqa, lower_bit_size, c_l, self.c).get_cost_model()
+        high_add_cost = HRSConstantAdderIP(self.dqa, self.cqa, higher_bit_size, c_h, self.c).get_cost_model()
+
+        cost = incrementer_cost + incrementer_cost + low_add_cost + high_add_cost
+        carry_cost = carry_gate_cost(lower_bit_size, c_l, self.c)
+        cost.update(carry_cost)
+        cost.update(carry_cost)
+        cost[1] += 2 * higher_bit_size
+        return cost
+
     def get_circuit(self, *args) -> QuantumCircuit:
         if self.n == 0 or self.a == 0:
             return QuantumCircuit(
@@ -211,3 +248,20 @@ def carry_gate(n, a, c=0) -> Gate:
             circuit.cx(register_a[i + 1], register_g[i])
 
     return circuit.to_gate()
+
+
+def carry_gate_cost(n, a, c=0) -> Counter:
+    """
+    Cost of carry_gate(n, a, c), see api/CostModel.py.
+    """
+    if a < 0:
+        p_bits = [int(i) for i in np.binary_repr(a, 1000)[::-1][:-1][:n]]
+    else:
+        p_bits = [int(i) for i in np.binary_repr(a, 1000)[::-1][:n]]
+
+    # Every set bit (except the lowest) adds an X and CNOT gate before and after.
+    set_bits = sum(p_bits[1:n])
+    cost = Counter({0: 2 * set_bits, 1: 2 * set_bits, 2: 4 * (n - 2) + 2 * p_bits[0]})
+    # The result is computed and uncomputed by X gates controlled on the c controls and the last dirty qubit.
+    cost[c + 1] += 2
+    return cost
@@ -1,6 +1,8 @@
+from collections import Counter
 from qiskit import QuantumCircuit
 
 from api.CircuitChooser import CircuitChooser
+from api.CostModel import controlled_cost
 from api.addition.QuantumClassicalIncrementer import QuantumClassicalIncrementer
 
 
@@ -21,6 +23,16 @@ class BasicIncrementer(QuantumClassicalIncrementer):
                  ):
         super().__init__(dqa, cqa, n, s, c, overflow_qubit=overflow_qubit)
 
+    def get_cost_model(self) -> Counter | None:
+        if self.n == 0:
+            return Counter()
+        n = self.n + 1 if self.overflow_qubit else self.n
+        # One X gate with k controls for every k in [1, n - s - 1] and the final NOT gate.
+        cost = Counter({k: 1 for k in range(1, n - self.s)})
+        cost[0] += 1
+        # Every gate is controlled by the c controls.
+        return controlled_cost(cost, self.c)
+
     def get_circuit(self, *args) -> QuantumCircuit:
         if self.n == 0:
             return QuantumCircuit(0)
@@ -30,21 +42,22 @@ class BasicIncrementer(QuantumClassicalIncrementer):
         if cache.get(self.identifier, None) is not None:
             return cache[self.identifier]
 
-        circuit = QuantumCircuit(self.register_x, self.register_o, self.register_g, self.register_anc,
-                                 name=f"+{2 ** self.s}_B")
+        circuit = QuantumCircuit(self.register_c, self.register_x, self.register_o, self.register_g,
+                                 self.register_anc, name=f"+{2 ** self.s}_B")
         s_register_x = list(self.register_x) + list(self.register_o)
+        controls = list(self.register_c)
 
-        if self.overflow_qubit:
-            self.n += 1
+        # The overflow qubit acts as the most significant bit.
+        n = self.n + 1 if self.overflow_qubit else self.n
 
-        for i in reversed(range(self.s + 1, self.n)):
-            circuit.mcx(s_register_x[self.s:i], i)
+        for i in reversed(range(self.s + 1, n)):
+            circuit.mcx(controls + s_register_x[self.s:i], s_register_x[i])
 
         # Apply the final NOT gate
-        circuit.x(self.s)
-
         if self.c > 0:
-            circuit = circuit.control(self.c)
+            circuit.mcx(controls, s_register_x[self.s])
+        else:
+            circuit.x(s_register_x[self.s])
 
         cache[self.identifier] = circuit
 
@@ -1,10 +1,13 @@
+from collections import Counter
 from qiskit import QuantumCircuit, QuantumRegister
 from qiskit.circuit import Gate
 
 from api.CircuitChooser import CircuitChooser
+from api.CostModel import controlled_cost
 from api.CircuitNotSupportedError import CircuitNotSupportedError
 from api.addition.QuantumClassicalIncrementer import QuantumClassicalIncrementer
 from impl.util.ancilla_registers import setup_anc_registers
+from impl.util.controlled_circuit import controlled_circuit
 
 
 class GidneyIncrementer(QuantumClassicalIncrementer):
@@ -27,6 +30,17 @@ class GidneyIncrementer(QuantumClassicalIncrementer):
             raise CircuitNotSupportedError("Not enough dirty qubits available.")
         super().__init__(dqa, cqa, n, s, c, overflow_qubit=overflow_qubit)
 
+    def get_cost_model(self) -> Counter | None:
+        if self.n == 0:
+            return Counter()
+        m = self.n - self.s
+        # The downward and upward parts consist of 2 CNOTs and 1 Toffoli each, and are applied 2m times each.
+        cost = Counter({0: 2 * m, 1: 2 * m + 8 * m, 2: 4 * m})
+        if self.overflow_qubit:
+            cost.update({0: 1, 1: 2})
+        # The controlled circuit adds the controls to every gate.
+        return controlled_cost(cost, self.c)
+
     def get_circuit(self, *args) -> QuantumCircuit:
         if self.n == 0:
             return QuantumCircuit(0)
@@ -87,7 +101,7 @@ class GidneyIncrementer(QuantumClassicalIncrementer):
             circuit.cx(register_g[self.s], self.register_x[i])
 
         if self.c > 0:
-            circuit = circuit.control(self.c)
+            circuit = controlled_circuit(circuit, self.register_c)
 
         cache[self.identifier] = circuit
 
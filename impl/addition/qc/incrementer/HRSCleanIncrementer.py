@@ -82,7 +82,7 @@ class HRSCleanIncrementer(QuantumClassicalIncrementer):
                 self.n,
                 self.c,
                 False,
-                self.overflow_qubit).get_circuit().reverse_ops(),
+                self.overflow_qubit).get_reversed_circuit(),
             list(self.register_c) +
             list(register_g) +
             list(register_anc) +
@@ -1,6 +1,8 @@
+from collections import Counter
 from qiskit import QuantumCircuit
 
 from api.CircuitChooser import CircuitChooser
+from api.CostModel import controlled_cost
 from api.addition.QuantumClassicalIncrementer import QuantumClassicalIncrementer
 from impl.addition.qq.TTKAdderIP import TTKAdderIP
 from impl.util.ancilla_registers import setup_anc_registers
@@ -25,6 +27,23 @@ class HRSIncrementer(QuantumClassicalIncrementer):
                  ):
         super().__init__(dqa, cqa, n, s, c, overflow_qubit=overflow_qubit)
 
+    def get_cost_model(self) -> Counter | None:
+        if self.n == 0:
+            return Counter()
+        if self.s > 0:
+            return HRSIncrementer(self.dqa + self.s, self.cqa, self.n - self.s, 0, self.c,
+                                  self.overflow_qubit).get_cost_model()
+
+        ttk_cost = TTKAdderIP(0, 0, self.n, 0, False, self.overflow_qubit).get_cost_model()
+        # Two subtractions and the NOT of the overflow qubit, which are controlled.
+        cost = ttk_cost + ttk_cost
+        if self.overflow_qubit:
+            cost[0] += 1
+        cost = controlled_cost(cost, self.c)
+        # Two layers of X gates on the n borrowed qubits.
+        cost[0] += 2 * self.n
+        return cost
+
     def get_circuit(self, *args) -> QuantumCircuit:
         if self.n == 0:
             return QuantumCircuit(0)
@@ -78,7 +97,7 @@ class HRSIncrementer(QuantumClassicalIncrementer):
                 self.c,
                 False,
                 self.overflow_qubit
-            ).get_circuit().reverse_ops(),
+            ).get_reversed_circuit(),
             list(self.register_c) + list(register_g) + list(self.register_x) + list(
                 self.register_o) + list(ext_reg_g) + list(ext_reg_anc))
 
@@ -94,7 +113,7 @@ class HRSIncrementer(QuantumClassicalIncrementer):
                 self.c,
                 False,
                 self.overflow_qubit
-            ).get_circuit().reverse_ops(),
+            ).get_reversed_circuit(),
             list(self.register_c) + list(register_g) + list(register_anc) + list(self.register_x) + list(
                 self.register_o) + list(ext_reg_g) + list(ext_reg_anc))
 
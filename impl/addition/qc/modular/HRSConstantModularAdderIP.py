@@ -84,7 +84,7 @@ class HRSConstantModularAdderIP(QuantumClassicalModularAdderIP):
         # Can borrow the control qubits.
         borrowable = list(self.register_c)
 
-        circuit.append(qc1_adder.get_circuit().reverse_ops(),
+        circuit.append(qc1_adder.get_reversed_circuit(),
                        [self.register_anc[0]] +
                        list(self.register_x) +
                        borrowable +
@@ -1,6 +1,7 @@
 from qiskit import QuantumCircuit
 
 from api.CircuitChooser import CircuitChooser
+from api.CircuitNotSupportedError import CircuitNotSupportedError
 from api.addition.QuantumClassicalModularAdderIP import QuantumClassicalModularAdderIP
 
 
@@ -10,6 +11,8 @@ class RCConstantModularAdderIP(QuantumClassicalModularAdderIP):
     """
 
     def __init__(self, dqa: int, cqa, n: int, a: int, p: int, c: int = 0):
+        if cqa < 2:
+            raise CircuitNotSupportedError("Requires two clean ancillae for the sign and the copied out MSB.")
         super().__init__(dqa, cqa, n, a, p, c)
 
     def get_circuit(self, *args) -> QuantumCircuit:
@@ -57,7 +60,7 @@ class RCConstantModularAdderIP(QuantumClassicalModularAdderIP):
 
         borrowable = list(self.register_c)
 
-        circuit.append(qc1_adder.get_circuit().reverse_ops(),
+        circuit.append(qc1_adder.get_reversed_circuit(),
                        s_register_x +
                        borrowable +
                        list(self.register_g) +
@@ -99,7 +102,7 @@ class RCConstantModularAdderIP(QuantumClassicalModularAdderIP):
 
         borrowable = list(self.register_c)
 
-        circuit.append(qc3_adder.get_circuit().reverse_ops(),
+        circuit.append(qc3_adder.get_reversed_circuit(),
                        s_register_x +
                        borrowable +
                        list(self.register_g) +
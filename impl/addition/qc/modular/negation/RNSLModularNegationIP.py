@@ -24,15 +24,18 @@ class RNSLModularNegationIP(QuantumClassicalModularNegationIP):
         neg_p = (1 << self.n) - self.p - 1
 
         circuit = QuantumCircuit(
+            self.register_c,
             self.register_x,
             self.register_g,
             self.register_anc,
             name=f"$-[0]~mod~{self.p}$"
         )
+        # Only the flag and the final inversion are controlled, the adder is chosen with the controls.
+        controls = list(self.register_c)
 
         # Check if input is 0
         circuit.x(self.register_x)
-        circuit.mcx(list(self.register_x), self.register_anc[0])
+        circuit.mcx(controls + list(self.register_x), self.register_anc[0])
         circuit.x(self.register_x)
         # If it was all zeros, then we want to return the modulus, so we get p' + p and then invert
         circuit.append(binary_encoding(self.n, self.p, c=1),
@@ -41,7 +44,7 @@ class RNSLModularNegationIP(QuantumClassicalModularNegationIP):
         # Subtraction of p
         qc_adder = CircuitChooser().choose_component(
             "QCAdderIP",
-            (self.n, neg_p, 0),
+            (self.n, neg_p, self.c),
             dirty_available=self.dqa,
             clean_available=self.cqa - 1
         )
@@ -49,18 +52,19 @@ class RNSLModularNegationIP(QuantumClassicalModularNegationIP):
         # Add m' to x
         circuit.append(
             qc_adder.get_circuit(),
+            controls +
             list(self.register_x) +
             list(self.register_g) +
             list(self.register_anc[1:])
         )
         # Now if all 1s, reset the ancilla
-        circuit.mcx(list(self.register_x), self.register_anc[0])
+        circuit.mcx(controls + list(self.register_x), self.register_anc[0])
         # Finally move back into correct representation
-        circuit.x(self.register_x)
-
-        # TODO: Improve controlling
         if self.c > 0:
-            circuit = circuit.decompose(reps=2).control(self.c)
+            for qubit in self.register_x:
+                circuit.mcx(controls, qubit)
+        else:
+            circuit.x(self.register_x)
 
         cache[self.identifier] = circuit
 
@@ -1,9 +1,11 @@
+from collections import Counter
 from qiskit import QuantumCircuit, QuantumRegister
 from qiskit.circuit import Gate
 
 from api.CircuitChooser import CircuitChooser
 from api.CircuitNotSupportedError import CircuitNotSupportedError
 from api.addition.QuantumQuantumAdderIP import QuantumQuantumAdderIP
+from impl.util.logical_and import LogicalAndGate, LogicalAndUncomputeGate
 
 
 class CDKMAdderIP(QuantumQuantumAdderIP):
@@ -13,18 +15,69 @@ class CDKMAdderIP(QuantumQuantumAdderIP):
     Has two variants for UMA (Unmajority-Add) Circuits,
     0 --> simpler version
     1 --> Better parallelism version
+
+    In the logical-AND gate mode (opt-in, logical_and or default_logical_and), the carries are computed into
+    n - 1 clean ancillae with temporary logical-ANDs and uncomputed by their measurement-based uncomputation,
+    as in the adder by Gidney (https://arxiv.org/pdf/1709.06648, Fig 4.), which halves the Toffoli count.
+    The controls are then only added to the gates which write the sum.
+    The circuit keeps the unitary definition of the uncomputation (see logical_and.py), so the mode only lowers
+    the logical cost, not the metrics on the transpiled circuit.
     """
+    default_logical_and: bool = False
 
     def __init__(self, dqa: int, cqa: int, n: int, c: int = 0, incoming_carry_qubit=False, overflow_qubit: bool = True,
-                 variant=1):
+                 variant=1, logical_and: bool = None):
         if incoming_carry_qubit:
             raise ValueError("CDKMAdder's first ancilla qubit is the incoming carry.")
         if cqa < 1:  # Requires at least one ancilla.
             raise CircuitNotSupportedError("Not enough clean qubits available.")
+        logical_and = self.default_logical_and if logical_and is None else logical_and
+        if logical_and and cqa < n - 1:
+            raise CircuitNotSupportedError("The logical-AND gate mode requires n - 1 clean qubits for the carries.")
 
         super().__init__(dqa, cqa, n, c, incoming_carry_qubit=False, overflow_qubit=overflow_qubit)
         # TODO: Add better support for Variant(s).
         self.variant = variant
+        self.logical_and = logical_and
+        # Both variants build different circuits, so they must not share a cache entry.
+        if variant != 1:
+            self.identifier = self.identifier + (variant,)
+        if logical_and:
+            self.identifier = self.identifier + ("logical_and",)
+
+    def get_cost_model(self) -> Counter | None:
+        if self.n == 0:
+            return None
+        if self.logical_and:
+            if self.n == 1:
+                return Counter({self.c + 1: 1, self.c + 2: 1 if self.overflow_qubit else 0})
+            if self.c > 0:
+                # n - 1 carries, 3 CNOTs per carry and 3 per sum bit in between, the sum bits get two controlled
+                # CNOTs each (one for the lowest bit).
+                cost = Counter({1: 6 * (self.n - 2), 2: self.n - 1})
+                cost[self.c + 1] += 2 * self.n - 1
+                if self.overflow_qubit:
+                    cost.update({1: 4, self.c + 1: 1, self.c + 2: 1})
+                return cost
+            # n - 1 carries (the uncomputation is free), 3 CNOTs per carry and sum bit in between.
+            cost = Counter({1: 6 * (self.n - 2) + 1, 2: self.n - 1})
+            # The highest bit and the overflow.
+            cost.update({1: 7, 2: 1} if self.overflow_qubit else {1: 2})
+            return cost
+        # n MAJ circuits, n UMA circuits and one CNOT for the overflow.
+        cost = Counter({1: 2 * self.n, 2: self.n})
+        if self.c > 0:
+            # The inverse MAJ circuits and the sum bits, which are controlled.
+            cost.update({1: 2 * self.n, 2: self.n})
+            cost[self.c + 1] += 2 * self.n + int(self.overflow_qubit)
+            return cost
+        if self.variant == 0:
+            cost.update({1: 2 * self.n, 2: self.n})
+        else:
+            cost.update({0: 2 * self.n, 1: 3 * self.n, 2: self.n})
+        if self.overflow_qubit:
+            cost[1] += 1
+        return cost
 
     def get_circuit(self, *args) -> QuantumCircuit:
         cache = CircuitChooser().cache
@@ -32,7 +85,13 @@ class CDKMAdderIP(QuantumQuantumAdderIP):
         if cache.get(self.identifier, None) is not None:
             return cache[self.identifier]
 
+        if self.logical_and:
+            circuit = self._get_logical_and_circuit()
+            cache[self.identifier] = circuit
+            return circuit
+
         circuit = QuantumCircuit(
+            self.register_c,
             self.register_x,
             self.register_y,
             self.register_o,
@@ -40,6 +99,7 @@ class CDKMAdderIP(QuantumQuantumAdderIP):
             self.register_anc,
             name="$+_{CDKM}$"
         )
+        controls = list(self.register_c)
 
         # Apply first MAJ gate to (c_0, b_0, a_0)
         circuit.append(maj_circuit(), [self.register_anc[0], self.register_y[0], self.register_x[0]])
@@ -48,31 +108,91 @@ class CDKMAdderIP(QuantumQuantumAdderIP):
 
         # Now apply the carry bit if necessary
         if self.overflow_qubit:
-            circuit.cx(self.register_x[self.n - 1], self.register_o[0])
+            circuit.mcx(controls + [self.register_x[self.n - 1]], self.register_o[0])
 
         if self.variant == 0:
-            uma_circuit = uma_circuit_a
+            uma_gate = uma_circuit_a()
         elif self.variant == 1:
-            uma_circuit = uma_circuit_b
+            uma_gate = uma_circuit_b()
         else:
             raise ValueError("Unknown UMA variant.")
+        if self.c > 0:
+            # The MAJ circuits are undone either way, only the sum bits are controlled.
+            uma_gate = controlled_uma_circuit(self.c)
         # Now apply the UMA gates
         for i in range(self.n - 1, 0, -1):  # [n-1, 1]
-            circuit.append(uma_circuit(), [self.register_x[i - 1], self.register_y[i], self.register_x[i]])
+            circuit.append(uma_gate, controls + [self.register_x[i - 1], self.register_y[i], self.register_x[i]])
 
         # Apply last UMA gate
-        circuit.append(uma_circuit(), [self.register_anc[0], self.register_y[0], self.register_x[0]])
+        circuit.append(uma_gate, controls + [self.register_anc[0], self.register_y[0], self.register_x[0]])
 
         # TODO: Improve CDKM controlled circuit
         # See: https://arxiv.org/pdf/1612.07424 for improvements for specific cases.
-        # AFAIK this should be doable as some rounds are inverses of each other and do not need to be controlled.
-        if self.c > 0:
-            circuit = circuit.control(self.c)
 
         cache[self.identifier] = circuit
 
         return circuit
 
+    def _get_logical_and_circuit(self) -> QuantumCircuit:
+        """
+        :return: The circuit in the logical-AND gate mode, the carry c_i (0 < i < n) is stored in ancilla i - 1.
+        """
+        circuit = QuantumCircuit(
+            self.register_c,
+            self.register_x,
+            self.register_y,
+            self.register_o,
+            self.register_g,
+            self.register_anc,
+            name="$+_{CDKM}^{AND}$"
+        )
+
+        controls = list(self.register_c)
+        x = list(self.register_x)
+        y = list(self.register_y)
+        carry = [None] + list(self.register_anc[:self.n - 1])
+
+        # c_{i+1} = MAJ(x_i, y_i, c_i) = ((x_i XOR c_i) AND (y_i XOR c_i)) XOR c_i, x_i and y_i keep the XOR.
+        for i in range(0, self.n - 1):
+            if i > 0:
+                circuit.cx(carry[i], x[i])
+                circuit.cx(carry[i], y[i])
+            circuit.append(LogicalAndGate(), [x[i], y[i], carry[i + 1]])
+            if i > 0:
+                circuit.cx(carry[i], carry[i + 1])
+
+        # Highest bit: o = o XOR MAJ(x, y, c) and y = x XOR y XOR c.
+        i = self.n - 1
+        if self.overflow_qubit:
+            if i > 0:
+                circuit.cx(carry[i], x[i])
+                circuit.cx(carry[i], y[i])
+            circuit.mcx(controls + [x[i], y[i]], self.register_o[0])
+            if i > 0:
+                circuit.mcx(controls + [carry[i]], self.register_o[0])
+                circuit.cx(carry[i], x[i])
+                circuit.cx(carry[i], y[i])
+        circuit.mcx(controls + [x[i]], y[i])
+        if i > 0:
+            circuit.mcx(controls + [carry[i]], y[i])
+
+        # Uncompute the carries and add the sum bits.
+        for i in range(self.n - 2, -1, -1):
+            if i > 0:
+                circuit.cx(carry[i], carry[i + 1])
+            circuit.append(LogicalAndUncomputeGate(), [x[i], y[i], carry[i + 1]])
+            if i > 0:
+                circuit.cx(carry[i], x[i])
+            if self.c == 0:
+                circuit.cx(x[i], y[i])
+            else:
+                if i > 0:
+                    circuit.cx(carry[i], y[i])
+                    circuit.mcx(controls + [carry[i]], y[i])
+                circuit.mcx(controls + [x[i]], y[i])
+
+        return circuit
+
 
 def maj_circuit() -> Gate:
     """
@@ -112,6 +232,28 @@ def uma_circuit_a() -> Gate:
     return circuit.to_gate()
 
 
+def controlled_uma_circuit(c: int) -> Gate:
+    """
+    Gets the Unmajority and Add (UMA), where only the addition is controlled by c qubits.
+    It undoes the MAJ circuit and then adds the carry and a to b.
+
+    :param c: Number of control qubits.
+    :return: Gate on c + 3 qubits, representing the controlled UMA circuit
+    """
+    register_c = QuantumRegister(c, 'c')
+    register = QuantumRegister(3, 'm')
+
+    circuit = QuantumCircuit(register_c, register, name="$UMA_c$")
+
+    circuit.ccx(register[0], register[1], register[2])
+    circuit.cx(register[2], register[0])
+    circuit.cx(register[2], register[1])
+    circuit.mcx(list(register_c) + [register[0]], register[1])
+    circuit.mcx(list(register_c) + [register[2]], register[1])
+
+    return circuit.to_gate()
+
+
 def uma_circuit_b() -> Gate:
     """
     Gets the Unmajority and Add (UMA).
@@ -0,0 +1,9 @@
+from impl.addition.qq.CDKMAdderIP import CDKMAdderIP
+
+
+class CDKMLogicalAndAdderIP(CDKMAdderIP):
+    """
+    CDKMAdderIP in the logical-AND gate mode, registered as a separate QQAdderIP so that the CircuitChooser
+    scores both modes alongside each other.
+    """
+    default_logical_and: bool = True
@@ -0,0 +1,73 @@
+import math
+
+from qiskit import QuantumCircuit
+
+from api.CircuitChooser import CircuitChooser
+from api.addition.QuantumQuantumAdderIP import QuantumQuantumAdderIP
+from impl.encoding.fourier_encoding import fourier_encoding, fourier_rotation_kept
+
+
+class DraperAdderIP(QuantumQuantumAdderIP):
+    """
+    QFT addition circuit by Draper (https://arxiv.org/pdf/quant-ph/0008033).
+
+    y (with the overflow qubit as its top bit) is transformed into the Fourier encoding, each bit of x (and the
+    incoming carry) is added by controlled phase rotations and the encoding is transformed back.
+    The controls only control the rotations, the QFTs cancel out if the addition is not applied.
+    Needs no ancillae, but it is not a classical circuit (it cannot be simulated by classical_simulation.py).
+
+    The approximation_degree smallest rotations (of the QFTs and of the addition) are dropped, which gives an
+    approximate adder with fewer gates. The chooser constructs it with default_approximation_degree,
+    which can be changed before choosing.
+
+    Takes |x>|y> to |x>|x + y mod 2^n> (the overflow qubit is XORed with the carry).
+    """
+    default_approximation_degree: int = 0
+
+    def __init__(self, dqa: int, cqa: int, n: int, c: int = 0, incoming_carry_qubit: bool = False,
+                 overflow_qubit: bool = False, approximation_degree: int = None):
+        self.approximation_degree = (self.default_approximation_degree if approximation_degree is None
+                                     else approximation_degree)
+        if self.approximation_degree < 0:
+            raise ValueError(f"The approximation degree must be non-negative, got {self.approximation_degree}.")
+        super().__init__(dqa, cqa, n, c, incoming_carry_qubit, overflow_qubit)
+
+    def get_global_identifier(self):
+        # The circuit (and hence its metrics) depends on the approximation degree.
+        return self.identifier, self.approximation_degree
+
+    def get_circuit(self, *args) -> QuantumCircuit:
+        cache = CircuitChooser().cache
+
+        param_identifier = self.get_global_identifier()
+        if cache.get(param_identifier, None) is not None:
+            return cache[param_identifier]
+
+        circuit = QuantumCircuit(
+            self.register_c,
+            self.register_x,
+            self.register_y,
+            self.register_in,
+            self.register_o,
+            self.register_g,
+            self.register_anc,
+            name="$+_{D}$"
+        )
+
+        target = list(self.register_y) + list(self.register_o)
+        m = len(target)
+        # Bit k of the summand, the incoming carry is added to the lowest bit.
+        summand = [(k, [qubit]) for k, qubit in enumerate(self.register_x)]
+        summand += [(0, [qubit]) for qubit in self.register_in]
+
+        qft = fourier_encoding(m, self.approximation_degree).to_instruction()
+        circuit.append(qft, target)
+        for j in range(0, m):
+            for k, qubits in summand:
+                if k <= j and fourier_rotation_kept(j - k, m, self.approximation_degree):
+                    circuit.mcp(math.pi / 2 ** (j - k), list(self.register_c) + qubits, target[j])
+        circuit.append(qft.inverse(), target)
+
+        cache[param_identifier] = circuit
+
+        return circuit
@@ -7,6 +7,7 @@ from api.CircuitChooser import CircuitChooser
 from api.CircuitNotSupportedError import CircuitNotSupportedError
 from api.addition.QuantumQuantumAdderIP import QuantumQuantumAdderIP
 from impl.util.ancilla_registers import setup_anc_registers
+from impl.util.controlled_circuit import controlled_circuit
 
 
 class OTUSAdderIP(QuantumQuantumAdderIP):
@@ -149,7 +150,7 @@ class OTUSAdderIP(QuantumQuantumAdderIP):
         # TODO: Improve OTUS controlled circuit
         # AFAIK this should be doable as some rounds are inverses of each other and do not need to be controlled.
         if self.c > 0:
-            circuit = circuit.control(self.c)
+            circuit = controlled_circuit(circuit, self.register_c)
 
         cache[self.identifier] = circuit
 
@@ -1,7 +1,10 @@
+from collections import Counter
 from qiskit import QuantumCircuit
 
 from api.CircuitChooser import CircuitChooser
+from api.CostModel import controlled_cost
 from api.addition.QuantumQuantumAdderIP import QuantumQuantumAdderIP
+from impl.util.controlled_circuit import controlled_circuit
 
 
 class TTKAdderIP(QuantumQuantumAdderIP):
@@ -15,6 +18,17 @@ class TTKAdderIP(QuantumQuantumAdderIP):
             raise ValueError("TTKAdder does not support incoming carry.")
         super().__init__(dqa, cqa, n, c, incoming_carry_qubit=False, overflow_qubit=overflow_qubit)
 
+    def get_cost_model(self) -> Counter | None:
+        n = self.n
+        if self.overflow_qubit:
+            cx = 3 * max(n - 1, 0) + max(n - 2, 0) + n
+            ccx = max(2 * n - 1, 0)
+        else:
+            cx = 2 * max(n - 1, 0) + 2 * max(n - 2, 0) + n
+            ccx = 2 * max(n - 1, 0)
+        # The controlled circuit adds the controls to every gate.
+        return controlled_cost(Counter({1: cx, 2: ccx}), self.c)
+
     def get_circuit(self, *args) -> QuantumCircuit:
         cache = CircuitChooser().cache
 
@@ -74,7 +88,7 @@ class TTKAdderIP(QuantumQuantumAdderIP):
         # TODO: Improve TTK controlled circuit
         # AFAIK this should be doable as some rounds are inverses of each other and do not need to be controlled.
         if self.c > 0:
-            circuit = circuit.control(self.c)
+            circuit = controlled_circuit(circuit, self.register_c)
 
         cache[self.identifier] = circuit
 
@@ -1,6 +1,7 @@
 from qiskit import QuantumCircuit
 
 from api.CircuitChooser import CircuitChooser
+from api.CircuitNotSupportedError import CircuitNotSupportedError
 from api.addition.QuantumQuantumModularAdderIP import QuantumQuantumModularAdderIP
 
 
@@ -13,6 +14,8 @@ class RNSLModularAdderIP(QuantumQuantumModularAdderIP):
     # TODO: Make a variant of this based on a quantum classical comparator?
 
     def __init__(self, dqa: int, cqa: int, n: int, p: int, c: int = 0):
+        if cqa < 1:
+            raise CircuitNotSupportedError("Requires a clean ancilla for the carry of the addition.")
         super().__init__(dqa, cqa, n, p, c)
 
     def get_circuit(self, *args) -> QuantumCircuit:
@@ -61,7 +64,7 @@ class RNSLModularAdderIP(QuantumQuantumModularAdderIP):
         borrowable = list(self.register_x) + list(self.register_c)
 
         circuit.append(
-            qc_adder_1.get_circuit().reverse_ops(),
+            qc_adder_1.get_reversed_circuit(),
             list(self.register_y) +
             [self.register_anc[0]] +
             borrowable +
@@ -2,6 +2,7 @@ from qiskit import QuantumCircuit
 from qiskit.circuit.library import IntegerComparator
 
 from api.CircuitChooser import CircuitChooser
+from api.CircuitNotSupportedError import CircuitNotSupportedError
 from api.comparator.QuantumClassicalComparator import QuantumClassicalComparator
 
 
@@ -12,6 +13,8 @@ class QiskitComparator(QuantumClassicalComparator):
     """
 
     def __init__(self, dqa: int, cqa: int, n: int, a: int, c: int = 0):
+        if cqa < n - 1:
+            raise CircuitNotSupportedError("QiskitComparator requires n - 1 clean qubits.")
         super().__init__(dqa, cqa, n, a % (1 << n), c)
 
     def get_circuit(self, *args) -> QuantumCircuit:
@@ -39,7 +39,7 @@ class FullSubtractionComparator(QuantumQuantumComparator):
         )
 
         # subtract x -y and the msb result bit will be in r.
-        circuit.append(qq_adder.get_circuit().reverse_ops(),
+        circuit.append(qq_adder.get_reversed_circuit(),
                        list(self.register_c) +
                        list(self.register_y) +
                        list(self.register_x) +
@@ -24,11 +24,15 @@ class RNSLECPointAdderIP(QuantumClassicalECPointAdderIP):
         super().__init__(dqa, cqa, n, ec_point, p, c)
         self.with_modular_inversion = with_modular_inversion
 
+    def get_global_identifier(self):
+        # The circuit (and hence its metrics) depends on whether modular inversion is applied.
+        return self.identifier, self.with_modular_inversion
+
     # noinspection PyUnboundLocalVariable
     def get_circuit(self) -> QuantumCircuit:
         cache = CircuitChooser().cache
 
-        param_identifier = (self.identifier, self.with_modular_inversion)
+        param_identifier = self.get_global_identifier()
         if cache.get(param_identifier, None) is not None:
             return cache[param_identifier]
 
@@ -57,7 +61,7 @@ class RNSLECPointAdderIP(QuantumClassicalECPointAdderIP):
         borrowable = list(self.register_y) + list(self.register_c)
 
         circuit.append(
-            qc_mod_adder_1.get_circuit().reverse_ops(),
+            qc_mod_adder_1.get_reversed_circuit(),
             list(self.register_x) +
             list(self.register_g) +  # Improve parallelism: choose register_g first, only use y if necessary.
             borrowable +
@@ -76,7 +80,7 @@ class RNSLECPointAdderIP(QuantumClassicalECPointAdderIP):
         borrowable = list(self.register_x)
 
         circuit.append(
-            qc_mod_adder_2.get_circuit().reverse_ops(),
+            qc_mod_adder_2.get_reversed_circuit(),
             list(self.register_c) +
             list(self.register_y) +
             list(reversed(list(
@@ -128,7 +132,7 @@ class RNSLECPointAdderIP(QuantumClassicalECPointAdderIP):
         borrowable = list(register_t) + list(self.register_c)
 
         circuit.append(
-            qq_mod_multiplier_1.get_circuit().reverse_ops(),
+            qq_mod_multiplier_1.get_reversed_circuit(),
             list(register_lambda) +
             list(self.register_x) +
             list(self.register_y) +
@@ -149,7 +153,7 @@ class RNSLECPointAdderIP(QuantumClassicalECPointAdderIP):
             borrowable = list(self.register_y) + list(self.register_c) + list(register_lambda)
 
             circuit.append(
-                qc_mod_inverter_2.get_circuit().reverse_ops(),
+                qc_mod_inverter_2.get_reversed_circuit(),
                 list(self.register_x) +
                 list(register_t) +
                 list(self.register_g) +
@@ -188,7 +192,7 @@ class RNSLECPointAdderIP(QuantumClassicalECPointAdderIP):
         borrowable = list(self.register_y) + list(register_lambda)
 
         circuit.append(
-            qq_mod_adder_1.get_circuit().reverse_ops(),
+            qq_mod_adder_1.get_reversed_circuit(),
             list(self.register_c) +
             list(register_t) +
             list(self.register_x) +
@@ -222,7 +226,7 @@ class RNSLECPointAdderIP(QuantumClassicalECPointAdderIP):
         borrowable = list(self.register_y) + list(self.register_c) + list(self.register_x)
 
         circuit.append(
-            qq_mod_sqr_1.get_circuit().reverse_ops(),
+            qq_mod_sqr_1.get_reversed_circuit(),
             list(register_lambda) +
             list(register_t) +
             list(self.register_g) +
@@ -260,7 +264,7 @@ class RNSLECPointAdderIP(QuantumClassicalECPointAdderIP):
         borrowable = list(self.register_x) + list(self.register_c)
 
         circuit.append(
-            qq_mod_multiplier_1.get_circuit().reverse_ops(),
+            qq_mod_multiplier_1.get_reversed_circuit(),
             list(self.register_y) +
             list(register_t) +
             list(register_lambda) +
@@ -272,7 +276,7 @@ class RNSLECPointAdderIP(QuantumClassicalECPointAdderIP):
             borrowable = list(self.register_y) + list(self.register_c)
 
             circuit.append(
-                qc_mod_inverter_1.get_circuit().reverse_ops(),
+                qc_mod_inverter_1.get_reversed_circuit(),
                 list(self.register_x) +
                 list(register_t) +
                 list(self.register_g) +
@@ -313,7 +317,7 @@ class RNSLECPointAdderIP(QuantumClassicalECPointAdderIP):
         borrowable = list(self.register_x)
 
         circuit.append(
-            qc_mod_adder_2.get_circuit().reverse_ops(),
+            qc_mod_adder_2.get_reversed_circuit(),
             list(self.register_c) +
             list(self.register_y) +
             list(reversed(list(
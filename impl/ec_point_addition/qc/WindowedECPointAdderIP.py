@@ -0,0 +1,202 @@
+from qiskit import QuantumCircuit
+
+from api.CircuitChooser import CircuitChooser
+from api.CircuitNotSupportedError import CircuitNotSupportedError
+from api.ec_point_addition.QuantumClassicalWindowedECPointAdderIP import QuantumClassicalWindowedECPointAdderIP
+from impl.encoding.table_lookup import table_lookup, table_lookup_ancillas
+
+
+def ec_add(point_1: (int, int), point_2: (int, int), a: int, p: int) -> (int, int):
+    """
+    Classical addition of two points on the curve y^2 = x^3 + ax + b mod p, None is the point at infinity.
+    """
+    if point_1 is None:
+        return point_2
+    if point_2 is None:
+        return point_1
+    (x_1, y_1), (x_2, y_2) = point_1, point_2
+    if x_1 == x_2 and (y_1 + y_2) % p == 0:
+        return None
+    if x_1 == x_2:
+        if a is None:
+            raise CircuitNotSupportedError("The curve parameter is required to double a point.")
+        slope = (3 * x_1 * x_1 + a) * pow(2 * y_1, -1, p) % p
+    else:
+        slope = (y_2 - y_1) * pow(x_2 - x_1, -1, p) % p
+    x_3 = (slope * slope - x_1 - x_2) % p
+    return x_3, (slope * (x_1 - x_3) - y_1) % p
+
+
+def curve_parameter(points: list[(int, int)], p: int) -> int | None:
+    """
+    :return: The parameter a of the curve y^2 = x^3 + ax + b mod p through the points, None if it is not determined.
+    """
+    for (x_1, y_1) in points:
+        for (x_2, y_2) in points:
+            if (x_1 - x_2) % p != 0:
+                return ((y_1 * y_1 - x_1 ** 3) - (y_2 * y_2 - x_2 ** 3)) * pow(x_1 - x_2, -1, p) % p
+    return None
+
+
+class WindowedECPointAdderIP(QuantumClassicalWindowedECPointAdderIP):
+    """
+    Windowed elliptic-curve point addition, based on the point addition by Roetteler, Naehrig, Svore and Lauter
+    (https://arxiv.org/pdf/1706.06752) and the windowing by Gidney (https://arxiv.org/pdf/1905.07682).
+
+    The w window qubits e form the address of a table lookup, which loads the classically precomputed sum of the
+    selected points. The sum is then added with the same sequence
+    of operations as RNSLECPointAdderIP, where the additions of the constant point are quantum-quantum additions of
+    the loaded point, so a window of w exponent qubits costs a single point addition.
+    A loaded flag replaces the control of RNSLECPointAdderIP and is 0 if the sum is the point at infinity.
+
+    It will apply the following unitary transformation: |e>|x_1>|y_1>|0> --> |e>|x_3>|y_3>|0>.
+    Where (x_1, y_1) + sum of e_i * P_i = (x_3, y_3) according to elliptic curve addition.
+    """
+
+    def __init__(self,
+                 dqa: int,
+                 cqa: int,
+                 n: int,
+                 ec_points: tuple,
+                 p: int,
+                 w: int,
+                 with_modular_inversion: bool = True):
+        if w == 0 or len(ec_points) != w or not all(isinstance(point, tuple) for point in ec_points):
+            raise CircuitNotSupportedError("Requires one point per window qubit.")
+        # Loaded x_2, y_2 and whether the sum is a finite point, the sub-components need two more clean ancillae
+        # (as in RNSLECPointAdderIP), which the table lookup uses as well.
+        if cqa < 4 * n + 1 + max(table_lookup_ancillas(w), 2):
+            raise CircuitNotSupportedError("Not enough clean ancillae to load the points.")
+        super().__init__(dqa, cqa, n, tuple(ec_points), p, w)
+        self.with_modular_inversion = with_modular_inversion
+
+    def get_global_identifier(self):
+        # The circuit (and hence its metrics) depends on whether modular inversion is applied.
+        return self.identifier, self.with_modular_inversion
+
+    def get_table(self) -> list[(int, int)]:
+        """
+        :return: The sum of the points selected by each address, None for the point at infinity.
+        """
+        a = curve_parameter(list(self.ec_points), self.p)
+        table = [None]
+        for point in self.ec_points:
+            table += [ec_add(entry, point, a, self.p) for entry in table]
+        return table
+
+    def get_circuit(self) -> QuantumCircuit:
+        cache = CircuitChooser().cache
+
+        param_identifier = self.get_global_identifier()
+        if cache.get(param_identifier, None) is not None:
+            return cache[param_identifier]
+
+        circuit = QuantumCircuit(
+            self.register_e,
+            self.register_x,
+            self.register_y,
+            self.register_g,
+            self.register_anc,
+            name=f"$+{self.ec_points}$"
+        )
+
+        n = self.n
+        register_x = list(self.register_x)
+        register_y = list(self.register_y)
+        # Helper registers:
+        register_t = list(self.register_anc[0:n])
+        register_lambda = list(self.register_anc[n:2 * n])
+        # Loaded point, (0, 0) and flag 0 for the point at infinity.
+        register_x_2 = list(self.register_anc[2 * n:3 * n])
+        register_y_2 = list(self.register_anc[3 * n:4 * n])
+        flag = self.register_anc[4 * n]
+
+        table = self.get_table()
+        point_lookup = table_lookup(
+            self.w,
+            2 * n + 1,
+            [0 if point is None else point[0] | (point[1] << n) | (1 << 2 * n) for point in table]
+        )
+        # Changes the loaded x_2 into 3x_2 and back.
+        triple_lookup = table_lookup(
+            self.w,
+            n,
+            [0 if point is None else point[0] ^ ((3 * point[0]) % self.p) for point in table]
+        )
+        lookup_ancillas = list(self.register_anc[4 * n + 1:4 * n + 1 + table_lookup_ancillas(self.w)])
+        point_lookup_qubits = list(self.register_e) + register_x_2 + register_y_2 + [flag] + lookup_ancillas
+        triple_lookup_qubits = list(self.register_e) + register_x_2 + lookup_ancillas
+
+        circuit.append(point_lookup, point_lookup_qubits)
+
+        # -x_2
+        self._append_component(circuit, "QQModAdderIP", (n, self.p, 0), register_x_2 + register_x, True)
+        # -y_2
+        self._append_component(circuit, "QQModAdderIP", (n, self.p, 0), register_y_2 + register_y, True)
+        if self.with_modular_inversion:
+            self._append_component(circuit, "QQModInversionOOP", (n, self.p, 0), register_x + register_t)
+        # Quantum Quantum multiplication y*t --> lambda
+        self._append_component(circuit, "QQModMulOOP", (n, self.p, 0), register_y + register_t + register_lambda)
+        self._append_component(circuit, "QQModMulOOP", (n, self.p, 0),
+                               register_lambda + register_x + register_y, True)
+        # Modular inversion, again stored into register t
+        if self.with_modular_inversion:
+            self._append_component(circuit, "QQModInversionOOP", (n, self.p, 0), register_x + register_t, True)
+        # Modular Squaring lambda into t
+        self._append_component(circuit, "QCModSquaringOOP", (n, self.p, 0), register_lambda + register_t)
+        # x - t
+        self._append_component(circuit, "QQModAdderIP", (n, self.p, 1), [flag] + register_t + register_x, True)
+        # +3x_2
+        circuit.append(triple_lookup, triple_lookup_qubits)
+        self._append_component(circuit, "QQModAdderIP", (n, self.p, 0), register_x_2 + register_x)
+        circuit.append(triple_lookup, triple_lookup_qubits)
+        # Modular Squaring lambda into t
+        self._append_component(circuit, "QCModSquaringOOP", (n, self.p, 0), register_lambda + register_t, True)
+        # Quantum Quantum multiplication x*lambda --> y
+        self._append_component(circuit, "QQModMulOOP", (n, self.p, 0), register_lambda + register_x + register_y)
+        # Modular inversion, again stored into register t
+        if self.with_modular_inversion:
+            self._append_component(circuit, "QQModInversionOOP", (n, self.p, 0), register_x + register_t)
+        # Quantum Quantum multiplication y*t --> lambda
+        self._append_component(circuit, "QQModMulOOP", (n, self.p, 0),
+                               register_y + register_t + register_lambda, True)
+        if self.with_modular_inversion:
+            self._append_component(circuit, "QQModInversionOOP", (n, self.p, 0), register_x + register_t, True)
+        # Modular negation, t is clean again, so x --> -x is done by t = -x, x = x + t = 0 and swapping x and t.
+        self._append_component(circuit, "QQModAdderIP", (n, self.p, 1), [flag] + register_x + register_t, True)
+        self._append_component(circuit, "QQModAdderIP", (n, self.p, 1), [flag] + register_t + register_x)
+        for i in range(0, n):
+            circuit.cswap(flag, register_x[i], register_t[i])
+        # +x_2
+        self._append_component(circuit, "QQModAdderIP", (n, self.p, 0), register_x_2 + register_x)
+        # -y_2
+        self._append_component(circuit, "QQModAdderIP", (n, self.p, 0), register_y_2 + register_y, True)
+
+        circuit.append(point_lookup, point_lookup_qubits)
+
+        cache[param_identifier] = circuit
+
+        return circuit
+
+    def _append_component(self, circuit: QuantumCircuit, circuit_type: str, args: tuple, operands: list,
+                          reverse: bool = False):
+        """
+        Appends a sub-component on the operands, all other qubits of the data and helper registers are borrowable.
+        The loaded point and its flag take 4n + 1 of the clean ancillae, the remaining ones are clean.
+        """
+        data = (list(self.register_e) + list(self.register_x) + list(self.register_y) +
+                list(self.register_anc[:4 * self.n + 1]))
+        borrowable = [qubit for qubit in data if qubit not in operands]
+        component = CircuitChooser().choose_component(
+            circuit_type,
+            args,
+            dirty_available=self.dqa + len(borrowable),
+            clean_available=self.cqa - 4 * self.n - 1
+        )
+        circuit.append(
+            component.get_reversed_circuit() if reverse else component.get_circuit(),
+            operands +
+            list(self.register_g) +
+            borrowable +
+            list(self.register_anc[4 * self.n + 1:])
+        )
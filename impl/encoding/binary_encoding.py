@@ -7,18 +7,18 @@ def binary_encoding(n: int, value: int, big_endian: bool = False, c: int = 0) ->
     if required_qubits > n:
         raise ValueError(f"Required qubits to encode {value} is {required_qubits}, yet only {n} where provided.")
 
+    # The controls come first, as with circuit.control(c).
+    register_c = QuantumRegister(c, 'c')
     q = QuantumRegister(n, 'q')
-    circuit = QuantumCircuit(q, name=f'$|{bin(value)[2:].zfill(n)} \\rangle$')
+    circuit = QuantumCircuit(register_c, q, name=f'$|{bin(value)[2:].zfill(n)} \\rangle$')
 
     for i in range(0, required_qubits):
         if (value & 1) == 1:  # get the rightmost_bit
-            if big_endian:
-                circuit.x(q[n - 1 - i])  # use n here and not required_qubits!
+            target = q[n - 1 - i] if big_endian else q[i]  # use n here and not required_qubits!
+            if c > 0:
+                circuit.mcx(list(register_c), target)
             else:
-                circuit.x(q[i])
+                circuit.x(target)
         value >>= 1  # Shift bits to the right once (divide by 2)
 
-    if c > 0:
-        return circuit.control(c)
-    else:
-        return circuit
+    return circuit
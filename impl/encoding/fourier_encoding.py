@@ -0,0 +1,36 @@
+import math
+
+from qiskit import QuantumCircuit, QuantumRegister
+
+
+def fourier_rotation_kept(d: int, n: int, approximation_degree: int = 0) -> bool:
+    """
+    :return: If a rotation by pi / 2^d on an n-qubit register is kept, the approximation_degree smallest
+     rotations are dropped (as in Coppersmith's approximate QFT).
+    """
+    return d < n - approximation_degree
+
+
+def fourier_encoding(n: int, approximation_degree: int = 0) -> QuantumCircuit:
+    """
+    QFT without the final swaps, which takes |y> (little endian) to the Fourier encoding of y,
+    where qubit j is in the state |0> + e^(2 pi i y / 2^(j + 1))|1>.
+    Adding to the Fourier encoding then needs a rotation by pi / 2^(j - k) on qubit j for each bit k <= j.
+    Its inverse (see Instruction.inverse) decodes to the binary encoding again.
+    :param n: Size of the register.
+    :param approximation_degree: Number of the smallest rotations which are dropped, 0 for the exact QFT.
+    :return: The circuit.
+    """
+    if approximation_degree < 0:
+        raise ValueError(f"The approximation degree must be non-negative, got {approximation_degree}.")
+
+    q = QuantumRegister(n, 'q')
+    circuit = QuantumCircuit(q, name=f"$QFT_{{{n}}}$")
+
+    for j in reversed(range(0, n)):
+        circuit.h(q[j])
+        for k in range(0, j):
+            if fourier_rotation_kept(j - k, n, approximation_degree):
+                circuit.cp(math.pi / 2 ** (j - k), q[k], q[j])
+
+    return circuit
@@ -0,0 +1,108 @@
+import math
+
+from qiskit import QuantumCircuit, QuantumRegister
+
+
+def table_lookup_ancillas(w: int, c: int = 0) -> int:
+    """
+    :return: Number of clean ancillas required by table_lookup(w, n, table, c).
+    """
+    if c == 0:
+        return max(w - 1, 0)
+    if c == 1:
+        return w
+    # One more to combine the controls.
+    return w + 1
+
+
+def window_size(n: int, clean_available: int, c: int, windows: int = 1) -> int:
+    """
+    Largest useful window for n-bit windowed arithmetic, if clean_available ancillas are left for the table lookup.
+    A lookup of w bits costs about 2^w Toffoli gates, which should not exceed the cost of the n-bit addition it saves.
+    :param windows: Number of windows of w bits which together form the address of the lookup.
+    :return: The window size, 0 if not even a window of 1 bit fits.
+    """
+    w = min(n, max(1, math.floor(math.log2(n)))) if n > 0 else 0
+    while w > 0 and table_lookup_ancillas(windows * w, c) > clean_available:
+        w -= 1
+    return w
+
+
+def table_lookup(w: int, n: int, table: list[int], c: int = 0) -> QuantumCircuit:
+    """
+    QROM table lookup by unary iteration (Babbush et al. https://arxiv.org/pdf/1805.03662, Fig 7.),
+    as used for windowed arithmetic by Gidney (https://arxiv.org/pdf/1905.07682).
+
+    Takes |a>|t> to |a>|t XOR table[a]> (controlled by c bits), entries beyond the table are 0.
+    The lookup is its own inverse, appending it again unloads the entry.
+    Qubits: c controls, w address qubits, n target qubits and table_lookup_ancillas(w, c) clean ancillas.
+    :param w: Size of the address.
+    :param n: Size of the target.
+    :param table: The classical table, with entries below 2^n.
+    :param c: Number of controls.
+    """
+    if any(value.bit_length() > n for value in table):
+        raise ValueError(f"The table has entries which do not fit into {n} qubits.")
+    register_c = QuantumRegister(c, 'c')
+    register_a = QuantumRegister(w, 'a')
+    register_t = QuantumRegister(n, 't')
+    register_anc = QuantumRegister(table_lookup_ancillas(w, c), 'anc')
+    circuit = QuantumCircuit(register_c, register_a, register_t, register_anc, name=f"$QROM_{{{w}}}$")
+
+    table = list(table[:2 ** w]) + [0] * (2 ** w - len(table[:2 ** w]))
+    if c == 0:
+        control = None
+        anc = list(register_anc)
+    elif c == 1:
+        control = register_c[0]
+        anc = list(register_anc)
+    else:
+        control = register_anc[0]
+        anc = list(register_anc[1:])
+        circuit.mcx(register_c, control)
+
+    _unary_iteration(circuit, control, list(register_a), anc, register_t, table, 0)
+
+    if c > 1:
+        circuit.mcx(register_c, control)
+
+    return circuit
+
+
+def _unary_iteration(circuit: QuantumCircuit, control, address: list, anc: list, register_t: QuantumRegister,
+                     table: list[int], offset: int):
+    """
+    Writes table[offset + a] for the lower address bits a into register_t, if the control is set (None: always).
+    Each level of the iteration uses one ancilla holding control AND (the current most significant address bit).
+    """
+    size = 2 ** len(address)
+    if not any(table[offset:offset + size]):
+        # Nothing to load in this subtree.
+        return
+    if len(address) == 0:
+        for i in range(0, register_t.size):
+            if (table[offset] >> i) & 1:
+                if control is None:
+                    circuit.x(register_t[i])
+                else:
+                    circuit.cx(control, register_t[i])
+        return
+
+    bit = address[-1]
+    half = size // 2
+    if control is None:
+        # The most significant bit (or its negation) is the control of each half.
+        circuit.x(bit)
+        _unary_iteration(circuit, bit, address[:-1], anc, register_t, table, offset)
+        circuit.x(bit)
+        _unary_iteration(circuit, bit, address[:-1], anc, register_t, table, offset + half)
+        return
+
+    flag = anc[0]
+    # flag = control AND NOT bit
+    circuit.ccx(control, bit, flag, ctrl_state=0b01)
+    _unary_iteration(circuit, flag, address[:-1], anc[1:], register_t, table, offset)
+    # flag = control AND bit
+    circuit.cx(control, flag)
+    _unary_iteration(circuit, flag, address[:-1], anc[1:], register_t, table, offset + half)
+    circuit.ccx(control, bit, flag)
@@ -0,0 +1,119 @@
+import math
+
+from qiskit import QuantumCircuit
+
+from api.CircuitChooser import CircuitChooser
+from api.CircuitNotSupportedError import CircuitNotSupportedError
+from api.exponentation.modular.QuantumClassicalModularExponentiationIP import QuantumClassicalModularExponentiationIP
+from impl.encoding.table_lookup import table_lookup, table_lookup_ancillas, window_size
+
+
+class WindowedConstantModExpIP(QuantumClassicalModularExponentiationIP):
+    """
+    Windowed modular exponentiation circuit in place by Gidney (https://arxiv.org/pdf/1905.07682, Fig 4.).
+
+    Instead of one controlled modular multiplication per exponent bit, w exponent bits are processed together:
+    the multiplication by a^(e * 2^j) mod p for the value e of the exponent window is done by windowed
+    multiply-adds, whose table lookups are addressed by the exponent window and a window of the multiplicand.
+    As in HRSConstantModularMultiplierIP, y * A is added into a clean register, y is cleared by subtracting
+    (y * A) * A^(-1) and the registers are swapped.
+    The window size is derived from the clean ancillas, which the table lookup needs besides 2 * mod_bit_len qubits
+    for the product and the loaded entry.
+    """
+
+    def __init__(self, dqa: int, cqa: int, n: int, a: int, p: int, c: int):
+        super().__init__(dqa, cqa, n, a, p, c)
+        if math.gcd(a, p) != 1:
+            raise CircuitNotSupportedError("a must be invertible modulo p.")
+        # Product and looked up entry, the others are used by the lookup and then by the modular addition.
+        self.w = min(window_size(self.mod_bit_len, cqa - 2 * self.mod_bit_len, c, 2), n)
+        if self.w == 0 or cqa - 2 * self.mod_bit_len < 1:
+            raise CircuitNotSupportedError("Not enough clean ancillae for the table lookup.")
+
+    def get_circuit(self) -> QuantumCircuit:
+        cache = CircuitChooser().cache
+
+        if cache.get(self.identifier, None) is not None:
+            return cache[self.identifier]
+
+        circuit = QuantumCircuit(
+            self.register_c,
+            self.register_x,
+            self.register_y,
+            self.register_g,
+            self.register_anc,
+            name=f"${self.a}^x~mod~{self.p}$"
+        )
+
+        m = self.mod_bit_len
+        register_product = list(self.register_anc[:m])
+        register_t = list(self.register_anc[m:2 * m])
+
+        # The exponent and the idle one of y or the product can be borrowed.
+        qq_mod_adder = CircuitChooser().choose_component(
+            "QQModAdderIP",
+            (m, self.p, 0),
+            dirty_available=self.dqa + self.n + m,
+            clean_available=self.cqa - 2 * m
+        )
+        qq_mod_adder_circuit = qq_mod_adder.get_circuit()
+        qq_mod_subtractor_circuit = qq_mod_adder.get_reversed_circuit()
+
+        for j in range(0, self.n, self.w):
+            exponent_window = list(self.register_x[j:j + self.w])
+            factors = [pow(self.a, e * 2 ** j, self.p) for e in range(0, 2 ** len(exponent_window))]
+            inverse_factors = [pow(factor, -1, self.p) for factor in factors]
+
+            # product = y * a^(e * 2^j)
+            self._append_windowed_multiply_add(circuit, qq_mod_adder_circuit, exponent_window, factors,
+                                               list(self.register_y), register_product, register_t)
+            # y = y - product * a^(-e * 2^j) = 0
+            self._append_windowed_multiply_add(circuit, qq_mod_subtractor_circuit, exponent_window, inverse_factors,
+                                               register_product, list(self.register_y), register_t)
+
+            if self.c > 0:
+                for i in range(0, m):
+                    # Since we know the register_y[i] now contains zeros, we can simplify this controlled swap.
+                    circuit.mcx(list(self.register_c) + [register_product[i]], self.register_y[i])
+                    circuit.mcx(list(self.register_c) + [self.register_y[i]], register_product[i])
+            else:
+                for i in range(0, m):
+                    # Since we know the register_y[i] now contains zeros, we can simplify this swap to two CNOTs.
+                    circuit.cx(register_product[i], self.register_y[i])
+                    circuit.cx(self.register_y[i], register_product[i])
+
+        cache[self.identifier] = circuit
+
+        return circuit
+
+    def _append_windowed_multiply_add(self, circuit: QuantumCircuit, qq_mod_adder_circuit: QuantumCircuit,
+                                      exponent_window: list, factors: list[int], register_in: list,
+                                      register_out: list, register_t: list):
+        """
+        Applies the modular adder (or subtractor) to register_out with factors[e] * register_in mod p,
+        one multiplicand window at a time.
+        """
+        m = self.mod_bit_len
+        for i in range(0, m, self.w):
+            window = register_in[i:i + self.w]
+            address = exponent_window + window
+            # The exponent window forms the lower bits of the address.
+            table = [(factors[e] * k * 2 ** i) % self.p
+                     for k in range(0, 2 ** len(window)) for e in range(0, 2 ** len(exponent_window))]
+            lookup = table_lookup(len(address), m, table, self.c)
+            lookup_qubits = (list(self.register_c) +
+                             address +
+                             register_t +
+                             list(self.register_anc[2 * m:2 * m + table_lookup_ancillas(len(address), self.c)]))
+
+            circuit.append(lookup, lookup_qubits)
+            circuit.append(
+                qq_mod_adder_circuit,
+                register_t +
+                register_out +
+                list(self.register_g) +
+                list(self.register_x) +
+                register_in +
+                list(self.register_anc[2 * m:])
+            )
+            circuit.append(lookup, lookup_qubits)
@@ -59,7 +59,7 @@ class HRSConstantModularMultiplierIP(QuantumClassicalModularMultiplierIP):
 
         # subtract (a^{-1}ax)
         circuit.append(
-            qc_mul_2.get_circuit().reverse_ops(),
+            qc_mul_2.get_reversed_circuit(),
             list(self.register_c) +
             list(self.register_anc[:self.n]) +
             list(self.register_x) +
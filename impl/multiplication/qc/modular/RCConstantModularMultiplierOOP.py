@@ -17,6 +17,8 @@ class RCConstantModularMultiplierOOP(QuantumClassicalModularMultiplierOOP):
             raise CircuitNotSupportedError("Circuit is only valid for odd modulus.")
         super().__init__(dqa, cqa, n, a, p, c)
         self.m = math.ceil(math.log2(n))
+        if cqa < self.m:
+            raise CircuitNotSupportedError("Requires m clean ancillae for the upper bits of the product.")
 
     def get_circuit(self, *args) -> QuantumCircuit:
         cache = CircuitChooser().cache
@@ -73,7 +75,7 @@ class RCConstantModularMultiplierOOP(QuantumClassicalModularMultiplierOOP):
             borrowable = list(self.register_x) + list(self.register_anc[(self.m - k_inv):self.m])
 
             circuit.append(
-                adder.get_circuit().reverse_ops(),
+                adder.get_reversed_circuit(),
                 list(self.register_c) +
                 list(self.register_r) +  # result register t
                 list(self.register_anc[:self.m - k_inv]) +  # result register t
@@ -177,7 +179,7 @@ class RCConstantModularMultiplierOOP(QuantumClassicalModularMultiplierOOP):
             borrowable.remove(self.register_x[i])
 
             circuit.append(
-                adder.get_circuit().reverse_ops(),
+                adder.get_reversed_circuit(),
                 list(self.register_c) +
                 [self.register_x[i]] +
                 list(self.register_anc[:self.m]) +  # result register t
@@ -0,0 +1,74 @@
+from qiskit import QuantumCircuit
+
+from api.CircuitChooser import CircuitChooser
+from api.CircuitNotSupportedError import CircuitNotSupportedError
+from api.multiplication.modular.QuantumClassicalModularMultiplierOOP import QuantumClassicalModularMultiplierOOP
+from impl.encoding.table_lookup import table_lookup, table_lookup_ancillas, window_size
+
+
+class WindowedConstantModularMultiplierOOP(QuantumClassicalModularMultiplierOOP):
+    """
+    Windowed constant modular multiplication by Gidney (https://arxiv.org/pdf/1905.07682, Fig 2.).
+
+    Instead of one controlled addition of a * 2^i mod p per bit of x, the bits of x are grouped into windows of w
+    bits. A table lookup loads a * k * 2^(jw) mod p for the value k of window j, which is added with one
+    quantum-quantum modular addition and then unloaded again.
+    The window size is derived from the clean ancillas, which the table lookup needs besides the n qubits of the
+    loaded entry.
+    """
+
+    def __init__(self, dqa: int, cqa: int, n: int, a: int, p: int, c: int = 0):
+        # n qubits for the looked up entry, the others are used by the lookup and then by the modular addition.
+        self.w = window_size(n, cqa - n, c)
+        if self.w == 0 or cqa - n < 1:
+            raise CircuitNotSupportedError("Not enough clean ancillae for the table lookup.")
+        super().__init__(dqa, cqa, n, a, p, c)
+
+    def get_circuit(self, *args) -> QuantumCircuit:
+        cache = CircuitChooser().cache
+
+        if cache.get(self.identifier, None) is not None:
+            return cache[self.identifier]
+
+        circuit = QuantumCircuit(
+            self.register_c,
+            self.register_x,
+            self.register_r,
+            self.register_g,
+            self.register_anc,
+            name=f"$\\cdot {self.a} ~mod~{self.p}$"
+        )
+
+        register_t = list(self.register_anc[:self.n])
+
+        # The lookup is done before the addition, so the adder can use its ancillae.
+        qq_mod_adder = CircuitChooser().choose_component(
+            "QQModAdderIP",
+            (self.n, self.p, 0),
+            dirty_available=self.dqa + self.n,
+            clean_available=self.cqa - self.n
+        )
+
+        for j in range(0, self.n, self.w):
+            window = list(self.register_x[j:j + self.w])
+            table = [(self.a * k * 2 ** j) % self.p for k in range(0, 2 ** len(window))]
+            lookup = table_lookup(len(window), self.n, table, self.c)
+            lookup_qubits = (list(self.register_c) +
+                             window +
+                             register_t +
+                             list(self.register_anc[self.n:self.n + table_lookup_ancillas(len(window), self.c)]))
+
+            circuit.append(lookup, lookup_qubits)
+            circuit.append(
+                qq_mod_adder.get_circuit(),
+                register_t +
+                list(self.register_r) +
+                list(self.register_g) +
+                list(self.register_x) +
+                list(self.register_anc[self.n:])
+            )
+            circuit.append(lookup, lookup_qubits)
+
+        cache[self.identifier] = circuit
+
+        return circuit
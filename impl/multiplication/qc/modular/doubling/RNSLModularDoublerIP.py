@@ -1,6 +1,7 @@
 from qiskit import QuantumCircuit
 
 from api.CircuitChooser import CircuitChooser
+from api.CircuitNotSupportedError import CircuitNotSupportedError
 from api.multiplication.modular.QuantumClassicalModularDoublerIP import QuantumClassicalModularDoublerIP
 from impl.multiplication.qc.BitshiftMultiplierIP import LeftwardBitshiftMultiplierIP
 
@@ -16,6 +17,8 @@ class RNSLModularDoublerIP(QuantumClassicalModularDoublerIP):
         super().__init__(dqa, cqa, n, p, c)
         if not p % 2 == 1:
             raise ValueError("p must be an odd number!")
+        if cqa < 1:
+            raise CircuitNotSupportedError("Requires a clean ancilla for the carry of the bit shift.")
 
     def get_circuit(self, *args) -> QuantumCircuit:
         cache = CircuitChooser().cache
@@ -47,7 +50,7 @@ class RNSLModularDoublerIP(QuantumClassicalModularDoublerIP):
         )
 
         circuit.append(
-            qc_adder_1.get_circuit().reverse_ops(),
+            qc_adder_1.get_reversed_circuit(),
             list(self.register_x) +
             [self.register_anc[0]] +
             list(self.register_g) +
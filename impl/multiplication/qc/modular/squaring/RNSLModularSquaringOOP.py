@@ -1,6 +1,7 @@
 from qiskit import QuantumCircuit
 
 from api.CircuitChooser import CircuitChooser
+from api.CircuitNotSupportedError import CircuitNotSupportedError
 from api.multiplication.modular.QuantumClassicalModularSquarerOOP import QuantumClassicalModularSquarerOOP
 
 
@@ -12,6 +13,8 @@ class RNSLModularSquaringOOP(QuantumClassicalModularSquarerOOP):
     def __init__(self, dqa: int, cqa: int, n: int, p: int, c: int):
         if p % 2 == 0:
             raise ValueError("Modulus must be odd!")
+        if cqa < 2:
+            raise CircuitNotSupportedError("Requires a clean ancilla for the copy of x_i and one for the modular adder.")
         super().__init__(dqa, cqa, n, p, c)
 
     def get_circuit(self, *args) -> QuantumCircuit:
@@ -21,6 +24,7 @@ class RNSLModularSquaringOOP(QuantumClassicalModularSquarerOOP):
             return cache[self.identifier]
 
         circuit = QuantumCircuit(
+            self.register_c,
             self.register_x,
             self.register_r,
             self.register_g,
@@ -31,18 +35,19 @@ class RNSLModularSquaringOOP(QuantumClassicalModularSquarerOOP):
         for i in reversed(range(0, self.n)):
             circuit.cx(self.register_x[i], self.register_anc[0])
 
-            # Addition of two quantum states mod p. with 1 control
+            # Addition of two quantum states mod p. with 1 control (and the controls of the squarer)
             # Will be repeated n times in the exact same conditions.
             # No qubits available for borrowing
             qq_mod_add = CircuitChooser().choose_component(
                 "QQModAdderIP",
-                (self.n, self.p, 1),
+                (self.n, self.p, self.c + 1),
                 dirty_available=self.dqa,
                 clean_available=self.cqa - 1
             )
 
             circuit.append(
                 qq_mod_add.get_circuit(),
+                list(self.register_c) +
                 [self.register_anc[0]] +
                 list(self.register_x) +
                 list(self.register_r) +
@@ -55,11 +60,12 @@ class RNSLModularSquaringOOP(QuantumClassicalModularSquarerOOP):
             if i > 0:  # Don't double for the LSB.
                 # IP Modular Multiplication *2 (Modular doubling)
                 # Will be repeated n - 1 times in the exact same conditions.
-                # With n borrable qubits (register_x)
+                # With n borrable qubits (register_x) and the controls.
+                # Uncontrolled, as the result register stays 0 if the additions are turned off.
                 qc_mod_dbl = CircuitChooser().choose_component(
                     "QCModDoublerIP",
                     (self.n, self.p, 0),
-                    dirty_available=self.dqa + self.n,
+                    dirty_available=self.dqa + self.c + self.n,
                     clean_available=self.cqa
                 )
 
@@ -67,6 +73,7 @@ class RNSLModularSquaringOOP(QuantumClassicalModularSquarerOOP):
                 borrowable.remove(self.register_x[i])
                 borrowable.append(self.register_x[i])
                 # push x[i] to the last borrowable position to improve parallelism.
+                borrowable += list(self.register_c)
 
                 circuit.append(
                     qc_mod_dbl.get_circuit(),
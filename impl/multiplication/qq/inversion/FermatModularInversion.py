@@ -4,7 +4,7 @@ from qiskit import QuantumCircuit
 from api.CircuitChooser import CircuitChooser
 from api.CircuitNotSupportedError import CircuitNotSupportedError
 from api.multiplication.modular.QuantumQuantumModularInverterOOP import QuantumQuantumModularInverterOOP
-from impl.util.modular_inversion_coefficients import get_coeffs
+from impl.util.modular_inversion_coefficients import iter_coeffs
 
 
 class FermatModularInversion(QuantumQuantumModularInverterOOP):
@@ -31,14 +31,15 @@ class FermatModularInversion(QuantumQuantumModularInverterOOP):
             return cache[self.identifier]
 
         # Get coefficients of the gates
-        # Currently not doable in polynomial time, but I believe this part can definitely be reduced to polynomial time.
+        # These are computed from the 2^n evaluations of x^(p-2) (see modular_inversion_coefficients.py).
         # Unfortunately the number of subsets, cannot be reduced, unless we can find out the following:
         # For which p are <= log(p) coefficients non-zero (exponentially many entries are 0)
         # And then for such p, which subsets have a zero coefficient.
         # Without having to calculate all coefficients for all permutations (since we know which ones will be zero)
         # And since there are exponentially many that are 0 (the existance of these 'p' can be emperically checked)
         # We would have for certain primes, a way of creating the modular inverse in polynomial time, outperforming GCD.
-        coeffs = get_coeffs(self.p, remove_larger_subsets=True)
+        # Only the non-zero coefficients (see coefficient_sparsity), in the order of their values.
+        coeffs = sorted(iter_coeffs(self.p, remove_larger_subsets=True, skip_zero=True), key=lambda x: x[1])
 
         circuit = QuantumCircuit(
             self.register_x,
@@ -48,10 +49,7 @@ class FermatModularInversion(QuantumQuantumModularInverterOOP):
             name=f"$MODINV({self.p})$"
         )
 
-        for (subset, coeff) in sorted(coeffs.items(), key=lambda x: x[1]):
-            if coeff % self.p == 0:
-                continue
-
+        for (subset, coeff) in coeffs:
             control_qubits = [self.register_x[i] for i in subset]
 
             borrowable = [x for x in self.register_x]
@@ -0,0 +1,278 @@
+from qiskit import QuantumCircuit
+
+from api.CircuitChooser import CircuitChooser
+from api.CircuitNotSupportedError import CircuitNotSupportedError
+from api.multiplication.modular.QuantumQuantumModularInverterOOP import QuantumQuantumModularInverterOOP
+from impl.encoding.binary_encoding import binary_encoding
+
+
+class KaliskiModularInversion(QuantumQuantumModularInverterOOP):
+    """
+    Modular inversion circuit based on Kaliski's almost inverse, as used by Roetteler, Naehrig, Svore and Lauter
+    (https://arxiv.org/pdf/1706.06752, Section 3.3.).
+
+    Runs 2n rounds of the binary extended Euclidean algorithm on (u, v, r, s) = (p, x, 0, 1), which ends with
+    r = -x^(-1) * 2^k mod p after k active rounds. r is reduced mod p, halved k times and copied into the output,
+    then everything is uncomputed and the output is negated.
+    Each round stores whether it was active, the parities of u and v and the comparison u > v (4 bits per round),
+    so the circuit needs 12n + 4 clean qubits (and one more for the modular halving), but only O(n^2) gates.
+    The copy is the only controlled operation, which makes the controlled inversion cheap.
+
+    Takes |x>|0> to |x>|x^(-1) mod p> (x = 0 is mapped to 0), p must be odd.
+    """
+
+    def __init__(self, dqa: int, cqa: int, n: int, p: int, c: int):
+        if p % 2 == 0:
+            raise CircuitNotSupportedError("Circuit is only valid for an odd modulus.")
+        if cqa < 12 * n + 5:
+            raise CircuitNotSupportedError("Not enough clean ancillae for the round history and the halving.")
+        super().__init__(dqa, cqa, n, p, c)
+
+    def get_circuit(self, *args) -> QuantumCircuit:
+        cache = CircuitChooser().cache
+
+        if cache.get(self.identifier, None) is not None:
+            return cache[self.identifier]
+
+        circuit = QuantumCircuit(
+            self.register_c,
+            self.register_x,
+            self.register_r,
+            self.register_g,
+            self.register_anc,
+            name=f"$MODINV_{{K}}({self.p})$"
+        )
+
+        almost_inverse = self._get_almost_inverse_circuit().to_instruction()
+        qubits = list(self.register_x) + list(self.register_r) + list(self.register_g) + list(self.register_anc)
+        circuit.append(almost_inverse, qubits)
+
+        # Copy -x^(-1) mod p (stored in the lower n bits of r) into the output.
+        register_rr = self.register_anc[2 * self.n:3 * self.n + 1]
+        for i in range(0, self.n):
+            circuit.mcx(list(self.register_c) + [register_rr[i]], self.register_r[i])
+
+        circuit.append(almost_inverse.reverse_ops(), qubits)
+
+        # Negation of 0 is 0, so it does not have to be controlled.
+        qc_mod_negation = CircuitChooser().choose_component(
+            "QCModularNegationIP",
+            (self.n, self.p, 0),
+            dirty_available=self.dqa + self.n,
+            clean_available=self.cqa
+        )
+
+        circuit.append(
+            qc_mod_negation.get_circuit(),
+            list(self.register_r) +
+            list(self.register_g) +
+            list(self.register_x) +
+            list(self.register_anc)
+        )
+
+        cache[self.identifier] = circuit
+
+        return circuit
+
+    def _get_almost_inverse_circuit(self) -> QuantumCircuit:
+        """
+        :return: Circuit which takes |x>|0> to |x>|0> with -x^(-1) mod p in the lower n bits of r (in the ancillae),
+         and the garbage of the rounds in the other ancillae.
+        """
+        n = self.n
+        register_u = self.register_anc[0:n]
+        register_v = self.register_anc[n:2 * n]
+        register_rr = self.register_anc[2 * n:3 * n + 1]
+        register_s = self.register_anc[3 * n + 1:4 * n + 2]
+        # (active, parity of u, parity of v, u > v) for each round.
+        rounds = [self.register_anc[4 * n + 2 + 4 * i:4 * n + 6 + 4 * i] for i in range(0, 2 * n)]
+        flag = self.register_anc[12 * n + 2]
+        reduced = self.register_anc[12 * n + 3]
+        register_anc = self.register_anc[12 * n + 4:]
+
+        circuit = QuantumCircuit(
+            self.register_x,
+            self.register_r,
+            self.register_g,
+            self.register_anc,
+            name=f"$MODINV_{{K}}^{{almost}}({self.p})$"
+        )
+
+        # (u, v, r, s) = (p, x, 0, 1)
+        circuit.append(binary_encoding(n, self.p), register_u)
+        circuit.cx(self.register_x, register_v)
+        circuit.x(register_s[0])
+
+        qq_comparator = CircuitChooser().choose_component(
+            "QQComparator",
+            (n, 0),
+            dirty_available=self.dqa + 2 * n + 4 * (2 * n - 1),
+            clean_available=self.cqa - 12 * n - 4
+        )
+        qq_adder_uv = CircuitChooser().choose_component(
+            "QQAdderIP",
+            (n, 1, False, False),
+            dirty_available=self.dqa + 2 * n + 4 * (2 * n - 1) + 2 * (n + 1),
+            clean_available=self.cqa - 12 * n - 4
+        )
+        qq_adder_rs = CircuitChooser().choose_component(
+            "QQAdderIP",
+            (n + 1, 1, False, False),
+            dirty_available=self.dqa + 2 * n + 4 * (2 * n - 1) + 2 * n,
+            clean_available=self.cqa - 12 * n - 4
+        )
+
+        # The sub-circuits are appended in every round, convert them only once.
+        qq_comparator_gate = qq_comparator.get_circuit().to_instruction()
+        qq_subtractor_uv_gate = qq_adder_uv.get_reversed_circuit().to_instruction()
+        qq_adder_rs_gate = qq_adder_rs.get_circuit().to_instruction()
+
+        for i, (active, parity_u, parity_v, greater) in enumerate(rounds):
+            other_rounds = [qubit for j, bits in enumerate(rounds) if j != i for qubit in bits]
+            borrowable = list(self.register_x) + list(self.register_r) + other_rounds
+
+            # The round is active while v != 0.
+            circuit.x(active)
+            circuit.mcx(register_v, active, ctrl_state=0)
+            circuit.cx(register_u[0], parity_u)
+            circuit.cx(register_v[0], parity_v)
+            # u > v
+            circuit.append(
+                qq_comparator_gate,
+                register_v +
+                register_u +
+                [greater] +
+                list(self.register_g) +
+                borrowable +
+                register_anc
+            )
+
+            # u even: u = u / 2, s = 2s
+            circuit.mcx([active, parity_u], flag, ctrl_state=0b01)
+            self._rotate_right(circuit, flag, register_u)
+            self._rotate_left(circuit, flag, register_s)
+            circuit.mcx([active, parity_u], flag, ctrl_state=0b01)
+
+            # u odd, v even: v = v / 2, r = 2r
+            circuit.mcx([active, parity_u, parity_v], flag, ctrl_state=0b011)
+            self._rotate_right(circuit, flag, register_v)
+            self._rotate_left(circuit, flag, register_rr)
+            circuit.mcx([active, parity_u, parity_v], flag, ctrl_state=0b011)
+
+            # u, v odd, u > v: u = (u - v) / 2, r = r + s, s = 2s
+            circuit.mcx([active, parity_u, parity_v, greater], flag)
+            self._append_subtraction_and_addition(circuit, qq_subtractor_uv_gate, qq_adder_rs_gate, flag,
+                                                  register_v, register_u, register_s, register_rr,
+                                                  borrowable, register_anc)
+            circuit.mcx([active, parity_u, parity_v, greater], flag)
+
+            # u, v odd, u <= v: v = (v - u) / 2, s = s + r, r = 2r
+            circuit.mcx([active, parity_u, parity_v, greater], flag, ctrl_state=0b0111)
+            self._append_subtraction_and_addition(circuit, qq_subtractor_uv_gate, qq_adder_rs_gate, flag,
+                                                  register_u, register_v, register_rr, register_s,
+                                                  borrowable, register_anc)
+            circuit.mcx([active, parity_u, parity_v, greater], flag, ctrl_state=0b0111)
+
+        # r < 2p, reduce it: r = r - p if r >= p.
+        borrowable = (list(self.register_x) + list(self.register_r) + [qubit for bits in rounds for qubit in bits] +
+                      register_u + register_v + register_s)
+        qc_comparator = CircuitChooser().choose_component(
+            "QCComparator",
+            (n + 1, self.p, 0),
+            dirty_available=self.dqa + len(borrowable),
+            clean_available=self.cqa - 12 * n - 4
+        )
+        circuit.append(
+            qc_comparator.get_circuit(),
+            register_rr +
+            [reduced] +
+            list(self.register_g) +
+            borrowable +
+            register_anc
+        )
+        circuit.x(reduced)
+
+        qc_adder = CircuitChooser().choose_component(
+            "QCAdderIP",
+            (n + 1, self.p, 1),
+            dirty_available=self.dqa + len(borrowable),
+            clean_available=self.cqa - 12 * n - 4
+        )
+        circuit.append(
+            qc_adder.get_reversed_circuit(),
+            [reduced] +
+            register_rr +
+            list(self.register_g) +
+            borrowable +
+            register_anc
+        )
+
+        # r = -x^(-1) * 2^k mod p, halve it once per active round.
+        qc_mod_doubler = CircuitChooser().choose_component(
+            "QCModDoublerIP",
+            (n, self.p, 1),
+            dirty_available=self.dqa + len(borrowable),
+            clean_available=self.cqa - 12 * n - 4
+        )
+        qc_mod_halver_gate = qc_mod_doubler.get_reversed_circuit().to_instruction()
+        for active, parity_u, parity_v, greater in rounds:
+            circuit.cx(active, flag)
+            circuit.append(
+                qc_mod_halver_gate,
+                [flag] +
+                register_rr[:n] +
+                list(self.register_g) +
+                borrowable +
+                register_anc
+            )
+            circuit.cx(active, flag)
+
+        return circuit
+
+    @staticmethod
+    def _rotate_right(circuit: QuantumCircuit, control, register: list):
+        """
+        Controlled cyclic shift towards the least significant bit, this is x / 2 for an even x.
+        """
+        for i in range(0, len(register) - 1):
+            circuit.cswap(control, register[i], register[i + 1])
+
+    @staticmethod
+    def _rotate_left(circuit: QuantumCircuit, control, register: list):
+        """
+        Controlled cyclic shift towards the most significant bit, this is 2x if the most significant bit is 0.
+        """
+        for i in range(len(register) - 2, -1, -1):
+            circuit.cswap(control, register[i], register[i + 1])
+
+    def _append_subtraction_and_addition(self, circuit: QuantumCircuit, qq_subtractor_ab, qq_adder_cd, control,
+                                         register_a: list, register_b: list, register_c: list, register_d: list,
+                                         borrowable: list, register_anc: list):
+        """
+        Controlled b = (b - a) / 2, d = d + c, c = 2c.
+        """
+        unused = register_c + register_d
+        circuit.append(
+            qq_subtractor_ab,
+            [control] +
+            register_a +
+            register_b +
+            list(self.register_g) +
+            borrowable +
+            unused +
+            register_anc
+        )
+        self._rotate_right(circuit, control, register_b)
+
+        unused = register_a + register_b
+        circuit.append(
+            qq_adder_cd,
+            [control] +
+            register_c +
+            register_d +
+            list(self.register_g) +
+            borrowable +
+            unused +
+            register_anc
+        )
+        self._rotate_left(circuit, control, register_c)
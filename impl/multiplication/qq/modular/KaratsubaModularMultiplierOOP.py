@@ -0,0 +1,202 @@
+from qiskit import QuantumCircuit
+
+from api.CircuitChooser import CircuitChooser
+from api.CircuitNotSupportedError import CircuitNotSupportedError
+from api.multiplication.modular.QuantumQuantumModularMultiplierOOP import QuantumQuantumModularMultiplierOOP
+from impl.encoding.table_lookup import table_lookup, table_lookup_ancillas, window_size
+
+
+def karatsuba_garbage(n: int, cutoff: int) -> int:
+    """
+    :return: Number of clean qubits left as garbage by the Karatsuba product of two n-bit registers.
+    """
+    if n <= cutoff:
+        return 0
+    h = (n + 1) // 2
+    # Both partial products, both sums and the product of the sums.
+    return (2 * n + 4 * h + 4 +
+            karatsuba_garbage(h, cutoff) + karatsuba_garbage(n - h, cutoff) + karatsuba_garbage(h + 1, cutoff))
+
+
+class KaratsubaModularMultiplierOOP(QuantumQuantumModularMultiplierOOP):
+    """
+    Karatsuba multiplication circuit, as compiled by Parent, Roetteler and Svore (https://arxiv.org/pdf/1510.00377,
+    Section 5.), followed by a windowed reduction mod p.
+
+    The 2n-bit product x * y = A + (C - A - B) * 2^h + B * 2^(2h) is computed recursively from the three products
+    A = x_0 * y_0, B = x_1 * y_1 and C = (x_0 + x_1) * (y_0 + y_1) of the halves, which needs O(n^1.58) gates.
+    Products of at most cutoff bits are computed by schoolbook multiplication instead.
+    The intermediate results are kept as garbage, so the clean qubits grow as O(n^1.58) as well (see
+    karatsuba_garbage). The product is reduced into the output by windowed modular additions of
+    k * 2^(jw) mod p for each window value k (as in WindowedConstantModularMultiplierOOP, controlled by c bits),
+    then the product is uncomputed.
+
+    The chooser constructs it with default_cutoff, which can be changed before choosing.
+
+    Takes |x>|y>|0> to |x>|y>|x * y mod p> for x, y < p.
+    """
+    default_cutoff: int = 8
+
+    def __init__(self, dqa: int, cqa: int, n: int, p: int, c: int, cutoff: int = None):
+        self.cutoff = self.default_cutoff if cutoff is None else cutoff
+        # The sums of the halves of 3 bits have 3 bits again.
+        if self.cutoff < 3:
+            raise ValueError("The recursion cutoff must be at least 3.")
+        # Product, padding zeros, garbage and the looked up entry, the others are used by the lookup and the adders.
+        self.num_zeros = n // 2 + 1
+        self.num_garbage = karatsuba_garbage(n, self.cutoff)
+        self.num_reserved = 2 * n + self.num_zeros + self.num_garbage + n
+        self.w = window_size(n, cqa - self.num_reserved, c)
+        if self.w == 0 or cqa - self.num_reserved < 1:
+            raise CircuitNotSupportedError("Not enough clean ancillae for the product and its garbage.")
+        super().__init__(dqa, cqa, n, p, c)
+
+    def get_global_identifier(self):
+        # The circuit (and hence its metrics) depends on the recursion cutoff.
+        return self.identifier, self.cutoff
+
+    def get_circuit(self, *args) -> QuantumCircuit:
+        cache = CircuitChooser().cache
+
+        param_identifier = self.get_global_identifier()
+        if cache.get(param_identifier, None) is not None:
+            return cache[param_identifier]
+
+        circuit = QuantumCircuit(
+            self.register_c,
+            self.register_x,
+            self.register_y,
+            self.register_r,
+            self.register_g,
+            self.register_anc,
+            name=f"|x*y mod {self.p}>_K"
+        )
+
+        n = self.n
+        product = self._get_product_circuit().to_instruction()
+        qubits = (list(self.register_x) + list(self.register_y) + list(self.register_r) + list(self.register_g) +
+                  list(self.register_anc))
+        circuit.append(product, qubits)
+
+        register_z = list(self.register_anc[0:2 * n])
+        register_t = list(self.register_anc[self.num_reserved - n:self.num_reserved])
+        register_work = list(self.register_anc[self.num_reserved:])
+
+        # The lookup is done before the addition, so the adder can use its ancillae.
+        qq_mod_adder = CircuitChooser().choose_component(
+            "QQModAdderIP",
+            (n, self.p, 0),
+            dirty_available=self.dqa + 2 * n,
+            clean_available=len(register_work)
+        )
+        qq_mod_adder_gate = qq_mod_adder.get_circuit().to_instruction()
+
+        for j in range(0, 2 * n, self.w):
+            window = register_z[j:j + self.w]
+            table = [(k << j) % self.p for k in range(0, 2 ** len(window))]
+            lookup = table_lookup(len(window), n, table, self.c)
+            lookup_qubits = (list(self.register_c) +
+                             window +
+                             register_t +
+                             register_work[:table_lookup_ancillas(len(window), self.c)])
+
+            circuit.append(lookup, lookup_qubits)
+            circuit.append(
+                qq_mod_adder_gate,
+                register_t +
+                list(self.register_r) +
+                list(self.register_g) +
+                list(self.register_x) +
+                list(self.register_y) +
+                register_work
+            )
+            circuit.append(lookup, lookup_qubits)
+
+        circuit.append(product.reverse_ops(), qubits)
+
+        cache[param_identifier] = circuit
+
+        return circuit
+
+    def _get_product_circuit(self) -> QuantumCircuit:
+        """
+        :return: Circuit which takes |x>|y>|0> to |x>|y>|0> with x * y in the first 2n ancillae,
+         and the intermediate results of the recursion in the garbage ancillae.
+        """
+        n = self.n
+        register_z = list(self.register_anc[0:2 * n])
+        zeros = list(self.register_anc[2 * n:2 * n + self.num_zeros])
+        garbage = list(self.register_anc[2 * n + self.num_zeros:self.num_reserved - n])
+        # The looked up entry is not used yet.
+        register_work = list(self.register_anc[self.num_reserved - n:])
+
+        circuit = QuantumCircuit(
+            self.register_x,
+            self.register_y,
+            self.register_r,
+            self.register_g,
+            self.register_anc,
+            name=f"$KARATSUBA_{{{self.cutoff}}}({n})$"
+        )
+
+        adder_gates = {}
+
+        def append_adder(k: int, c: int, overflow: bool, qubits: list, reverse: bool = False):
+            # The output is still 0, but it can be borrowed.
+            if (k, c, overflow, reverse) not in adder_gates:
+                qq_adder = CircuitChooser().choose_component(
+                    "QQAdderIP",
+                    (k, c, False, overflow),
+                    dirty_available=self.dqa + n,
+                    clean_available=len(register_work)
+                )
+                adder_gates[(k, c, overflow, reverse)] = (qq_adder.get_reversed_circuit() if reverse
+                                                          else qq_adder.get_circuit()).to_instruction()
+            circuit.append(
+                adder_gates[(k, c, overflow, reverse)],
+                qubits +
+                list(self.register_g) +
+                list(self.register_r) +
+                register_work
+            )
+
+        def append_product(x: list, y: list, z: list):
+            """
+            z = x * y for k-bit x and y and a clean 2k-bit z, takes the garbage qubits it needs.
+            """
+            k = len(x)
+            if k <= self.cutoff:
+                # Schoolbook multiplication, the first row is copied.
+                for i in range(0, k):
+                    circuit.ccx(x[0], y[i], z[i])
+                for i in range(1, k):
+                    # The partial product is below 2^(i + k), so the overflow qubit z[i + k] is still 0.
+                    append_adder(k, 1, True, [x[i]] + y + z[i:i + k] + [z[i + k]])
+                return
+
+            h = (k + 1) // 2
+            product_a = [garbage.pop() for _ in range(0, 2 * h)]
+            product_b = [garbage.pop() for _ in range(0, 2 * (k - h))]
+            sum_x = [garbage.pop() for _ in range(0, h + 1)]
+            sum_y = [garbage.pop() for _ in range(0, h + 1)]
+            product_c = [garbage.pop() for _ in range(0, 2 * (h + 1))]
+
+            append_product(x[:h], y[:h], product_a)
+            append_product(x[h:], y[h:], product_b)
+            # The upper halves are padded to h bits.
+            for summand, register_sum in [(x, sum_x), (y, sum_y)]:
+                circuit.cx(summand[:h], register_sum[:h])
+                append_adder(h, 0, True, summand[h:] + zeros[:2 * h - k] + register_sum[:h] + [register_sum[h]])
+            append_product(sum_x, sum_y, product_c)
+
+            # z = A + B * 2^(2h) + (C - A - B) * 2^h, the middle term is added mod 2^(2k - h).
+            circuit.cx(product_a, z[:2 * h])
+            circuit.cx(product_b, z[2 * h:])
+            m = 2 * k - h
+            for summand, reverse in [(product_c, False), (product_a, True), (product_b, True)]:
+                summand = summand[:m] + zeros[:max(m - len(summand), 0)]
+                append_adder(m, 0, False, summand + z[h:], reverse)
+
+        append_product(list(self.register_x), list(self.register_y), register_z)
+
+        return circuit
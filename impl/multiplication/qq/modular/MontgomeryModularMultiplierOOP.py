@@ -0,0 +1,199 @@
+from qiskit import QuantumCircuit
+
+from api.CircuitChooser import CircuitChooser
+from api.CircuitNotSupportedError import CircuitNotSupportedError
+from api.multiplication.modular.QuantumQuantumModularMultiplierOOP import QuantumQuantumModularMultiplierOOP
+from impl.encoding.binary_encoding import binary_encoding
+
+
+def to_montgomery_form(value: int, n: int, p: int) -> int:
+    """
+    :return: value * 2^n mod p, the Montgomery form of value.
+    """
+    return (value << n) % p
+
+
+def from_montgomery_form(value: int, n: int, p: int) -> int:
+    """
+    :return: value * 2^(-n) mod p, the value of the Montgomery form.
+    """
+    return (value * pow(2, -n, p)) % p
+
+
+class MontgomeryModularMultiplierOOP(QuantumQuantumModularMultiplierOOP):
+    """
+    Montgomery multiplication circuit based on Rines and Chuang (https://arxiv.org/pdf/1801.01081, Section 4.).
+
+    Computes the Montgomery product x * y * 2^(-n) mod p into the ancillae and multiplies it by 2^n mod p (with a
+    QCModMulOOP controlled by c bits) into the output, so that it is a drop-in QQModMulOOP.
+    (x * y * 2^(-n) mod p is also the product in Montgomery form if x and y are in Montgomery form,
+    see to_montgomery_form.)
+    For each bit x_i, y is added to an accumulator (controlled by x_i) and if the accumulator is odd, (p + 1) / 2 is
+    added to its upper bits, which halves it mod p without a comparison. Constants are loaded into a clean register
+    and added with a quantum-quantum adder. The parity bit is left behind, so the
+    accumulator moves up by one qubit per bit of x. Only the final reduction needs a comparator.
+    After the multiplication by 2^n mod p the accumulator is uncomputed.
+    Needs 3n + 3 clean qubits for the accumulator and the constants, but no modular adders or doublers in the loop.
+
+    Takes |x>|y>|0> to |x>|y>|x * y mod p> for x, y < p, p must be odd.
+    """
+
+    def __init__(self, dqa: int, cqa: int, n: int, p: int, c: int):
+        if p % 2 == 0:
+            raise CircuitNotSupportedError("Circuit is only valid for an odd modulus.")
+        if cqa < 3 * n + 3:
+            raise CircuitNotSupportedError("Not enough clean ancillae for the accumulator.")
+        super().__init__(dqa, cqa, n, p, c)
+
+    def get_circuit(self, *args) -> QuantumCircuit:
+        cache = CircuitChooser().cache
+
+        if cache.get(self.identifier, None) is not None:
+            return cache[self.identifier]
+
+        circuit = QuantumCircuit(
+            self.register_c,
+            self.register_x,
+            self.register_y,
+            self.register_r,
+            self.register_g,
+            self.register_anc,
+            name=f"|x*y mod {self.p}>_{{MONT}}"
+        )
+
+        montgomery_product = self._get_montgomery_product_circuit().to_instruction()
+        qubits = (list(self.register_x) + list(self.register_y) + list(self.register_r) + list(self.register_g) +
+                  list(self.register_anc))
+        circuit.append(montgomery_product, qubits)
+
+        # Multiply the reduced product (stored in the upper n + 1 bits of the accumulator, the top bit is 0)
+        # by 2^n mod p into the output. The constant register is clean again, the other ancillae can be borrowed.
+        n = self.n
+        register_product = self.register_anc[n:2 * n]
+        borrowable = (list(self.register_x) + list(self.register_y) + self.register_anc[0:n] +
+                      self.register_anc[2 * n:2 * n + 1] + self.register_anc[3 * n + 2:3 * n + 3])
+        clean = self.register_anc[2 * n + 1:3 * n + 2] + self.register_anc[3 * n + 3:]
+        qc_mod_multiplier = CircuitChooser().choose_component(
+            "QCModMulOOP",
+            (n, (1 << n) % self.p, self.p, self.c),
+            dirty_available=self.dqa + len(borrowable),
+            clean_available=len(clean)
+        )
+        circuit.append(
+            qc_mod_multiplier.get_circuit(),
+            list(self.register_c) +
+            register_product +
+            list(self.register_r) +
+            list(self.register_g) +
+            borrowable +
+            clean
+        )
+
+        circuit.append(montgomery_product.reverse_ops(), qubits)
+
+        cache[self.identifier] = circuit
+
+        return circuit
+
+    def _get_montgomery_product_circuit(self) -> QuantumCircuit:
+        """
+        :return: Circuit which takes |x>|y>|0> to |x>|y>|0> with x * y * 2^(-n) mod p in the upper n + 1 bits of
+         the accumulator (in the ancillae), and the parity bits and the reduction flag in the other ancillae.
+        """
+        n = self.n
+        register_acc = self.register_anc[0:2 * n + 1]
+        # The constants are loaded into this register, so that they can be added with quantum-quantum adders
+        # instead of controlled constant adders. Its top qubit is always 0 and pads y to n + 1 bits.
+        register_constant = self.register_anc[2 * n + 1:3 * n + 2]
+        zero = register_constant[n]
+        reduced = self.register_anc[3 * n + 2]
+        register_anc = self.register_anc[3 * n + 3:]
+
+        circuit = QuantumCircuit(
+            self.register_x,
+            self.register_y,
+            self.register_r,
+            self.register_g,
+            self.register_anc,
+            name=f"$MONT({self.p})$"
+        )
+
+        # The accumulator stays below 2p, adding y needs an overflow qubit.
+        qq_adder_y = CircuitChooser().choose_component(
+            "QQAdderIP",
+            (n + 1, 1, False, True),
+            dirty_available=self.dqa + 2 * n - 1,
+            clean_available=self.cqa - 3 * n - 3
+        )
+        qq_adder_constant = CircuitChooser().choose_component(
+            "QQAdderIP",
+            (n + 1, 0, False, False),
+            dirty_available=self.dqa + 3 * n,
+            clean_available=self.cqa - 3 * n - 3
+        )
+
+        # The sub-circuits are appended for every bit of x, convert them only once.
+        qq_adder_y_gate = qq_adder_y.get_circuit().to_instruction()
+        qq_adder_constant_gate = qq_adder_constant.get_circuit().to_instruction()
+        half_p_encoding = binary_encoding(n + 1, (self.p + 1) // 2, c=1).to_instruction()
+
+        for i in range(0, n):
+            borrowable = [qubit for qubit in self.register_x if qubit != self.register_x[i]] + list(self.register_r)
+            # acc = acc + x_i * y
+            circuit.append(
+                qq_adder_y_gate,
+                [self.register_x[i]] +
+                list(self.register_y) + [zero] +
+                register_acc[i:i + n + 1] +
+                [register_acc[i + n + 1]] +
+                list(self.register_g) +
+                borrowable +
+                register_anc
+            )
+            # acc = acc / 2 mod p, which is acc / 2 + (p + 1) / 2 (in the upper bits) if acc is odd.
+            circuit.append(half_p_encoding, [register_acc[i]] + register_constant)
+            circuit.append(
+                qq_adder_constant_gate,
+                register_constant +
+                register_acc[i + 1:i + n + 2] +
+                list(self.register_g) +
+                list(self.register_x) +
+                list(self.register_y) +
+                list(self.register_r) +
+                register_anc
+            )
+            circuit.append(half_p_encoding, [register_acc[i]] + register_constant)
+
+        # acc < 2p, reduce it: acc = acc - p if acc >= p.
+        borrowable = list(self.register_x) + list(self.register_y) + list(self.register_r) + register_acc[:n]
+        qc_comparator = CircuitChooser().choose_component(
+            "QCComparator",
+            (n + 1, self.p, 0),
+            dirty_available=self.dqa + len(borrowable),
+            clean_available=self.cqa - 3 * n - 3
+        )
+        circuit.append(
+            qc_comparator.get_circuit(),
+            register_acc[n:] +
+            [reduced] +
+            list(self.register_g) +
+            borrowable +
+            register_anc
+        )
+        circuit.x(reduced)
+
+        p_encoding = binary_encoding(n + 1, self.p, c=1)
+        circuit.append(p_encoding, [reduced] + register_constant)
+        circuit.append(
+            qq_adder_constant_gate.reverse_ops(),
+            register_constant +
+            register_acc[n:] +
+            list(self.register_g) +
+            list(self.register_x) +
+            list(self.register_y) +
+            list(self.register_r) +
+            register_anc
+        )
+        circuit.append(p_encoding, [reduced] + register_constant)
+
+        return circuit
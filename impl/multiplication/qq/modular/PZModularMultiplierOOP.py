@@ -20,6 +20,7 @@ class PZModularMultiplierOOP(QuantumQuantumModularMultiplierOOP):
             return cache[self.identifier]
 
         circuit = QuantumCircuit(
+            self.register_c,
             self.register_x,
             self.register_y,
             self.register_r,
@@ -28,12 +29,12 @@ class PZModularMultiplierOOP(QuantumQuantumModularMultiplierOOP):
             name=f"|x*y mod {self.p}>"
         )
 
-        # Addition of two quantum states mod p. with 1 control
+        # Addition of two quantum states mod p. with 1 control (and the controls of the multiplier)
         # Will be repeated n times in the exact same conditions.
         # Always has (n-1) qubits in register_x to borrow.
         qq_mod_add = CircuitChooser().choose_component(
             "QQModAdderIP",
-            (self.n, self.p, 1),
+            (self.n, self.p, self.c + 1),
             dirty_available=self.dqa + self.n - 1,
             clean_available=self.cqa
         )
@@ -43,6 +44,7 @@ class PZModularMultiplierOOP(QuantumQuantumModularMultiplierOOP):
 
         circuit.append(
             qq_mod_add.get_circuit(),
+            list(self.register_c) +
             [self.register_x[self.n - 1]] +
             list(self.register_y) +
             list(self.register_r) +
@@ -54,15 +56,16 @@ class PZModularMultiplierOOP(QuantumQuantumModularMultiplierOOP):
         for i in reversed(range(0, self.n - 1)):
             # IP Modular Multiplication *2 (Modular doubling)
             # Will be repeated n - 1 times in the exact same conditions.
-            # With 2*n borrable qubits (register_x and register_y)
+            # With 2*n borrable qubits (register_x and register_y) and the controls.
+            # Uncontrolled, as the result register stays 0 if the additions are turned off.
             qc_mod_dbl = CircuitChooser().choose_component(
                 "QCModDoublerIP",
-                (self.n, self.p, self.c),
-                dirty_available=self.dqa + self.n + self.n,
+                (self.n, self.p, 0),
+                dirty_available=self.dqa + self.c + self.n + self.n,
                 clean_available=self.cqa
             )
 
-            borrowable = list(self.register_x) + list(self.register_y)
+            borrowable = list(self.register_c) + list(self.register_x) + list(self.register_y)
 
             circuit.append(
                 qc_mod_dbl.get_circuit(),
@@ -77,6 +80,7 @@ class PZModularMultiplierOOP(QuantumQuantumModularMultiplierOOP):
 
             circuit.append(
                 qq_mod_add.get_circuit(),
+                list(self.register_c) +
                 [self.register_x[i]] +
                 list(self.register_y) +
                 list(self.register_r) +
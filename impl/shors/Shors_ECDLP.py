@@ -1,30 +1,78 @@
 import math
 
 from qiskit import QuantumCircuit, QuantumRegister, ClassicalRegister
-from qiskit_aer import AerSimulator
 
 from api.CircuitChooser import CircuitChooser
+from impl.encoding.table_lookup import table_lookup_ancillas
 from impl.util.semiclassical_qft import apply_semiclassical_qft_phase_component
 
 
-def shors_ecdlp(points: [], p: int, with_modular_inversion=True, extra_qubits = 0) -> QuantumCircuit:
+def shors_ecdlp(points: [], p: int, with_modular_inversion=True, extra_qubits = 0, window_size: int = 1,
+                reserve_inversion_ancillas: bool = False, max_qubits: int = None) -> QuantumCircuit:
     # g^k = b mod p, find k
     n = math.ceil(math.log2(p))
+    # The point addition keeps t and lambda in the ancillas, window_size > 1 adds window_size points at once with a
+    # windowed point addition (loaded point and flag: 2n + 1).
+    point_ancillas = 2 * n if window_size == 1 else 4 * n + 1
+    num_ancillas = 2 * n + 2 if window_size == 1 else 4 * n + 1 + max(table_lookup_ancillas(window_size), 2)
+    # Kaliski's modular inversion needs 12n + 5 clean ancillas next to those of the point addition,
+    # without them Fermat's inversion is used.
+    if with_modular_inversion and reserve_inversion_ancillas:
+        num_ancillas = max(num_ancillas, point_ancillas + 12 * n + 5)
+    num_required = window_size + 2*n + num_ancillas
     # deal with extra qubits clause
-    # Check if number of extra qubits is higher than our limit of simulatable qubits
-    num_required =  1 + 2*n + 2*n + 2
-    if num_required + extra_qubits > AerSimulator().num_qubits:
-        extra_qubits = max(AerSimulator().num_qubits - num_required, 0)
-    if num_required + extra_qubits > AerSimulator().num_qubits:
+    # Check if number of extra qubits is higher than our limit of qubits (e.g. AerSimulator().num_qubits)
+    if max_qubits is not None and num_required + extra_qubits > max_qubits:
+        extra_qubits = max(max_qubits - num_required, 0)
+    if max_qubits is not None and num_required + extra_qubits > max_qubits:
         raise ValueError('Too many qubits for problem instance required.')
     # construct the circuit.
-    register_x = QuantumRegister(1, "x")
+    register_x = QuantumRegister(window_size, "x")
     register_psi = QuantumRegister(2 * n, "\\psi")
-    register_ancilla = QuantumRegister(2 * n + 2 + extra_qubits, "anc")
+    register_ancilla = QuantumRegister(num_ancillas + extra_qubits, "anc")
     classical_register_qft = ClassicalRegister(2 * n + 2, "cl_qft")
 
     circuit = QuantumCircuit(register_x, register_psi, register_ancilla, classical_register_qft)
 
+    if window_size > 1:
+        for k in range(0, 2 * n + 2, window_size):
+            window = list(register_x[:min(window_size, 2 * n + 2 - k)])
+            # Apply entering Hadamards
+            circuit.h(window)
+            ec_point_addition = CircuitChooser().choose_component(
+                "QCWindowedECPointAdderIP",
+                (n, tuple(points[k:k + len(window)]), p, len(window), with_modular_inversion),
+                dirty_available=0,
+                clean_available=len(register_ancilla)
+            )
+
+            circuit.append(
+                ec_point_addition.get_circuit(),
+                window +
+                list(register_psi) +
+                list(register_ancilla)
+            )
+
+            for j in range(0, len(window)):
+                apply_semiclassical_qft_phase_component(
+                    circuit,
+                    [window[j]],
+                    classical_register_qft,
+                    2 * n + 2,
+                    k + j
+                )
+                # Apply exiting hadamard
+                circuit.h(window[j])
+
+                # measure it in corresponding classical reg
+                circuit.measure(window[j], classical_register_qft[k + j])
+
+                if k + j < 2 * n + 1:  # Skip last reset
+                    with circuit.if_test((classical_register_qft[k + j], 1)):
+                        circuit.x(window[j])
+
+        return circuit
+
     for k in range(0, 2 * n + 2):
         # Apply entering Hadamard
         circuit.h(register_x[0])
@@ -0,0 +1,289 @@
+from typing import Callable, Iterable
+
+import numpy as np
+from qiskit import QuantumCircuit
+from qiskit.circuit import ControlledGate, ControlFlowOp
+from qiskit.circuit.library import get_standard_gate_name_mapping
+
+# Standard gates (e.g. H, T) have definitions too, which must not be expanded.
+_standard_gate_names = set(get_standard_gate_name_mapping().keys())
+# Instructions without any effect on the basis state.
+_ignored_names = {'id', 'barrier', 'delay'}
+# Compute and uncompute of the temporary logical-AND (see logical_and.py).
+_logical_and_names = {'logical_and', 'logical_and_dg'}
+
+
+# A compiled classical circuit is a list of operations (kind, a, b, control_mask, control_value), with the kinds:
+#   'x': flips qubit a, 'swap': swaps qubits a and b,
+#   'measure': copies qubit a to clbit b, 'reset': sets qubit a to 0.
+# The operation is only applied if (state & control_mask) == control_value.
+
+
+def compile_classical(circuit: QuantumCircuit) -> list[tuple]:
+    """
+    Flattens a reversible classical circuit (X, CX, CCX, MCX, SWAP gates, possibly nested and controlled)
+    into a list of bit operations, see simulate_classical.
+    Controlled sub-circuits are compiled from their base circuit, so e.g. circuit.control(c) is supported even
+    though its definition contains non-classical gates.
+    :param circuit: The circuit.
+    :return: The compiled operations.
+    """
+    operations = []
+    _compile(circuit, list(range(circuit.num_qubits)), list(range(circuit.num_clbits)), 0, 0, operations, {})
+    return operations
+
+
+def _compile(circuit: QuantumCircuit, qubit_map: list[int], clbit_map: list[int], control_mask: int,
+             control_value: int, operations: list, memo: dict):
+    qubit_indices = {qubit: qubit_map[i] for i, qubit in enumerate(circuit.qubits)}
+    clbit_indices = {clbit: clbit_map[i] for i, clbit in enumerate(circuit.clbits)}
+    for instruction in circuit.data:
+        _compile_operation(
+            instruction.operation,
+            [qubit_indices[qubit] for qubit in instruction.qubits],
+            [clbit_indices[clbit] for clbit in instruction.clbits],
+            control_mask,
+            control_value,
+            operations,
+            memo
+        )
+
+
+def _compile_operation(operation, qubits: list[int], clbits: list[int], control_mask: int, control_value: int,
+                       operations: list, memo: dict):
+    name = operation.name
+    if isinstance(operation, ControlFlowOp) or getattr(operation, '_condition', None) is not None:
+        raise ValueError(f"Classically conditioned operation '{name}' cannot be simulated classically.")
+
+    if name in _ignored_names:
+        return
+    if name == 'measure':
+        if control_mask != 0:
+            raise ValueError("Controlled measurements cannot be simulated classically.")
+        operations.append(('measure', qubits[0], clbits[0], 0, 0))
+    elif name == 'reset':
+        if control_mask != 0:
+            raise ValueError("Controlled resets cannot be simulated classically.")
+        operations.append(('reset', qubits[0], None, 0, 0))
+    elif name == 'x':
+        operations.append(('x', qubits[0], None, control_mask, control_value))
+    elif name == 'swap':
+        operations.append(('swap', qubits[0], qubits[1], control_mask, control_value))
+    elif name in _logical_and_names:
+        # The temporary logical-AND acts as a Toffoli gate on the inputs it is defined for (see logical_and.py).
+        and_mask = (1 << qubits[0]) | (1 << qubits[1])
+        operations.append(('x', qubits[2], None, control_mask | and_mask, control_value | and_mask))
+    elif isinstance(operation, ControlledGate):
+        # Controls first, then the qubits of the base gate (MCX variants may append ancillas, which are unchanged).
+        num_ctrl_qubits = operation.num_ctrl_qubits
+        for i, qubit in enumerate(qubits[:num_ctrl_qubits]):
+            control_mask |= 1 << qubit
+            if (operation.ctrl_state >> i) & 1:
+                control_value |= 1 << qubit
+        base_gate = operation.base_gate
+        base_operations = []
+        _compile_operation(base_gate, qubits[num_ctrl_qubits:num_ctrl_qubits + base_gate.num_qubits], [],
+                           control_mask, control_value, base_operations, memo)
+        # reverse_ops() only reverses the definition of a controlled gate and not its base gate,
+        # the compiled operations are self-inverse so reversing their order is enough.
+        if len(base_operations) > 1 and base_operations != base_operations[::-1] and _is_reversed(operation, memo):
+            base_operations.reverse()
+        operations.extend(base_operations)
+    elif name not in _standard_gate_names and getattr(operation, 'definition', None) is not None:
+        _compile(operation.definition, qubits, clbits, control_mask, control_value, operations, memo)
+    else:
+        raise ValueError(f"Gate '{name}' does not map basis states to basis states and cannot be simulated "
+                         f"classically.")
+
+
+def _instruction_keys(circuit: QuantumCircuit) -> list[tuple]:
+    qubit_indices = {qubit: i for i, qubit in enumerate(circuit.qubits)}
+    # Names are not compared, as reverse_ops() renames the reversed blocks.
+    return [(type(instruction.operation).__name__, tuple(qubit_indices[qubit] for qubit in instruction.qubits),
+             repr(instruction.operation.params)) for instruction in circuit.data]
+
+
+def _is_reversed(operation: ControlledGate, memo: dict) -> bool:
+    """
+    Whether the definition of a controlled gate applies its base gate in reverse, i.e. whether it was reversed
+    by reverse_ops() (which does not reverse the base gate).
+    The definition is compared against the definition of the base gate controlled afresh.
+    :param memo: Reference definitions by id of the base gate.
+    """
+    base_gate = operation.base_gate
+    key = (id(base_gate), operation.num_ctrl_qubits)
+    if key not in memo:
+        reference = base_gate.control(operation.num_ctrl_qubits).definition
+        # Keep the base gate alive, as its id could otherwise be reused.
+        memo[key] = (base_gate, _instruction_keys(reference))
+    reference_keys = memo[key][1]
+    # Open controls wrap the definition into X gates, compare the definition with closed controls.
+    closed = operation.to_mutable()
+    closed.ctrl_state = (1 << operation.num_ctrl_qubits) - 1
+    keys = _instruction_keys(closed.definition)
+    if keys == reference_keys:
+        return False
+    if keys == reference_keys[::-1]:
+        return True
+    raise ValueError(f"Cannot relate the definition of the controlled gate '{operation.name}' to its base gate.")
+
+
+def simulate_classical(circuit: QuantumCircuit | list[tuple], qubit_state: int = 0) -> (int, int):
+    """
+    Simulates a reversible classical circuit on a basis state, by propagating a bit-vector through its gates.
+    Phases are not tracked, only which basis state the circuit maps the input to.
+    Raises a ValueError if the circuit contains gates which do not map basis states to basis states (e.g. H).
+    :param circuit: The circuit or its compiled operations (see compile_classical), compile once to simulate often.
+    :param qubit_state: Input basis state, bit i is the value of qubit i.
+    :return: Output basis state and the classical bits (bit i is clbit i).
+    """
+    operations = compile_classical(circuit) if isinstance(circuit, QuantumCircuit) else circuit
+    state = qubit_state
+    clbit_state = 0
+    for kind, a, b, control_mask, control_value in operations:
+        if state & control_mask != control_value:
+            continue
+        if kind == 'x':
+            state ^= 1 << a
+        elif kind == 'swap':
+            if ((state >> a) ^ (state >> b)) & 1:
+                state ^= (1 << a) | (1 << b)
+        elif kind == 'measure':
+            clbit_state = (clbit_state & ~(1 << b)) | (((state >> a) & 1) << b)
+        else:
+            state &= ~(1 << a)
+    return state, clbit_state
+
+
+def _bit_indices(mask: int) -> list[int]:
+    indices = []
+    while mask:
+        lowest = mask & -mask
+        indices.append(lowest.bit_length() - 1)
+        mask ^= lowest
+    return indices
+
+
+def simulate_classical_batch(circuit: QuantumCircuit | list[tuple], planes: np.ndarray) -> np.ndarray:
+    """
+    Simulates a reversible classical circuit on a batch of basis states at once.
+    The batch is stored as bit-planes: planes[q] packs the value of qubit q for 64 inputs per uint64 word,
+    so every gate is applied to all inputs with a few bitwise operations (see pack_registers).
+    Measurements are not supported, as the classical bits are not tracked.
+    :param circuit: The circuit or its compiled operations (see compile_classical).
+    :param planes: Array of shape (number of qubits, number of words) and dtype uint64, it is not modified.
+    :return: The bit-planes of the output states.
+    """
+    operations = compile_classical(circuit) if isinstance(circuit, QuantumCircuit) else circuit
+    planes = planes.copy()
+    ones = np.full(planes.shape[1], np.iinfo(np.uint64).max, dtype=np.uint64)
+    for kind, a, b, control_mask, control_value in operations:
+        if kind == 'measure':
+            raise ValueError("Measurements cannot be simulated in a batch.")
+        if kind == 'reset':
+            planes[a] = 0
+            continue
+        condition = ones
+        for qubit in _bit_indices(control_mask):
+            if (control_value >> qubit) & 1:
+                condition = condition & planes[qubit]
+            else:
+                condition = condition & ~planes[qubit]
+        if kind == 'x':
+            planes[a] ^= condition
+        else:
+            difference = (planes[a] ^ planes[b]) & condition
+            planes[a] ^= difference
+            planes[b] ^= difference
+    return planes
+
+
+def pack_registers(num_qubits: int, registers: list[list[int]], values: list[np.ndarray]) -> np.ndarray:
+    """
+    Packs a batch of register values into bit-planes, qubits which are in no register are 0.
+    :param num_qubits: Number of qubits of the circuit.
+    :param registers: Qubit indices of each register (least significant qubit first).
+    :param values: Values of each register, one array per register with one entry per input.
+    :return: The bit-planes, see simulate_classical_batch.
+    """
+    batch_size = len(values[0]) if len(values) > 0 else 1
+    words = (batch_size + 63) // 64
+    planes = np.zeros((num_qubits, words), dtype=np.uint64)
+    for register, register_values in zip(registers, values):
+        register_values = np.asarray(register_values, dtype=np.uint64)
+        for i, qubit in enumerate(register):
+            bits = ((register_values >> np.uint64(i)) & np.uint64(1)).astype(np.uint8)
+            packed = np.packbits(bits, bitorder='little')
+            planes[qubit] = np.pad(packed, (0, 8 * words - len(packed))).view(np.uint64)
+    return planes
+
+
+def unpack_register(planes: np.ndarray, register: list[int], batch_size: int) -> np.ndarray:
+    """
+    :return: Values of the register for each input of the batch.
+    """
+    values = np.zeros(batch_size, dtype=np.uint64)
+    for i, qubit in enumerate(register):
+        bits = np.unpackbits(planes[qubit].view(np.uint8), bitorder='little')[:batch_size]
+        values |= bits.astype(np.uint64) << np.uint64(i)
+    return values
+
+
+def verify_exhaustively(circuit: QuantumCircuit,
+                        registers: list[list[int]],
+                        reference: Callable[..., tuple],
+                        domains: list[Iterable[int]] = None,
+                        dirty: list[int] = (),
+                        seed: int = None) -> int:
+    """
+    Checks a reversible classical circuit on every combination of register values in one batched simulation.
+
+    The reference is applied to NumPy arrays of the input values and returns the expected values of all registers,
+    e.g. lambda x, y: (x, (x + y) % p) for an in-place adder.
+    The arrays have dtype int64 if all registers have fewer than 32 qubits, so that the product of two values does
+    not wrap around, otherwise the values are passed as Python ints (dtype object).
+    References with larger intermediate values (e.g. x * y * z) have to convert the values with astype(object).
+    Dirty qubits start in random states and have to be restored, all other qubits are clean and have to be 0 again.
+    Raises an AssertionError describing the first failing input.
+    :param circuit: The circuit (at most 64 qubits per register).
+    :param registers: Qubit indices of each register (least significant qubit first).
+    :param reference: Computes the expected register values from the input register values.
+    :param domains: Values of each register, defaults to all values.
+    :param dirty: Qubit indices of the borrowed (dirty) qubits.
+    :param seed: Seed for the states of the dirty qubits.
+    :return: Number of checked inputs.
+    """
+    if domains is None:
+        domains = [range(2 ** len(register)) for register in registers]
+    grids = np.meshgrid(*[np.asarray(list(domain), dtype=np.uint64) for domain in domains], indexing='ij')
+    values = [grid.ravel() for grid in grids]
+    batch_size = len(values[0])
+
+    dirty = list(dirty)
+    dirty_values = np.random.default_rng(seed).integers(0, 2, size=(len(dirty), batch_size), dtype=np.uint64)
+    output_planes = simulate_classical_batch(
+        circuit,
+        pack_registers(circuit.num_qubits, registers + [[qubit] for qubit in dirty], values + list(dirty_values))
+    )
+
+    # NumPy wraps around silently, products of two values of at most 31 bits still fit into int64.
+    dtype = np.int64 if all(len(register) < 32 for register in registers) else object
+    expected = reference(*[register_values.astype(dtype) for register_values in values])
+    checks = [(f"register {i}", register, np.asarray(expected[i], dtype=np.uint64))
+              for i, register in enumerate(registers)]
+    checks += [(f"dirty qubit {qubit}", [qubit], dirty_values[i]) for i, qubit in enumerate(dirty)]
+    used = {qubit for register in registers for qubit in register} | set(dirty)
+    checks += [(f"clean qubit {qubit}", [qubit], np.zeros(batch_size, dtype=np.uint64))
+               for qubit in range(circuit.num_qubits) if qubit not in used]
+
+    for description, register, expected_values in checks:
+        actual_values = unpack_register(output_planes, register, batch_size)
+        mismatches = np.nonzero(actual_values != np.broadcast_to(expected_values, (batch_size,)))[0]
+        if len(mismatches) > 0:
+            index = mismatches[0]
+            raise AssertionError(
+                f"Wrong value of {description} for the input {[int(v[index]) for v in values]}: "
+                f"expected {int(np.broadcast_to(expected_values, (batch_size,))[index])}, "
+                f"got {int(actual_values[index])} ({len(mismatches)} of {batch_size} inputs fail)."
+            )
+    return batch_size
@@ -0,0 +1,64 @@
+from qiskit import QuantumCircuit, QuantumRegister
+from qiskit.circuit import ControlledGate
+from qiskit.circuit.library import SwapGate, get_standard_gate_name_mapping
+
+# Standard gates (e.g. H, T) have definitions too, which must not be expanded.
+_standard_gate_names = set(get_standard_gate_name_mapping().keys())
+# Instructions without any effect, which need no controls.
+_ignored_names = {'id', 'barrier', 'delay'}
+
+
+def controlled_circuit(circuit: QuantumCircuit, register_c: QuantumRegister) -> QuantumCircuit:
+    """
+    Adds the controls of register_c to every gate of a circuit, replacing circuit.control(c).
+    X, (multi-)controlled X and SWAP gates receive the controls directly, sub-circuits are controlled recursively
+    (each distinct sub-circuit only once) and other standard gates are controlled by Qiskit.
+    Unlike circuit.control(c), nothing is transpiled and the registers of the circuit are kept (after register_c).
+    :param circuit: The circuit, it must not contain measurements or resets.
+    :param register_c: The control register.
+    :return: The controlled circuit.
+    """
+    c = len(register_c)
+    if c == 0:
+        return circuit
+    memo = {}
+
+    def lift(lifted_circuit: QuantumCircuit, controls: list, result: QuantumCircuit):
+        qubit_map = {qubit: result.qubits[c + i] for i, qubit in enumerate(lifted_circuit.qubits)}
+        for instruction in lifted_circuit.data:
+            operation = instruction.operation
+            qubits = [qubit_map[qubit] for qubit in instruction.qubits]
+            name = operation.name
+            if name in _ignored_names:
+                continue
+            if name in ('measure', 'reset') or operation.num_clbits > 0:
+                raise ValueError(f"Instruction '{name}' cannot be controlled.")
+
+            if name == 'x':
+                result.mcx(controls, qubits[0])
+            elif name == 'swap':
+                result.append(SwapGate().control(c), controls + qubits)
+            elif isinstance(operation, ControlledGate) and operation.base_gate.name in ('x', 'swap'):
+                # Additional qubits of MCX variants (e.g. mcx_vchain) are ancillae, which are not needed.
+                num_ctrl_qubits = operation.num_ctrl_qubits
+                ctrl_state = (1 << c) - 1 | (operation.ctrl_state << c)
+                if operation.base_gate.name == 'x':
+                    result.mcx(controls + qubits[:num_ctrl_qubits], qubits[num_ctrl_qubits], ctrl_state=ctrl_state)
+                else:
+                    result.append(SwapGate().control(c + num_ctrl_qubits, ctrl_state=ctrl_state),
+                                  controls + qubits[:num_ctrl_qubits + 2])
+            elif name not in _standard_gate_names and getattr(operation, 'definition', None) is not None:
+                if id(operation) not in memo:
+                    definition = operation.definition
+                    lifted = QuantumCircuit(QuantumRegister(c, 'c'), QuantumRegister(definition.num_qubits, 'q'),
+                                            name=operation.name)
+                    lift(definition, list(lifted.qubits[:c]), lifted)
+                    # Keep the operation alive, as its id could otherwise be reused.
+                    memo[id(operation)] = (operation, lifted.to_instruction())
+                result.append(memo[id(operation)][1], controls + qubits)
+            else:
+                result.append(operation.control(c), controls + qubits)
+
+    result = QuantumCircuit(register_c, *circuit.qregs, name=circuit.name)
+    lift(circuit, list(register_c), result)
+    return result
@@ -0,0 +1,171 @@
+import importlib
+from typing import Callable
+
+import numpy as np
+from qiskit import QuantumRegister, QuantumCircuit
+
+from api.CircuitChooser import CircuitChooser
+from api.CircuitComponent import CircuitComponent
+from api.CircuitNotSupportedError import CircuitNotSupportedError
+from impl.util.classical_simulation import compile_classical, simulate_classical_batch, pack_registers, \
+    unpack_register
+
+# Arguments (after dqa and cqa) of each circuit type, from the register size n, a constant a, a modulus p and
+# the number of controls c. The EC point adder and the modular exponentiation are left out, their circuits are
+# too large and they only borrow qubits through their sub-components.
+example_arguments: dict[str, Callable[[int, int, int, int], tuple]] = {
+    "QCIncrementer": lambda n, a, p, c: (n, 0, c),
+    "QCAdderIP": lambda n, a, p, c: (n, a, c),
+    "QCComparator": lambda n, a, p, c: (n, a, c),
+    "QCModAdderIP": lambda n, a, p, c: (n, a, p, c),
+    "QQAdderIP": lambda n, a, p, c: (n, c, False, False),
+    "QQComparator": lambda n, a, p, c: (n, c),
+    "QQModAdderIP": lambda n, a, p, c: (n, p, c),
+    "QCModDoublerIP": lambda n, a, p, c: (n, p, c),
+    "QCModMulOOP": lambda n, a, p, c: (n, a, p, c),
+    "QCModMulIP": lambda n, a, p, c: (n, a, p, c),
+    "QQModInversionOOP": lambda n, a, p, c: (n, p, c),
+    "QQModMulOOP": lambda n, a, p, c: (n, p, c),
+    "QCModSquaringOOP": lambda n, a, p, c: (n, p, c),
+    "QCModularNegationIP": lambda n, a, p, c: (n, p, c),
+}
+
+
+def _register_indices(component: CircuitComponent, circuit: QuantumCircuit) -> dict[str, list[int]]:
+    """
+    :return: Qubit indices in the circuit of each register of the component, by attribute name.
+    """
+    registers = {name: register for name, register in vars(component).items()
+                 if name.startswith("register_") and isinstance(register, QuantumRegister)}
+    if all(circuit.has_register(register) for register in registers.values() if len(register) > 0):
+        return {name: [circuit.find_bit(qubit).index for qubit in register] for name, register in registers.items()}
+
+    # Circuits built with circuit.control(c) have new qubits, which are in the order of the registers.
+    if sum(len(register) for register in registers.values()) != circuit.num_qubits:
+        raise ValueError(f"Cannot locate the registers of {type(component).__name__} in its circuit.")
+    indices = {}
+    offset = 0
+    for name, register in registers.items():
+        indices[name] = list(range(offset, offset + len(register)))
+        offset += len(register)
+    return indices
+
+
+def check_ancilla_restoration(component: CircuitComponent, inputs: int = 16, dirty_samples: int = 256,
+                              seed: int = None) -> list[str]:
+    """
+    Checks that a component restores its borrowed (dirty) qubits for arbitrary contents and
+    returns its clean ancillas to 0, using a batched classical simulation.
+
+    Each of the random inputs is combined with dirty_samples random contents of the borrowed qubits.
+    Output registers (register_r) start in 0, registers of modular components with n qubits only hold values below p.
+    :param component: The component, its circuit must be classical (see classical_simulation.py).
+    :param inputs: Number of random inputs of the data registers.
+    :param dirty_samples: Number of random dirty contents per input.
+    :param seed: Seed of the random inputs and dirty contents.
+    :return: Descriptions of the corrupted qubits, empty if the component is correct.
+    """
+    circuit = component.get_circuit()
+    rng = np.random.default_rng(seed)
+    batch_size = inputs * dirty_samples
+
+    registers = []
+    values = []
+    # Initial contents of each borrowed qubit by index.
+    dirty_values = {}
+    register_indices = _register_indices(component, circuit)
+    for name, indices in register_indices.items():
+        if len(indices) == 0 or name == "register_anc" or name == "register_r":
+            # Clean ancillas and output registers start in 0.
+            continue
+        if name == "register_g":
+            for index in indices:
+                dirty_values[index] = rng.integers(0, 2, size=batch_size, dtype=np.uint64)
+                registers.append([index])
+                values.append(dirty_values[index])
+            continue
+        if hasattr(component, "p") and len(indices) == component.n:
+            input_values = rng.integers(0, component.p, size=inputs, dtype=np.uint64)
+        else:
+            input_values = rng.integers(0, 2 ** len(indices), size=inputs, dtype=np.uint64)
+        registers.append(indices)
+        values.append(np.repeat(input_values, dirty_samples))
+
+    output_planes = simulate_classical_batch(compile_classical(circuit),
+                                             pack_registers(circuit.num_qubits, registers, values))
+
+    problems = []
+    for kind, name in [("borrowed", "register_g"), ("clean", "register_anc")]:
+        for position, index in enumerate(register_indices.get(name, [])):
+            expected = dirty_values.get(index, np.zeros(batch_size, dtype=np.uint64))
+            corrupted = np.count_nonzero(unpack_register(output_planes, [index], batch_size) != expected)
+            if corrupted > 0:
+                problems.append(f"{kind} qubit {getattr(component, name).name}[{position}] is corrupted in "
+                                f"{corrupted} of {batch_size} samples")
+    return problems
+
+
+def check_registry(n_values: list[int],
+                   ancilla_budgets: list[(int, int)] = None,
+                   circuit_types: list[str] = None,
+                   c_values: list[int] = (0, 1),
+                   inputs: int = 16,
+                   dirty_samples: int = 256,
+                   seed: int = None) -> dict[tuple, list[str]]:
+    """
+    Runs check_ancilla_restoration for every registered implementation (see CircuitChooser.registry).
+    Sub-components are chosen by the CircuitChooser as usual, so a corrupting sub-component or a wrong
+    allocation with setup_anc_registers is reported at every component which uses it.
+    Implementations which do not support a budget (CircuitNotSupportedError) or are not classical circuits are
+    skipped. Components which accept a budget but fail to build their circuit (e.g. as no sub-component can be
+    chosen with the remaining qubits) or whose circuit cannot be checked are reported as well.
+    Set a metric and name filter on the CircuitChooser beforehand, as the default metric does not build the
+    candidates and may choose one which fails.
+    :param n_values: Register sizes, for each n the constant is 2^n - 3 and the modulus the largest odd n-bit number.
+    :param ancilla_budgets: Pairs of (dirty, clean) qubits available, defaults to a borrowing and a clean budget.
+    :param circuit_types: Circuit types to check, defaults to all types of example_arguments.
+    :param c_values: Numbers of controls.
+    :param inputs: Number of random inputs per component.
+    :param dirty_samples: Number of random dirty contents per input.
+    :param seed: Seed of the random inputs and dirty contents.
+    :return: The problems of each failing (circuit type, implementation name, arguments, dqa, cqa).
+    """
+    chooser = CircuitChooser()
+    circuit_types = list(example_arguments.keys()) if circuit_types is None else circuit_types
+
+    failures = {}
+    for circuit_type in circuit_types:
+        for path in chooser.registry[circuit_type]:
+            module_name, name = path.rsplit('.', 1) if isinstance(path, str) else (None, path.__name__)
+            component_type = getattr(importlib.import_module(module_name), name) if module_name else path
+            for n in n_values:
+                budgets = [(n + 1, 1), (0, 2 * n + 2)] if ancilla_budgets is None else ancilla_budgets
+                p = 2 ** n - 1
+                a = max(2 ** n - 3, 1) % p
+                for c in c_values:
+                    args = example_arguments[circuit_type](n, a, p, c)
+                    for dqa, cqa in budgets:
+                        key = (circuit_type, name, args, dqa, cqa)
+                        try:
+                            component = component_type(dqa, cqa, *args)
+                            circuit = component.get_circuit()
+                        except CircuitNotSupportedError:
+                            # Not supported with this budget (some components only check it when building).
+                            continue
+                        except Exception as e:
+                            # The budget was accepted, but the circuit (or a sub-component) could not be built.
+                            failures[key] = [f"building the circuit failed with {type(e).__name__}: {e}"]
+                            continue
+                        try:
+                            compile_classical(circuit)
+                        except ValueError:
+                            # Not a classical circuit (e.g. OTUSAdderIP).
+                            continue
+                        try:
+                            problems = check_ancilla_restoration(component, inputs, dirty_samples, seed)
+                        except Exception as e:
+                            # E.g. the registers of the component cannot be located in its circuit.
+                            problems = [f"checking the circuit failed with {type(e).__name__}: {e}"]
+                        if len(problems) > 0:
+                            failures[key] = problems
+    return failures
@@ -0,0 +1,66 @@
+from qiskit import QuantumCircuit, QuantumRegister
+from qiskit.circuit import Gate
+
+
+class LogicalAndGate(Gate):
+    """
+    Temporary logical-AND by Gidney (https://arxiv.org/pdf/1709.06648, Fig 3.).
+
+    Takes |a>|b>|0> to |a>|b>|a AND b> with 4 T gates instead of the 7 of a Toffoli gate,
+    the target must be clean. Reversing (or inverting) it gives the LogicalAndUncomputeGate.
+    """
+
+    def __init__(self):
+        super().__init__("logical_and", 3, [])
+
+    def _define(self):
+        q = QuantumRegister(3, 'q')
+        a, b, t = q
+        circuit = QuantumCircuit(q, name=self.name)
+        circuit.h(t)
+        circuit.t(t)
+        circuit.cx(a, t)
+        circuit.cx(b, t)
+        circuit.cx(t, a)
+        circuit.cx(t, b)
+        circuit.tdg(a)
+        circuit.tdg(b)
+        circuit.t(t)
+        circuit.cx(t, a)
+        circuit.cx(t, b)
+        circuit.h(t)
+        circuit.s(t)
+        self.definition = circuit
+
+    def inverse(self, annotated: bool = False):
+        return LogicalAndUncomputeGate()
+
+    def reverse_ops(self):
+        # The components uncompute by reversing, which must turn the compute into the uncompute.
+        return LogicalAndUncomputeGate()
+
+
+class LogicalAndUncomputeGate(Gate):
+    """
+    Uncomputation of the temporary logical-AND, takes |a>|b>|a AND b> to |a>|b>|0>.
+
+    Gidney uncomputes by measuring the target in the X basis, followed by a CZ on a and b if the outcome is 1,
+    so no Toffoli gate is needed. The components are reversed, controlled and converted to gates,
+    which is not possible with measurements, so the definition is the inverse of the compute (4 T gates).
+    Only the logical cost (see api/CostModel.py, e.g. toffoli_count_metric) counts it as free, as it would be after
+    replacing it by the measurement. Metrics on the transpiled circuit (gate and CZ counts and depths) pay for its
+    unitary definition, so the logical-AND gate mode only helps the logical metrics.
+    """
+
+    def __init__(self):
+        super().__init__("logical_and_dg", 3, [])
+
+    def _define(self):
+        self.definition = LogicalAndGate().definition.inverse()
+        self.definition.name = self.name
+
+    def inverse(self, annotated: bool = False):
+        return LogicalAndGate()
+
+    def reverse_ops(self):
+        return LogicalAndGate()
@@ -1,9 +1,11 @@
+import functools
 import math
+from typing import Iterator
 
-from scipy.special import binom
+import numpy as np
 
 
-# TODO: Remove these permutations by finding a direct equation for the coefficients.
+# The functions below are only used by get_coeffs_by_expansion.
 # Example:
 # $$C(a_m) = (2^m)^{p-2}$$
 # $$C(a_m,a_n) = (2^n + 2^m)^{p-2} - (2^n)^{p-2} - (2^m)^{p-2}, \textrm{with } m < n$$
@@ -50,11 +52,58 @@ def get_permutations_for_length(sum, num_integers, num_zeros=0) -> []:
 #     return math.factorial(n) // prd
 
 # Based on the decomposition using binomial theorem
-# TODO: Improve by using modular arithmetic. Pretty sure we can take advantage of factorials to know when a binom is zero.
 def multinomial(params) -> int:
     if len(params) == 1:
         return 1
-    return binom(sum(params), params[-1]) * multinomial(params[:-1])
+    return math.comb(sum(params), params[-1]) * multinomial(params[:-1])
+
+
+@functools.lru_cache(maxsize=None)
+def factorial_tables(p: int) -> (list[int], list[int]):
+    """
+    :param p: Prime modulus.
+    :return: Tables of k! mod p and (k!)^(-1) mod p for 0 <= k < p.
+    """
+    factorials = [1] * p
+    for k in range(1, p):
+        factorials[k] = factorials[k - 1] * k % p
+    inverse_factorials = [1] * p
+    inverse_factorials[p - 1] = pow(factorials[p - 1], p - 2, p)
+    for k in range(p - 1, 0, -1):
+        inverse_factorials[k - 1] = inverse_factorials[k] * k % p
+    return factorials, inverse_factorials
+
+
+def binomial_mod(n: int, k: int, p: int) -> int:
+    """
+    Binomial coefficient n choose k mod a prime p, with Lucas' theorem for n >= p.
+    """
+    if k < 0 or k > n:
+        return 0
+    factorials, inverse_factorials = factorial_tables(p)
+    result = 1
+    while n > 0 or k > 0:
+        n_digit, k_digit = n % p, k % p
+        if k_digit > n_digit:
+            return 0
+        result = result * factorials[n_digit] * inverse_factorials[k_digit] * inverse_factorials[n_digit - k_digit] % p
+        n //= p
+        k //= p
+    return result
+
+
+def multinomial_mod(params, p: int) -> int:
+    """
+    Multinomial coefficient (sum(params); params) mod a prime p, as a product of binomial coefficients.
+    """
+    result = 1
+    total = 0
+    for k in params:
+        total += k
+        result = result * binomial_mod(total, k, p) % p
+        if result == 0:
+            break
+    return result
 
 
 def powerset(s) -> []:
@@ -65,7 +114,78 @@ def powerset(s) -> []:
     return ps
 
 
+def inverse_evaluations(p: int) -> np.ndarray:
+    """
+    Evaluates x^(p-2) mod p (i.e. the modular inverse, with 0 for x = 0) for all n-bit inputs x.
+    :param p: Prime modulus.
+    :return: Array of length 2^n, with n the bit length of p.
+    """
+    n = math.ceil(math.log2(p))
+    return np.array([pow(x, p - 2, p) for x in range(0, 1 << n)], dtype=np.int64)
+
+
+def mobius_transform(evaluations: np.ndarray, p: int) -> np.ndarray:
+    """
+    Computes the coefficients of the multilinear polynomial over Z_p, which takes the given values on the
+    Boolean cube, with the fast Moebius transform: coeff[S] = sum over T subset of S of (-1)^|S - T| * f(T).
+    Sets are bitmasks, i.e. index i of the evaluations is the input with x_j = bit j of i.
+    :param evaluations: Values of the function for all 2^n inputs.
+    :param p: Modulus.
+    :return: Array of the coefficients of all subsets, reduced mod p.
+    """
+    coeffs = evaluations % p
+    n = len(coeffs).bit_length() - 1
+    for i in range(0, n):
+        # Pairs of sets without and with element i.
+        blocks = coeffs.reshape(-1, 2, 1 << i)
+        blocks[:, 1, :] = (blocks[:, 1, :] - blocks[:, 0, :]) % p
+    return coeffs
+
+
+def iter_coeffs(p: int, remove_larger_subsets=False, skip_zero=False) -> Iterator[tuple[tuple, int]]:
+    """
+    Streams the coefficients of the multilinear expansion of x^(p-2) mod p in the bits of x.
+    They are computed from the 2^n evaluations with a Moebius transform, in O(n * 2^n) instead of
+    expanding the power with multinomials (see get_coeffs_by_expansion).
+    :param p: Prime modulus.
+    :param remove_larger_subsets: Leave out subsets which only occur for inputs >= p.
+    :param skip_zero: Leave out subsets with coefficient 0 (they need no gates).
+    :return: Pairs of subsets of bit positions (as sorted tuple) and their coefficient, in the order of the powerset.
+    """
+    n = math.ceil(math.log2(p))
+    coeffs_by_mask = mobius_transform(inverse_evaluations(p), p)
+    # The subset is at least as large as its bitmask.
+    masks = np.arange(1, p if remove_larger_subsets else 1 << n)
+    if skip_zero:
+        masks = masks[coeffs_by_mask[masks] != 0]
+    for mask in masks:
+        mask = int(mask)
+        yield tuple(j for j in range(n) if mask & (1 << j)), int(coeffs_by_mask[mask])
+
+
 def get_coeffs(p: int, remove_larger_subsets=False) -> {}:
+    """
+    Coefficients of all subsets, see iter_coeffs.
+    """
+    return dict(iter_coeffs(p, remove_larger_subsets))
+
+
+def coefficient_sparsity(p: int) -> dict:
+    """
+    Reports how many coefficients are non-zero, i.e. how many controlled modular adders FermatModularInversion needs.
+    :param p: Prime modulus.
+    :return: Dictionary with the keys subsets (number of subsets of inputs < p), nonzero and density.
+    """
+    subsets = p - 1
+    nonzero = sum(1 for _ in iter_coeffs(p, remove_larger_subsets=True, skip_zero=True))
+    return {"subsets": subsets, "nonzero": nonzero, "density": nonzero / subsets}
+
+
+def get_coeffs_by_expansion(p: int, remove_larger_subsets=False) -> {}:
+    """
+    Computes the same coefficients as get_coeffs, by expanding (sum_i 2^i x_i)^(p-2) with multinomials.
+    Exponential in n and p, only used as a reference.
+    """
     coeffs = {}
     powset = powerset(list(range(0, math.ceil(math.log2(p)))))
 
@@ -75,7 +195,7 @@ def get_coeffs(p: int, remove_larger_subsets=False) -> {}:
             continue
         coeff = 0
         for permutation in get_permutations_for_length(p - 2, len(subset)):
-            temp = multinomial(permutation) % p
+            temp = multinomial_mod(permutation, p)
             for a, b in zip(subset, permutation):
                 temp = (temp * (1 << (a * b))) % p  # Resubstitution b_1 = 2*a_1, b_2 = 4*a_2, b_3 = 8*a_3, etc.
             coeff = (coeff + temp) % p
@@ -0,0 +1,89 @@
+import unittest
+from random import Random
+
+from qiskit import QuantumRegister, QuantumCircuit, ClassicalRegister
+
+from api.CircuitChooser import CircuitChooser
+from impl.addition.qc.BeauregardConstantAdderIP import BeauregardConstantAdderIP
+from impl.encoding.binary_encoding import binary_encoding
+from impl_tests.testutil import execute_circuit
+
+
+class BeauregardConstantAdderTests(unittest.TestCase):
+
+    def setUp(self):
+        CircuitChooser().clear_caches()
+
+    def test_addition(self):
+        n = 4
+        for i in range(0, 10):
+            # Init
+            x_value = Random().randint(0, 2 ** n - 1)
+            a_value = Random().randint(0, 2 ** n - 1)
+
+            # Circuit init
+            register_x = QuantumRegister(n, 'x')
+            classical_register_x = ClassicalRegister(len(register_x), 'cl_x')
+
+            circuit = QuantumCircuit(register_x, classical_register_x)
+            # Encoding
+            circuit.append(binary_encoding(n, x_value), register_x)
+            # Operation
+            circuit.append(BeauregardConstantAdderIP(0, 0, n, a_value, 0).get_circuit(), list(register_x))
+            # Measurements
+            circuit.measure(register_x, classical_register_x)
+
+            counts = execute_circuit(circuit).get_counts()
+            self.assertEqual(len(counts), 1)
+            key_value = list(counts.items())[0]
+
+            self.assertEqual(int(key_value[0], 2), (x_value + a_value) % (1 << n))
+
+    def test_controlled_addition(self):
+        n = 4
+        for i in range(0, 10):
+            # Init
+            c = Random().randint(1, 2)
+            activate_control = Random().randint(0, 1) == 0
+            x_value = Random().randint(0, 2 ** n - 1)
+            a_value = Random().randint(1, 2 ** n - 1)
+
+            # Circuit init
+            register_c = QuantumRegister(c, 'c')
+            register_x = QuantumRegister(n, 'x')
+
+            classical_register_c = ClassicalRegister(len(register_c), 'cl_c')
+            classical_register_x = ClassicalRegister(len(register_x), 'cl_x')
+
+            circuit = QuantumCircuit(register_c, register_x, classical_register_c, classical_register_x)
+            # Encoding
+            if activate_control:
+                circuit.x(register_c)
+            circuit.append(binary_encoding(n, x_value), register_x)
+            # Operation
+            circuit.append(BeauregardConstantAdderIP(0, 0, n, a_value, c).get_circuit(),
+                           list(register_c) + list(register_x))
+            # Measurements
+            circuit.measure(register_c, classical_register_c)
+            circuit.measure(register_x, classical_register_x)
+
+            counts = execute_circuit(circuit).get_counts()
+            self.assertEqual(len(counts), 1)
+            key_value = list(counts.items())[0]
+
+            if activate_control:
+                self.assertEqual(int(key_value[0].split(" ")[0], 2), (x_value + a_value) % (1 << n))
+                self.assertEqual(key_value[0].split(" ")[1], "1" * c)
+            else:
+                self.assertEqual(int(key_value[0].split(" ")[0], 2), x_value)
+                self.assertEqual(key_value[0].split(" ")[1], "0" * c)
+
+    def test_approximation(self):
+        n = 8
+        exact = BeauregardConstantAdderIP(0, 0, n, 77, 0).get_circuit().decompose().count_ops()
+        approximate = BeauregardConstantAdderIP(0, 0, n, 77, 0, approximation_degree=4).get_circuit().decompose()
+        self.assertLess(approximate.count_ops()['cp'], exact['cp'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,6 +4,7 @@ from random import Random
 from qiskit import QuantumRegister, QuantumCircuit, ClassicalRegister
 
 from api.CircuitChooser import CircuitChooser
+from api.CostModel import validate_cost_model
 from api.NameFilters import custom_name_filter
 from impl.addition.qc.HRSConstantAdderIP import HRSConstantAdderIP
 from impl.encoding.binary_encoding import binary_encoding
@@ -343,5 +344,14 @@ class HRSConstantAdderTests(unittest.TestCase):
             self.assertEqual(key_value[1], 1024)
 
 
+    def test_cost_model(self):
+        CircuitChooser()._name_filter = custom_name_filter({"GidneyIncrementer"})
+        for n in range(1, 9):
+            for i in range(0, 5):
+                a = Random().randint(1, 2 ** n - 1)
+                c = Random().randint(0, 1)
+                model, counted = validate_cost_model(HRSConstantAdderIP(n, 0, n, a, c))
+                self.assertEqual(model, counted)
+
 if __name__ == '__main__':
     unittest.main()
@@ -231,6 +231,17 @@ class BasicIncrementerTests(unittest.TestCase):
                 self.assertEqual(key_value[0].split(" ")[0], "0" * len(register_anc))
                 self.assertEqual(key_value[1], 1024)
 
+    def test_repeated_circuit_overflow(self):
+        # Chosen components are reused, so building the circuit again must not change the component.
+        n = 4
+        incrementer = BasicIncrementer(0, 0, n, 1, 0, True)
+        circuit = incrementer.get_circuit()
+        self.assertEqual(incrementer.n, n)
+        CircuitChooser().clear_caches()
+        self.assertEqual(incrementer.get_circuit(), circuit)
+        self.assertEqual(incrementer.n, n)
+        self.assertEqual(len(incrementer.get_circuit().qubits), n + 1)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -4,6 +4,7 @@ from random import Random
 from qiskit import QuantumRegister, QuantumCircuit, ClassicalRegister
 
 from api.CircuitChooser import CircuitChooser
+from api.CostModel import validate_cost_model
 from impl.addition.qc.incrementer.HRSIncrementer import HRSIncrementer
 from impl.encoding.binary_encoding import binary_encoding
 from impl_tests.testutil import execute_circuit
@@ -231,6 +232,14 @@ class HRSIncrementerTests(unittest.TestCase):
                 self.assertEqual(key_value[0].split(" ")[0], "0" * len(register_anc))
                 self.assertEqual(key_value[1], 1024)
 
+    def test_cost_model(self):
+        for n in range(1, 8):
+            for s in range(0, n):
+                for c in range(0, 3):
+                    for overflow_qubit in [False, True]:
+                        model, counted = validate_cost_model(HRSIncrementer(n, 0, n, s, c, overflow_qubit))
+                        self.assertEqual(model, counted)
+
 
 if __name__ == '__main__':
     unittest.main()
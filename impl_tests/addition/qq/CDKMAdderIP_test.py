@@ -4,8 +4,10 @@ from random import Random
 from qiskit import QuantumRegister, QuantumCircuit, ClassicalRegister
 
 from api.CircuitChooser import CircuitChooser
+from api.CostModel import logical_cost_circuit, validate_cost_model
 from impl.addition.qq.CDKMAdderIP import CDKMAdderIP
 from impl.encoding.binary_encoding import binary_encoding
+from impl.util.classical_simulation import verify_exhaustively
 from impl_tests.testutil import execute_circuit
 
 
@@ -272,5 +274,63 @@ class CDKMAdderTests(unittest.TestCase):
             self.assertEqual(key_value[1], 1024)
 
 
+    def test_cost_model(self):
+        for n in range(1, 8):
+            for overflow_qubit in [False, True]:
+                for variant in [0, 1]:
+                    model, counted = validate_cost_model(CDKMAdderIP(0, 1, n, 0, False, overflow_qubit, variant))
+                    self.assertEqual(model, counted)
+
+    def test_logical_and(self):
+        for n in range(1, 6):
+            for overflow_qubit in [False, True]:
+                for c in range(0, 3):
+                    circuit = CDKMAdderIP(1, max(n - 1, 1), n, c, False, overflow_qubit, logical_and=True).get_circuit()
+                    registers = [list(range(0, c)), list(range(c, c + n)), list(range(c + n, c + 2 * n))]
+                    if overflow_qubit:
+                        registers.append([c + 2 * n])
+                    dirty = [c + 2 * n + int(overflow_qubit)]
+
+                    def reference(control, x, y, *overflow):
+                        active = control == (1 << c) - 1
+                        result = [control, x, ((x + y) % (1 << n)) * active + y * (1 - active)]
+                        if overflow_qubit:
+                            result.append(overflow[0] ^ (((x + y) >> n) & 1) * active)
+                        return tuple(result)
+
+                    verify_exhaustively(circuit, registers, reference, dirty=dirty)
+
+    def test_logical_and_cost_model(self):
+        for n in range(1, 8):
+            for overflow_qubit in [False, True]:
+                adder = CDKMAdderIP(0, max(n - 1, 1), n, 0, False, overflow_qubit, logical_and=True)
+                model, counted = validate_cost_model(adder)
+                self.assertEqual(model, counted)
+                # Half of the Toffoli gates (up to the overflow) compared to both UMA variants.
+                self.assertLessEqual(
+                    2 * model[2],
+                    validate_cost_model(CDKMAdderIP(0, 1, n, 0, False, overflow_qubit))[0][2] + 2 * overflow_qubit
+                )
+
+    def test_controlled_logical_and_cost_model(self):
+        for n in [1, 2, 5]:
+            for overflow_qubit in [False, True]:
+                for c in [0, 1, 2]:
+                    adder = CDKMAdderIP(0, max(n - 1, 1), n, c, False, overflow_qubit, logical_and=True)
+                    self.assertEqual(+logical_cost_circuit(adder.get_circuit()), +adder.get_cost_model())
+
+    def test_reversed_circuit(self):
+        n = 4
+        adder = CDKMAdderIP(0, 1, n, 0, False, True)
+        reversed_circuit = adder.get_reversed_circuit()
+        # Built once and then handed out from the cache, also to other instances with the same parameters.
+        self.assertIs(reversed_circuit, adder.get_reversed_circuit())
+        self.assertIs(reversed_circuit, CDKMAdderIP(0, 1, n, 0, False, True).get_reversed_circuit())
+        verify_exhaustively(
+            reversed_circuit,
+            [list(range(0, n)), list(range(n, 2 * n)), [2 * n]],
+            lambda x, y, o: (x, (y - x) % (1 << n), o ^ (((y - x) >> n) & 1))
+        )
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,146 @@
+import unittest
+from random import Random
+
+from qiskit import QuantumRegister, QuantumCircuit, ClassicalRegister
+
+from api.CircuitChooser import CircuitChooser
+from impl.addition.qq.DraperAdderIP import DraperAdderIP
+from impl.encoding.binary_encoding import binary_encoding
+from impl_tests.testutil import execute_circuit
+
+
+class DraperAdderTests(unittest.TestCase):
+
+    def setUp(self):
+        CircuitChooser().clear_caches()
+
+    def test_addition(self):
+        n = 4
+        for i in range(0, 10):
+            # Init
+            x_value = Random().randint(0, 2 ** n - 1)
+            y_value = Random().randint(0, 2 ** n - 1)
+
+            # Circuit init
+            register_x = QuantumRegister(n, 'x')
+            register_y = QuantumRegister(n, 'y')
+
+            classical_register_x = ClassicalRegister(len(register_x), 'cl_x')
+            classical_register_y = ClassicalRegister(len(register_y), 'cl_y')
+
+            circuit = QuantumCircuit(register_x, register_y, classical_register_x, classical_register_y)
+            # Encoding
+            circuit.append(binary_encoding(n, x_value), register_x)
+            circuit.append(binary_encoding(n, y_value), register_y)
+            # Operation
+            circuit.append(DraperAdderIP(0, 0, n, 0).get_circuit(), list(register_x) + list(register_y))
+            # Measurements
+            circuit.measure(register_x, classical_register_x)
+            circuit.measure(register_y, classical_register_y)
+
+            counts = execute_circuit(circuit).get_counts()
+            self.assertEqual(len(counts), 1)
+            key_value = list(counts.items())[0]
+
+            self.assertEqual(int(key_value[0].split(" ")[0], 2), (x_value + y_value) % (1 << n))
+            self.assertEqual(int(key_value[0].split(" ")[1], 2), x_value)
+
+    def test_addition_carry_overflow(self):
+        n = 4
+        for i in range(0, 10):
+            # Init
+            x_value = Random().randint(0, 2 ** n - 1)
+            y_value = Random().randint(0, 2 ** n - 1)
+            in_value = Random().randint(0, 1)
+
+            # Circuit init
+            register_x = QuantumRegister(n, 'x')
+            register_y = QuantumRegister(n, 'y')
+            register_in = QuantumRegister(1, 'in')
+            register_o = QuantumRegister(1, 'o')
+
+            classical_register_y = ClassicalRegister(len(register_y), 'cl_y')
+            classical_register_o = ClassicalRegister(len(register_o), 'cl_o')
+
+            circuit = QuantumCircuit(register_x, register_y, register_in, register_o,
+                                     classical_register_y, classical_register_o)
+            # Encoding
+            circuit.append(binary_encoding(n, x_value), register_x)
+            circuit.append(binary_encoding(n, y_value), register_y)
+            if in_value == 1:
+                circuit.x(register_in)
+            # Operation
+            circuit.append(DraperAdderIP(0, 0, n, 0, incoming_carry_qubit=True, overflow_qubit=True).get_circuit(),
+                           list(register_x) + list(register_y) + list(register_in) + list(register_o))
+            # Measurements
+            circuit.measure(register_y, classical_register_y)
+            circuit.measure(register_o, classical_register_o)
+
+            counts = execute_circuit(circuit).get_counts()
+            self.assertEqual(len(counts), 1)
+            key_value = list(counts.items())[0]
+
+            self.assertEqual(int(key_value[0].replace(" ", ""), 2), x_value + y_value + in_value)
+
+    def test_controlled_addition(self):
+        n = 4
+        for i in range(0, 10):
+            # Init
+            c = Random().randint(1, 2)
+            activate_control = Random().randint(0, 1) == 0
+            x_value = Random().randint(0, 2 ** n - 1)
+            y_value = Random().randint(0, 2 ** n - 1)
+            dirty_anc_available = 1
+            clean_anc_available = 1
+
+            # Circuit init
+            register_c = QuantumRegister(c, 'c')
+            register_x = QuantumRegister(n, 'x')
+            register_y = QuantumRegister(n, 'y')
+            register_g = QuantumRegister(dirty_anc_available, 'g')
+            register_anc = QuantumRegister(clean_anc_available, 'anc')
+
+            classical_register_y = ClassicalRegister(len(register_y), 'cl_y')
+            classical_register_g = ClassicalRegister(len(register_g), 'cl_g')
+            classical_register_anc = ClassicalRegister(len(register_anc), 'cl_anc')
+
+            circuit = QuantumCircuit(register_c, register_x, register_y, register_g, register_anc,
+                                     classical_register_y, classical_register_g, classical_register_anc)
+            # Encoding
+            if activate_control:
+                circuit.x(register_c)
+            circuit.append(binary_encoding(n, x_value), register_x)
+            circuit.append(binary_encoding(n, y_value), register_y)
+            # Operation
+            circuit.append(DraperAdderIP(dirty_anc_available, clean_anc_available, n, c).get_circuit(),
+                           list(register_c) + list(register_x) + list(register_y) + list(register_g) +
+                           list(register_anc))
+            # Measurements
+            circuit.measure(register_y, classical_register_y)
+            circuit.measure(register_g, classical_register_g)
+            circuit.measure(register_anc, classical_register_anc)
+
+            counts = execute_circuit(circuit).get_counts()
+            self.assertEqual(len(counts), 1)
+            key_value = list(counts.items())[0]
+
+            if activate_control:
+                self.assertEqual(int(key_value[0].split(" ")[2], 2), (x_value + y_value) % (1 << n))
+            else:
+                self.assertEqual(int(key_value[0].split(" ")[2], 2), y_value)
+            self.assertEqual(key_value[0].split(" ")[1], "0" * len(register_g))
+            self.assertEqual(key_value[0].split(" ")[0], "0" * len(register_anc))
+
+    def test_approximation(self):
+        n = 8
+        exact = DraperAdderIP(0, 0, n, 0).get_circuit().decompose().count_ops()
+        approximate = DraperAdderIP(0, 0, n, 0, approximation_degree=4).get_circuit().decompose().count_ops()
+        self.assertLess(approximate['cp'], exact['cp'])
+        self.assertNotEqual(DraperAdderIP(0, 0, n, 0).get_global_identifier(),
+                            DraperAdderIP(0, 0, n, 0, approximation_degree=4).get_global_identifier())
+        with self.assertRaises(ValueError):
+            DraperAdderIP(0, 0, n, 0, approximation_degree=-1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,6 +4,7 @@ from random import Random
 from qiskit import QuantumRegister, QuantumCircuit, ClassicalRegister
 
 from api.CircuitChooser import CircuitChooser
+from api.CostModel import validate_cost_model
 from impl.addition.qq.TTKAdderIP import TTKAdderIP
 from impl.encoding.binary_encoding import binary_encoding
 from impl_tests.testutil import execute_circuit
@@ -276,5 +277,11 @@ class TTKAdderTests(unittest.TestCase):
             self.assertEqual(key_value[1], 1024)
 
 
+    def test_cost_model(self):
+        for n in range(0, 8):
+            for overflow_qubit in [False, True]:
+                model, counted = validate_cost_model(TTKAdderIP(0, 0, n, 0, False, overflow_qubit))
+                self.assertEqual(model, counted)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,178 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from api.CircuitChooser import CircuitChooser
+from api.CircuitComponent import CircuitComponent
+from api.Metrics import default_metric, gate_count_metric, metric_bundle_cache, toffoli_count_metric
+from api.NameFilters import custom_name_filter, default_name_filter
+from api.PersistentCache import enable_persistent_cache, disable_persistent_cache
+from impl.addition.qq.TTKAdderIP import TTKAdderIP
+
+_root_directory = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def prefer_ttk_metric(component: CircuitComponent) -> float:
+    return 0 if type(component).__name__ == "TTKAdderIP" else 1
+
+
+def prefer_cdkm_metric(component: CircuitComponent) -> float:
+    return 0 if type(component).__name__ == "CDKMAdderIP" else 1
+
+
+class CircuitChooserTests(unittest.TestCase):
+
+    def setUp(self):
+        chooser = CircuitChooser()
+        # The chooser is a singleton, do not leak the configuration into other tests.
+        self.addCleanup(setattr, chooser, "_metric", chooser._metric)
+        self.addCleanup(setattr, chooser, "_name_filter", chooser._name_filter)
+        # Other tests may have left a name filter behind.
+        chooser._name_filter = default_name_filter
+        chooser.clear_caches()
+
+    def test_decisions_are_memoized(self):
+        chooser = CircuitChooser()
+        chooser._metric = prefer_ttk_metric
+        adder = chooser.choose_component("QQAdderIP", (4, 0, False, False), 0, 1)
+        self.assertIs(chooser.choose_component("QQAdderIP", (4, 0, False, False), 0, 1), adder)
+        self.assertIsNot(chooser.choose_component("QQAdderIP", (4, 0, False, False), 0, 2), adder)
+
+    def test_metric_change_invalidates_decisions(self):
+        chooser = CircuitChooser()
+        chooser._metric = prefer_ttk_metric
+        self.assertEqual(type(chooser.choose_component("QQAdderIP", (4, 0, False, False), 0, 1)).__name__,
+                         "TTKAdderIP")
+        self.assertEqual(len(chooser.decision_cache), 1)
+
+        chooser._metric = prefer_cdkm_metric
+        self.assertEqual(len(chooser.decision_cache), 0)
+        self.assertEqual(type(chooser.choose_component("QQAdderIP", (4, 0, False, False), 0, 1)).__name__,
+                         "CDKMAdderIP")
+
+    def test_name_filter_change_invalidates_decisions(self):
+        chooser = CircuitChooser()
+        chooser._name_filter = custom_name_filter({"TTKAdderIP"})
+        self.assertEqual(type(chooser.choose_component("QQAdderIP", (4, 0, False, False), 0, 1)).__name__,
+                         "TTKAdderIP")
+
+        chooser._name_filter = custom_name_filter({"CDKMAdderIP"})
+        self.assertEqual(len(chooser.decision_cache), 0)
+        self.assertEqual(type(chooser.choose_component("QQAdderIP", (4, 0, False, False), 0, 1)).__name__,
+                         "CDKMAdderIP")
+
+    def test_persisted_selections(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        persistent_cache = enable_persistent_cache(os.path.join(directory.name, "cache.sqlite"))
+        self.addCleanup(disable_persistent_cache)
+        chooser = CircuitChooser()
+        args = ("QQAdderIP", (4, 0, False, False), 0, 1)
+        names = tuple(constructor.__name__ for constructor in chooser._get_constructors("QQAdderIP"))
+
+        chooser._metric = prefer_ttk_metric
+        chooser.choose_component(*args)
+        self.assertEqual(persistent_cache.get("selection", args + (__name__ + ".prefer_ttk_metric", names)),
+                         "TTKAdderIP")
+
+        # Lambdas have no stable name, their selections are not persisted.
+        chooser._metric = lambda component: 0 if type(component).__name__ == "CDKMAdderIP" else 1
+        self.assertEqual(type(chooser.choose_component(*args)).__name__, "CDKMAdderIP")
+        self.assertIsNone(persistent_cache.get("selection", args + (__name__ + ".<lambda>", names)))
+
+    def test_ties_keep_established_implementations(self):
+        chooser = CircuitChooser()
+        chooser._metric = default_metric
+        # Implementations added later are listed first, so they are only chosen if they score strictly better.
+        cases = [
+            ("QQModInversionOOP", (3, 7, 0), 0, 100, "FermatModularInversion"),
+            ("QCModMulOOP", (4, 5, 11, 0), 0, 100, "RCConstantModularMultiplierOOP"),
+            ("QCModExpIP", (4, 5, 11, 0), 0, 100, "HRSConstantModExpIP"),
+            ("QQModMulOOP", (8, 251, 0), 0, 100, "PZModularMultiplierOOP"),
+        ]
+        for circuit_type, args, dqa, cqa, name in cases:
+            self.assertEqual(type(chooser.choose_component(circuit_type, args, dqa, cqa)).__name__, name)
+
+    def test_logical_and_adder_is_considered(self):
+        chooser = CircuitChooser()
+        chooser._metric = toffoli_count_metric
+        # The classical adders, the rotations of the Draper adder have no Toffoli gates.
+        chooser._name_filter = custom_name_filter({"TTKAdderIP", "CDKMAdderIP", "CDKMLogicalAndAdderIP", "DKRSAdderIP"})
+        # The logical-AND gate mode of the CDKM adder halves the Toffoli count, if the carries fit into the ancillae.
+        self.assertEqual(type(chooser.choose_component("QQAdderIP", (8, 0, False, False), 0, 7)).__name__,
+                         "CDKMLogicalAndAdderIP")
+        self.assertNotEqual(type(chooser.choose_component("QQAdderIP", (8, 0, False, False), 0, 6)).__name__,
+                            "CDKMLogicalAndAdderIP")
+
+    def test_parallel_evaluation(self):
+        chooser = CircuitChooser()
+        chooser._metric = gate_count_metric
+        args = ("QQAdderIP", (3, 0, False, False), 0, 1)
+        serial_choice = chooser.choose_component(*args)
+        serial_values = dict(metric_bundle_cache)
+        self.assertGreater(len(serial_values), 1)
+
+        chooser.clear_caches()
+        chooser.enable_parallel_evaluation(2)
+        self.addCleanup(chooser.disable_parallel_evaluation)
+        self.assertEqual(chooser._executor_max_workers, 2)
+        parallel_choice = chooser.choose_component(*args)
+
+        self.assertEqual(parallel_choice.get_global_identifier(), serial_choice.get_global_identifier())
+        # The candidates were only built and transpiled in the workers, their values were merged back.
+        self.assertEqual(len(chooser.cache), 0)
+        for identifier, bundle in serial_values.items():
+            self.assertEqual(metric_bundle_cache[identifier], bundle)
+
+    def test_registry_is_imported_lazily(self):
+        output = subprocess.run(
+            [sys.executable, "-c",
+             "import sys\n"
+             "from api.CircuitChooser import CircuitChooser\n"
+             "CircuitChooser()\n"
+             "print(any(name.startswith('impl.') for name in sys.modules))\n"
+             "CircuitChooser().choose_component('QCIncrementer', (4, 0, 0, False))\n"
+             "print('impl.addition.qc.incrementer.BasicIncrementer' in sys.modules)\n"
+             "print(any(name.startswith('impl.comparator') for name in sys.modules))\n"],
+            capture_output=True, text=True, check=True,
+            env=dict(os.environ, PYTHONPATH=_root_directory)
+        ).stdout
+        # Nothing is imported until a choice needs it, and then only the implementations of its circuit type
+        # (and what they import).
+        self.assertEqual(output.split(), ["False", "True", "False"])
+
+    def test_register_component(self):
+        chooser = CircuitChooser()
+        self.addCleanup(chooser.circuit_types.pop, "TestAdderIP", None)
+        self.addCleanup(chooser.registry.pop, "TestAdderIP", None)
+        chooser.register_component("TestAdderIP", "impl.addition.qq.TTKAdderIP.TTKAdderIP")
+        self.assertNotIn("TestAdderIP", chooser.circuit_types)
+
+        adder = chooser.choose_component("TestAdderIP", (4, 0, False, False), 0, 1)
+        self.assertIsInstance(adder, TTKAdderIP)
+        self.assertIs(chooser.circuit_types["TestAdderIP"]["TTKAdderIP"], TTKAdderIP)
+
+    def test_register_invalid_component(self):
+        chooser = CircuitChooser()
+        self.addCleanup(chooser.circuit_types.pop, "TestAdderIP", None)
+        self.addCleanup(chooser.registry.pop, "TestAdderIP", None)
+        with self.assertRaises(ValueError):
+            chooser.register_component("TestAdderIP", "impl.addition.qq.NoSuchAdderIP.NoSuchAdderIP")
+        with self.assertRaises(ValueError):
+            chooser.register_component("TestAdderIP", "no_such_package.NoSuchAdderIP")
+        with self.assertRaises(ValueError):
+            chooser.register_component("TestAdderIP", "TTKAdderIP")
+        with self.assertRaises(ValueError):
+            chooser.register_component("TestAdderIP", TTKAdderIP(0, 0, 4))
+        self.assertNotIn("TestAdderIP", chooser.registry)
+
+        # The class itself is only looked up once a choice needs it.
+        chooser.register_component("TestAdderIP", "impl.addition.qq.TTKAdderIP.NoSuchAdderIP")
+        with self.assertRaises(ValueError):
+            chooser.choose_component("TestAdderIP", (4, 0, False, False), 0, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
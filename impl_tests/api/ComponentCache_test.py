@@ -0,0 +1,89 @@
+import unittest
+
+from qiskit import QuantumCircuit
+
+from api.ComponentCache import ComponentCache, LRUSizePolicy, estimate_circuit_size
+
+
+def _circuit(num_gates: int) -> QuantumCircuit:
+    circuit = QuantumCircuit(1)
+    for i in range(0, num_gates):
+        circuit.x(0)
+    return circuit
+
+
+class ComponentCacheTests(unittest.TestCase):
+
+    def test_estimate_circuit_size(self):
+        block = _circuit(10)
+        self.assertEqual(estimate_circuit_size(block), 11 * 256)
+
+        # A shared instruction is stored once, copies are stored per append.
+        shared = QuantumCircuit(1)
+        block_instruction = block.to_instruction()
+        copies = QuantumCircuit(1)
+        for i in range(0, 5):
+            shared.append(block_instruction, [0])
+            copies.append(block, [0])
+        self.assertEqual(estimate_circuit_size(shared), (1 + 5 + 10) * 256)
+        self.assertEqual(estimate_circuit_size(copies), (1 + 5 + 5 * 10) * 256)
+
+    def test_lru_eviction_order(self):
+        # Room for two circuits of three gates.
+        cache = ComponentCache(LRUSizePolicy(2 * estimate_circuit_size(_circuit(3))))
+        cache["a"] = _circuit(3)
+        cache["b"] = _circuit(3)
+        self.assertIsNotNone(cache.get("a"))
+        # b is the least recently used entry now.
+        cache["c"] = _circuit(3)
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+        self.assertIn("c", cache)
+
+        cache["d"] = _circuit(3)
+        self.assertNotIn("a", cache)
+        self.assertEqual(cache.evictions, 2)
+
+        # The newest entry is kept even if it exceeds the budget on its own.
+        cache["e"] = _circuit(100)
+        self.assertEqual(list(cache.entries.keys()), ["e"])
+
+    def test_pin_after_hits(self):
+        cache = ComponentCache(LRUSizePolicy(2 * estimate_circuit_size(_circuit(3))), pin_after_hits=2)
+        cache["leaf"] = _circuit(3)
+        cache.get("leaf")
+        self.assertNotIn("leaf", cache.pinned)
+        cache.get("leaf")
+        self.assertIn("leaf", cache.pinned)
+
+        for key in ["a", "b", "c", "d"]:
+            cache[key] = _circuit(3)
+        # Pinned entries do not count towards the budget and are never evicted.
+        self.assertIn("leaf", cache)
+        self.assertEqual(set(cache.entries.keys()), {"leaf", "c", "d"})
+
+        # Unpinned, it is the most recent entry and the least recently used one makes room for it.
+        cache.unpin("leaf")
+        self.assertEqual(set(cache.entries.keys()), {"leaf", "d"})
+
+    def test_statistics(self):
+        cache = ComponentCache(LRUSizePolicy(estimate_circuit_size(_circuit(3))), pin_after_hits=1)
+        self.assertIsNone(cache.get("a"))
+        cache["a"] = _circuit(3)
+        cache.get("a")
+        cache["b"] = _circuit(3)
+        cache["c"] = _circuit(3)
+        cache.get("b")
+        self.assertEqual(cache.statistics(), {
+            "entries": 2,
+            "pinned": 1,
+            "hits": 1,
+            "misses": 2,
+            "evictions": 1,
+        })
+        cache.clear()
+        self.assertEqual(cache.statistics()["entries"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
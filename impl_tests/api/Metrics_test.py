@@ -0,0 +1,54 @@
+import types
+import unittest
+from unittest import mock
+
+import api.Metrics as Metrics
+from api.CircuitChooser import CircuitChooser
+from api.Metrics import metric_bundle, gate_count_metric, gate_depth_metric, cz_count_metric, cz_depth_metric, \
+    get_metric_name, is_persistable_metric_name
+from impl.addition.qq.TTKAdderIP import TTKAdderIP
+from resource_estimation.automatic_optimisation import auto_opt
+
+
+class MetricsTests(unittest.TestCase):
+
+    def setUp(self):
+        CircuitChooser().clear_caches()
+
+    def test_bundle_matches_individual_metrics(self):
+        adder = TTKAdderIP(0, 0, 4)
+        with mock.patch.object(Metrics, "auto_opt", wraps=auto_opt) as transpile:
+            values = {
+                "gate_count": gate_count_metric(adder),
+                "gate_depth": gate_depth_metric(adder),
+                "cz_count": cz_count_metric(adder),
+                "cz_depth": cz_depth_metric(adder),
+            }
+            bundle = metric_bundle(adder)
+        # All four metrics are derived from a single transpilation.
+        self.assertEqual(transpile.call_count, 1)
+        self.assertEqual(bundle, values)
+
+        optimized = auto_opt(adder.get_circuit())
+        self.assertEqual(bundle["gate_count"], sum(optimized.count_ops().values()))
+        self.assertEqual(bundle["gate_depth"], optimized.depth())
+        self.assertEqual(bundle["cz_count"], optimized.count_ops().get("cz", 0))
+        self.assertEqual(bundle["cz_depth"], optimized.depth(lambda gate: gate[0].name in ["cz"]))
+
+    def test_metric_names(self):
+        self.assertEqual(get_metric_name(gate_count_metric), "api.Metrics.gate_count_metric")
+        # A metric of the same name in another module.
+        other_metric = types.FunctionType(gate_count_metric.__code__, {}, "gate_count_metric")
+        other_metric.__module__ = "other_module"
+        self.assertEqual(get_metric_name(other_metric), "other_module.gate_count_metric")
+
+        def local_metric(component):
+            return 0
+
+        self.assertTrue(is_persistable_metric_name(get_metric_name(gate_count_metric)))
+        self.assertFalse(is_persistable_metric_name(get_metric_name(lambda component: 0)))
+        self.assertFalse(is_persistable_metric_name(get_metric_name(local_metric)))
+
+
+if __name__ == '__main__':
+    unittest.main()
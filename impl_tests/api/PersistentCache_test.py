@@ -0,0 +1,74 @@
+import os
+import tempfile
+import unittest
+from multiprocessing import Pool
+
+from api.PersistentCache import PersistentCache
+from resource_estimation.automatic_optimisation import configure_pass_manager, get_pass_manager_configuration
+
+
+def _write_entries(path: str, worker: int, num_entries: int) -> int:
+    cache = PersistentCache(path, "test")
+    for i in range(0, num_entries):
+        cache.put("gate_count", ("component", worker, i), worker * num_entries + i)
+    cache.close()
+    return worker
+
+
+class PersistentCacheTests(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "cache.sqlite")
+
+    def test_round_trip(self):
+        cache = PersistentCache(self.path, "test")
+        cache.put("gate_count", ("TTKAdderIP", 0, 1, 4), 42)
+        cache.put("selection", ("QQAdderIP", (4, 0)), "TTKAdderIP")
+        self.assertEqual(cache.get("gate_count", ("TTKAdderIP", 0, 1, 4)), 42)
+        self.assertIsNone(cache.get("gate_count", ("TTKAdderIP", 0, 1, 5)))
+        self.assertIsNone(cache.get("gate_depth", ("TTKAdderIP", 0, 1, 4)))
+        cache.put("gate_count", ("TTKAdderIP", 0, 1, 4), 41)
+        cache.close()
+
+        # Visible to a new connection (e.g. a later run).
+        cache = PersistentCache(self.path, "test")
+        self.assertEqual(cache.get("gate_count", ("TTKAdderIP", 0, 1, 4)), 41)
+        self.assertEqual(cache.get("selection", ("QQAdderIP", (4, 0))), "TTKAdderIP")
+        cache.clear()
+        self.assertIsNone(cache.get("gate_count", ("TTKAdderIP", 0, 1, 4)))
+        cache.close()
+
+    def test_fingerprint_invalidation(self):
+        cache = PersistentCache(self.path, "test")
+        cache.put("gate_count", "key", 1)
+        self.assertIsNone(PersistentCache(self.path, "changed").get("gate_count", "key"))
+
+        configuration = get_pass_manager_configuration()
+        self.addCleanup(configure_pass_manager, **configuration)
+        configure_pass_manager(optimization_level=(configuration["optimization_level"] + 1) % 4)
+        self.assertIsNone(cache.get("gate_count", "key"))
+        cache.put("gate_count", "key", 2)
+
+        configure_pass_manager(**configuration)
+        self.assertEqual(cache.get("gate_count", "key"), 1)
+        cache.close()
+
+    def test_concurrent_writers(self):
+        num_workers = 4
+        num_entries = 50
+        cache = PersistentCache(self.path, "test")
+        self.assertEqual(cache.connection.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+
+        with Pool(num_workers) as pool:
+            pool.starmap(_write_entries, [(self.path, worker, num_entries) for worker in range(0, num_workers)])
+
+        for worker in range(0, num_workers):
+            for i in range(0, num_entries):
+                self.assertEqual(cache.get("gate_count", ("component", worker, i)), worker * num_entries + i)
+        cache.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
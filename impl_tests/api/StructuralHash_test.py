@@ -0,0 +1,80 @@
+import unittest
+from unittest import mock
+
+from qiskit import QuantumCircuit
+from qiskit.circuit import Gate
+
+import api.StructuralHash as StructuralHash
+from api.StructuralHash import structural_hash
+
+
+def _block(name: str) -> QuantumCircuit:
+    block = QuantumCircuit(3, name=name)
+    block.ccx(0, 1, 2)
+    block.cx(2, 0)
+    return block
+
+
+class StructuralHashTests(unittest.TestCase):
+
+    def test_equal_structure(self):
+        circuit_1 = QuantumCircuit(4)
+        circuit_1.append(_block("a"), [0, 1, 2])
+        circuit_1.x(3)
+        # Built separately, with other block names and an idle qubit.
+        circuit_2 = QuantumCircuit(6)
+        circuit_2.append(_block("b"), [1, 2, 3])
+        circuit_2.x(5)
+        self.assertEqual(structural_hash(circuit_1), structural_hash(circuit_2))
+
+    def test_renamed_gate(self):
+        circuit_1 = QuantumCircuit(2)
+        circuit_1.cx(0, 1)
+        circuit_2 = QuantumCircuit(2)
+        circuit_2.cz(0, 1)
+        self.assertNotEqual(structural_hash(circuit_1), structural_hash(circuit_2))
+
+        circuit_1 = QuantumCircuit(2)
+        circuit_1.append(Gate("oracle", 2, []), [0, 1])
+        circuit_2 = QuantumCircuit(2)
+        circuit_2.append(Gate("oracle_2", 2, []), [0, 1])
+        self.assertNotEqual(structural_hash(circuit_1), structural_hash(circuit_2))
+
+    def test_permuted_gates(self):
+        circuit_1 = QuantumCircuit(3)
+        circuit_1.append(_block("a"), [0, 1, 2])
+        circuit_1.h(0)
+        circuit_2 = QuantumCircuit(3)
+        circuit_2.h(0)
+        circuit_2.append(_block("a"), [0, 1, 2])
+        self.assertNotEqual(structural_hash(circuit_1), structural_hash(circuit_2))
+
+        # Permuted qubits of a gate (relative to the other gates, as qubits are relabeled by their first use).
+        circuit_1 = QuantumCircuit(3)
+        circuit_1.ccx(0, 1, 2)
+        circuit_1.cx(2, 0)
+        circuit_2 = QuantumCircuit(3)
+        circuit_2.ccx(0, 1, 2)
+        circuit_2.cx(0, 2)
+        self.assertNotEqual(structural_hash(circuit_1), structural_hash(circuit_2))
+
+    def test_repeated_block_hashed_once(self):
+        block_instruction = _block("a").to_instruction()
+        circuit = QuantumCircuit(5)
+        for i in range(0, 10):
+            circuit.append(block_instruction, [i % 3, i % 3 + 1, i % 3 + 2])
+
+        with mock.patch.object(StructuralHash, "_structural_digest",
+                               wraps=StructuralHash._structural_digest) as structural_digest:
+            digest = structural_hash(circuit)
+        self.assertEqual(structural_digest.call_count, 2)
+
+        # Same as appending copies of the block.
+        copies = QuantumCircuit(5)
+        for i in range(0, 10):
+            copies.append(_block("a"), [i % 3, i % 3 + 1, i % 3 + 2])
+        self.assertEqual(structural_hash(copies), digest)
+
+
+if __name__ == '__main__':
+    unittest.main()
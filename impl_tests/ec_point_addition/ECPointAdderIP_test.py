@@ -7,7 +7,7 @@ from api.CircuitChooser import CircuitChooser
 from api.NameFilters import custom_name_filter
 from impl.ec_point_addition.qc.RNSLECPointAdderIP import RNSLECPointAdderIP
 from impl.encoding.binary_encoding import binary_encoding
-from impl_tests.testutil import execute_circuit
+from impl_tests.testutil import execute_circuit_classically
 
 
 class RNSLECPointAdderIPTests(unittest.TestCase):
@@ -72,7 +72,7 @@ class RNSLECPointAdderIPTests(unittest.TestCase):
             circuit.measure(register_lambda, classical_register_lambda)
             circuit.measure(register_anc, classical_register_anc)
 
-            counts = execute_circuit(circuit).get_counts()
+            counts = execute_circuit_classically(circuit)
             self.assertEqual(len(counts), 1)
             # extract x
             key_value = list(counts.items())[0]
@@ -0,0 +1,68 @@
+import math
+import unittest
+
+import numpy as np
+
+from api.CircuitChooser import CircuitChooser
+from api.CircuitNotSupportedError import CircuitNotSupportedError
+from api.NameFilters import custom_name_filter
+from impl.ec_point_addition.qc.WindowedECPointAdderIP import WindowedECPointAdderIP, ec_add
+from impl.encoding.table_lookup import table_lookup_ancillas
+from impl.util.classical_simulation import verify_exhaustively
+
+
+class WindowedECPointAdderIPTests(unittest.TestCase):
+
+    def setUp(self):
+        CircuitChooser().clear_caches()
+
+    def test_windowed_ec_addition(self):
+        CircuitChooser()._name_filter = custom_name_filter(
+            {"TTKAdderIP", "HRSIncrementer", "BasicConstantAdderIP",
+             "RNSLModularNegationIP", "HRSConstantModularAdderIP", "RNSLModularAdderIP",
+             "RNSLModularDoublerIP", "RNSLModularSquaringOOP", "HRSConstantModularMultiplierIP",
+             "HRSConstantModularMultiplierOOP", "FermatModularInversion", "PZModularMultiplierOOP",
+             "HRSComparator", "FullSubtractionComparator"
+             }
+        )
+        # Choose an elliptic curve e.g: (x^3 + 3) mod 7.
+        p = 7
+        n = math.ceil(math.log2(p))
+        curve_points = [(x, y) for x in range(0, p) for y in range(0, p) if (y * y - x ** 3 - 3) % p == 0]
+        # A window of 2 is the last window of shors_ecdlp with a window size of 3 (2n + 2 = 8 qubits).
+        for points in [((6, 3),), ((6, 3), (2, 2)), ((6, 3), (2, 2), (4, 2))]:
+            w = len(points)
+            dirty_anc_available = 0
+            clean_anc_available = 4 * n + 1 + max(table_lookup_ancillas(w), 2)
+
+            ec_point_adder = WindowedECPointAdderIP(dirty_anc_available, clean_anc_available, n, points, p, w)
+            circuit = ec_point_adder.get_circuit()
+            table = ec_point_adder.get_table()
+
+            register_e = list(range(0, w))
+            register_x = list(range(w, w + n))
+            register_y = list(range(w + n, w + 2 * n))
+            for start in curve_points:
+                results = [ec_add(start, table[e], 0, p) if table[e] is not None else start
+                           for e in range(0, 2 ** w)]
+                # Like RNSLECPointAdderIP, the addition does not handle the exceptional cases where the start point
+                # or the result has the same x-coordinate as the added point (e.g. doubling).
+                windows = [e for e in range(0, 2 ** w) if table[e] is None or
+                           (table[e][0] != start[0] and results[e][0] != table[e][0])]
+                results_x = np.array([0 if result is None else result[0] for result in results])
+                results_y = np.array([0 if result is None else result[1] for result in results])
+                verify_exhaustively(circuit, [register_e, register_x, register_y],
+                                    lambda e, x, y: (e, results_x[e], results_y[e]),
+                                    domains=[windows, [start[0]], [start[1]]])
+
+    def test_requires_window_of_points(self):
+        with self.assertRaises(CircuitNotSupportedError):
+            WindowedECPointAdderIP(0, 20, 3, (6, 3), 7, 1)
+        with self.assertRaises(CircuitNotSupportedError):
+            WindowedECPointAdderIP(0, 20, 3, ((6, 3), (2, 2)), 7, 1)
+        with self.assertRaises(CircuitNotSupportedError):
+            WindowedECPointAdderIP(0, 4 * 3 + 2, 3, ((6, 3), (2, 2)), 7, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
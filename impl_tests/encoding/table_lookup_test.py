@@ -0,0 +1,40 @@
+import unittest
+from random import Random
+
+import numpy as np
+
+from impl.encoding.table_lookup import table_lookup, table_lookup_ancillas, window_size
+from impl.util.classical_simulation import verify_exhaustively
+
+
+class TableLookupTests(unittest.TestCase):
+
+    def test_table_lookup(self):
+        n = 5
+        for w in [1, 2, 3]:
+            for c in [0, 1, 2]:
+                # Shorter tables are padded with 0.
+                table = np.array([Random().randint(0, 2 ** n - 1) for i in range(0, 2 ** w - 1)] + [0])
+                circuit = table_lookup(w, n, [int(value) for value in table[:-1]], c)
+                self.assertEqual(circuit.num_qubits, c + w + n + table_lookup_ancillas(w, c))
+
+                register_c = list(range(0, c))
+                register_a = list(range(c, c + w))
+                register_t = list(range(c + w, c + w + n))
+                enabled = lambda ctrl: ctrl == 2 ** c - 1
+                verify_exhaustively(circuit, [register_c, register_a, register_t],
+                                    lambda ctrl, a, t: (ctrl, a, np.where(enabled(ctrl), t ^ table[a], t)))
+
+    def test_table_too_large(self):
+        with self.assertRaises(ValueError):
+            table_lookup(1, 2, [0, 4])
+
+    def test_window_size(self):
+        self.assertEqual(window_size(16, 10, 0), 4)
+        self.assertEqual(window_size(16, 2, 1), 2)
+        self.assertEqual(window_size(16, 2, 0, 2), 1)
+        self.assertEqual(window_size(16, 0, 1), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
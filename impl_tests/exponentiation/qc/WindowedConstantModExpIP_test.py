@@ -0,0 +1,54 @@
+import math
+import unittest
+from random import Random
+
+import numpy as np
+
+from api.CircuitChooser import CircuitChooser
+from api.CircuitNotSupportedError import CircuitNotSupportedError
+from api.NameFilters import custom_name_filter
+from impl.exponentiation.qc.modular.WindowedConstantModExpIP import WindowedConstantModExpIP
+from impl.util.classical_simulation import verify_exhaustively
+
+
+class WindowedConstantModExpIPTests(unittest.TestCase):
+
+    def setUp(self):
+        CircuitChooser().clear_caches()
+
+    def test_modular_exponentiation(self):
+        CircuitChooser()._name_filter = custom_name_filter(
+            {"TTKAdderIP", "BasicIncrementer", "BasicConstantAdderIP", "RNSLModularAdderIP", "HRSComparator",
+             "FullSubtractionComparator", "CDKMComparator"}
+        )
+        for p in [7, 11, 13]:
+            n = math.ceil(math.log2(p))
+            for c in [0, 1]:
+                for clean_anc_available in [2 * n + 2, 2 * n + 6]:
+                    a_value = Random().randint(1, p - 1)
+                    dirty_anc_available = 1
+
+                    constant_modexp = WindowedConstantModExpIP(dirty_anc_available, clean_anc_available, n, a_value,
+                                                               p, c)
+                    circuit = constant_modexp.get_circuit()
+
+                    powers = np.array([pow(a_value, x, p) for x in range(0, 2 ** n)])
+                    register_c = list(range(0, c))
+                    register_x = list(range(c, c + n))
+                    register_y = list(range(c + n, c + 2 * n))
+                    register_g = list(range(c + 2 * n, c + 2 * n + dirty_anc_available))
+                    verify_exhaustively(
+                        circuit, [register_c, register_x, register_y],
+                        lambda ctrl, x, y: (ctrl, x, np.where(ctrl == 2 ** c - 1, (y * powers[x]) % p, y)),
+                        domains=[range(0, 2 ** c), range(0, 2 ** n), range(0, p)], dirty=register_g, seed=0
+                    )
+
+    def test_not_supported(self):
+        with self.assertRaises(CircuitNotSupportedError):
+            WindowedConstantModExpIP(0, 2 * 4 + 4, 4, 3, 15, 0)
+        with self.assertRaises(CircuitNotSupportedError):
+            WindowedConstantModExpIP(0, 2 * 4 + 1, 4, 2, 13, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import math
+import unittest
+from random import Random
+
+import numpy as np
+
+from api.CircuitChooser import CircuitChooser
+from api.CircuitNotSupportedError import CircuitNotSupportedError
+from api.NameFilters import custom_name_filter
+from impl.multiplication.qc.modular.WindowedConstantModularMultiplierOOP import \
+    WindowedConstantModularMultiplierOOP
+from impl.util.classical_simulation import verify_exhaustively
+
+
+class WindowedConstantModularMultiplierOOPTests(unittest.TestCase):
+
+    def setUp(self):
+        CircuitChooser().clear_caches()
+
+    def test_constant_modular_multiplication(self):
+        CircuitChooser()._name_filter = custom_name_filter(
+            {"TTKAdderIP", "BasicIncrementer", "BasicConstantAdderIP", "RNSLModularAdderIP", "HRSComparator",
+             "FullSubtractionComparator", "CDKMComparator"}
+        )
+        for p in [7, 13, 29]:
+            n = math.ceil(math.log2(p))
+            for c in [0, 1]:
+                for clean_anc_available in [n + 1, n + 4]:
+                    a_value = Random().randint(0, p - 1)
+                    dirty_anc_available = 1
+
+                    multiplier = WindowedConstantModularMultiplierOOP(dirty_anc_available, clean_anc_available, n,
+                                                                      a_value, p, c)
+                    circuit = multiplier.get_circuit()
+
+                    register_c = list(range(0, c))
+                    register_x = list(range(c, c + n))
+                    register_r = list(range(c + n, c + 2 * n))
+                    register_g = list(range(c + 2 * n, c + 2 * n + dirty_anc_available))
+                    verify_exhaustively(circuit, [register_c, register_x, register_r],
+                                        lambda ctrl, x, r: (ctrl, x, np.where(ctrl == 2 ** c - 1, (a_value * x) % p, 0)),
+                                        domains=[range(0, 2 ** c), range(0, p), [0]], dirty=register_g, seed=0)
+
+    def test_window_size(self):
+        self.assertEqual(WindowedConstantModularMultiplierOOP(0, 16 + 1, 16, 3, 65521, 0).w, 2)
+        self.assertEqual(WindowedConstantModularMultiplierOOP(0, 16 + 3, 16, 3, 65521, 1).w, 3)
+        self.assertEqual(WindowedConstantModularMultiplierOOP(0, 16 + 8, 16, 3, 65521, 0).w, 4)
+        with self.assertRaises(CircuitNotSupportedError):
+            WindowedConstantModularMultiplierOOP(0, 16, 16, 3, 65521, 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,6 +8,7 @@ from api.CircuitChooser import CircuitChooser
 from api.NameFilters import custom_name_filter
 from impl.encoding.binary_encoding import binary_encoding
 from impl.multiplication.qc.modular.squaring.RNSLModularSquaringOOP import RNSLModularSquaringOOP
+from impl.util.classical_simulation import verify_exhaustively
 from impl_tests.testutil import execute_circuit
 
 
@@ -81,6 +82,23 @@ class RNSLModularSquaringOOPTests(unittest.TestCase):
                 self.assertEqual(key_value[0].split(" ")[0], "0" * len(register_anc))
                 self.assertEqual(key_value[1], 1024)
 
+    def test_controlled_modular_squaring(self):
+        CircuitChooser()._name_filter = custom_name_filter(
+            {"TTKAdderIP", "HRSIncrementer", "HRSConstantAdderIP", "HRSConstantModularAdderIP",
+             "RNSLModularAdderIP", "RNSLModularDoublerIP", "HRSComparator", "FullSubtractionComparator"}
+        )
+        for p in [7, 11]:
+            n = math.ceil(math.log2(p))
+            circuit = RNSLModularSquaringOOP(0, 2, n, p, 1).get_circuit()
+
+            # Registers: c, x, r, then the ancillas (which have to be clean again).
+            verify_exhaustively(
+                circuit,
+                [[0], list(range(1, n + 1)), list(range(n + 1, 2 * n + 1))],
+                lambda c, x, r: (c, x, c * ((x * x) % p)),
+                domains=[range(2), range(p), [0]]
+            )
+
 
 if __name__ == '__main__':
     unittest.main()
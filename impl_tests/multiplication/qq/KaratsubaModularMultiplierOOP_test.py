@@ -0,0 +1,62 @@
+import math
+import unittest
+
+from api.CircuitChooser import CircuitChooser
+from api.CircuitNotSupportedError import CircuitNotSupportedError
+from api.NameFilters import custom_name_filter
+from impl.multiplication.qq.modular.KaratsubaModularMultiplierOOP import KaratsubaModularMultiplierOOP, \
+    karatsuba_garbage
+from impl.util.classical_simulation import verify_exhaustively
+
+
+class KaratsubaModularMultiplierOOPTests(unittest.TestCase):
+
+    def setUp(self):
+        CircuitChooser().clear_caches()
+
+    def test_modular_multiplication(self):
+        CircuitChooser()._name_filter = custom_name_filter(
+            {"TTKAdderIP", "CDKMAdderIP", "BasicIncrementer", "BasicConstantAdderIP", "RNSLModularAdderIP",
+             "HRSComparator", "FullSubtractionComparator", "CDKMComparator"}
+        )
+        for p, cutoff in [(11, 3), (13, 8), (31, 3), (61, 3)]:
+            n = math.ceil(math.log2(p))
+            for c in [0, 1]:
+                dirty_anc_available = 1
+                clean_anc_available = 3 * n + n // 2 + 1 + karatsuba_garbage(n, cutoff) + 3
+
+                multiplier = KaratsubaModularMultiplierOOP(dirty_anc_available, clean_anc_available, n, p, c,
+                                                           cutoff)
+                circuit = multiplier.get_circuit()
+
+                # Registers: c, x, y, r, g, then the ancillas (which have to be clean again).
+                register_c = list(range(0, c))
+                register_x = list(range(c, c + n))
+                register_y = list(range(c + n, c + 2 * n))
+                register_r = list(range(c + 2 * n, c + 3 * n))
+                register_g = list(range(c + 3 * n, c + 3 * n + dirty_anc_available))
+                # All pairs (x, y) at once.
+                verify_exhaustively(
+                    circuit,
+                    [register_c, register_x, register_y, register_r],
+                    lambda ctrl, x, y, r: (ctrl, x, y, ((x * y) % p) * (ctrl == 2 ** c - 1)),
+                    domains=[range(2 ** c), range(p), range(p), [0]],
+                    dirty=register_g,
+                    seed=0
+                )
+
+    def test_garbage(self):
+        self.assertEqual(karatsuba_garbage(8, 8), 0)
+        # A, B, both sums and C, then the product of the sums of 3 bits recurses once more.
+        self.assertEqual(karatsuba_garbage(6, 3), 28 + 20)
+        self.assertLess(karatsuba_garbage(256, 16), 256 ** 2)
+
+    def test_requires_clean_ancillae(self):
+        with self.assertRaises(CircuitNotSupportedError):
+            KaratsubaModularMultiplierOOP(0, 3 * 16 + 9, 16, 65521, 0, 8)
+        with self.assertRaises(ValueError):
+            KaratsubaModularMultiplierOOP(0, 100, 4, 11, 0, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import math
+import unittest
+
+from api.CircuitChooser import CircuitChooser
+from api.CircuitNotSupportedError import CircuitNotSupportedError
+from api.NameFilters import custom_name_filter
+from impl.ec_point_addition.qc.RNSLECPointAdderIP import RNSLECPointAdderIP
+from impl.ec_point_addition.qc.WindowedECPointAdderIP import ec_add
+from impl.multiplication.qq.modular.MontgomeryModularMultiplierOOP import MontgomeryModularMultiplierOOP, \
+    to_montgomery_form, from_montgomery_form
+from impl.util.classical_simulation import verify_exhaustively
+
+
+class MontgomeryModularMultiplierOOPTests(unittest.TestCase):
+
+    def setUp(self):
+        CircuitChooser().clear_caches()
+
+    def test_montgomery_multiplication(self):
+        CircuitChooser()._name_filter = custom_name_filter(
+            {"TTKAdderIP", "CDKMAdderIP", "BasicIncrementer", "BasicConstantAdderIP", "HRSComparator",
+             "HRSConstantModularAdderIP", "HRSConstantModularMultiplierOOP"}
+        )
+        for p in [7, 11, 13, 29]:
+            n = math.ceil(math.log2(p))
+            for c in [0, 1]:
+                dirty_anc_available = c
+                clean_anc_available = 3 * n + 3 + c
+
+                circuit = MontgomeryModularMultiplierOOP(
+                    dirty_anc_available,
+                    clean_anc_available,
+                    n,
+                    p,
+                    c
+                ).get_circuit()
+
+                # Registers: c, x, y, r, g, then the ancillas (which have to be clean again).
+                register_c = list(range(0, c))
+                register_x = list(range(c, c + n))
+                register_y = list(range(c + n, c + 2 * n))
+                register_r = list(range(c + 2 * n, c + 3 * n))
+                register_g = list(range(c + 3 * n, c + 3 * n + dirty_anc_available))
+                # All pairs (x, y) at once.
+                verify_exhaustively(
+                    circuit,
+                    [register_c, register_x, register_y, register_r],
+                    lambda ctrl, x, y, r: (ctrl, x, y, ((x * y) % p) * (ctrl == 2 ** c - 1)),
+                    domains=[range(2 ** c), range(p), range(p), [0]],
+                    dirty=register_g,
+                    seed=0
+                )
+
+    def test_ec_point_addition(self):
+        # The point addition only gets the Montgomery multiplier.
+        CircuitChooser()._name_filter = custom_name_filter(
+            {"TTKAdderIP", "HRSIncrementer", "BasicConstantAdderIP",
+             "RNSLModularNegationIP", "HRSConstantModularAdderIP", "RNSLModularAdderIP",
+             "RNSLModularDoublerIP", "RNSLModularSquaringOOP", "HRSConstantModularMultiplierIP",
+             "HRSConstantModularMultiplierOOP", "FermatModularInversion", "MontgomeryModularMultiplierOOP",
+             "HRSComparator", "FullSubtractionComparator"
+             }
+        )
+        # (x^3 + 3) mod 7
+        p = 7
+        n = math.ceil(math.log2(p))
+        point = (6, 3)
+        # t and lambda, and the accumulator and constants of the multiplier.
+        ec_point_adder = RNSLECPointAdderIP(0, 2 * n + 3 * n + 3, n, point, p, 1)
+        circuit = ec_point_adder.get_circuit()
+        multipliers = {type(component) for key, component in CircuitChooser().decision_cache.items()
+                       if key[0] == "QQModMulOOP"}
+        self.assertEqual(multipliers, {MontgomeryModularMultiplierOOP})
+
+        for start in [(1, 5), (1, 2), (2, 2), (2, 5), (4, 5)]:
+            result = ec_add(start, point, 0, p)
+            verify_exhaustively(circuit, [[0], list(range(1, n + 1)), list(range(n + 1, 2 * n + 1))],
+                                lambda ctrl, x, y: (ctrl, x * (1 - ctrl) + result[0] * ctrl,
+                                                    y * (1 - ctrl) + result[1] * ctrl),
+                                domains=[[0, 1], [start[0]], [start[1]]])
+
+    def test_montgomery_form(self):
+        p = 29
+        n = math.ceil(math.log2(p))
+        for value in range(p):
+            self.assertEqual(from_montgomery_form(to_montgomery_form(value, n, p), n, p), value)
+        # The Montgomery product of the Montgomery forms is the Montgomery form of the product.
+        self.assertEqual(
+            (to_montgomery_form(5, n, p) * to_montgomery_form(7, n, p) * pow(2, -n, p)) % p,
+            to_montgomery_form(35 % p, n, p)
+        )
+
+    def test_requires_odd_modulus_and_accumulator(self):
+        with self.assertRaises(CircuitNotSupportedError):
+            MontgomeryModularMultiplierOOP(0, 20, 4, 10, 0)
+        with self.assertRaises(CircuitNotSupportedError):
+            MontgomeryModularMultiplierOOP(0, 3 * 4 + 2, 4, 11, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
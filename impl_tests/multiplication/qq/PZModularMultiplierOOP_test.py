@@ -1,14 +1,10 @@
 import math
 import unittest
-from random import Random
-
-from qiskit import QuantumRegister, QuantumCircuit, ClassicalRegister
 
 from api.CircuitChooser import CircuitChooser
 from api.NameFilters import custom_name_filter
-from impl.encoding.binary_encoding import binary_encoding
 from impl.multiplication.qq.modular.PZModularMultiplierOOP import PZModularMultiplierOOP
-from impl_tests.testutil import execute_circuit
+from impl.util.classical_simulation import verify_exhaustively
 
 
 class PZModularMultiplierOOPTests(unittest.TestCase):
@@ -26,66 +22,51 @@ class PZModularMultiplierOOPTests(unittest.TestCase):
         )
         for p in [7, 9, 11]:
             n = math.ceil(math.log2(p))
-            for i in range(0, 5):
-                # Init
-                x_value = Random().randint(0, p - 1)
-                y_value = Random().randint(0, p - 1)
-                dirty_anc_available = 0
-                clean_anc_available = 2
+            dirty_anc_available = 0
+            clean_anc_available = 2
+
+            circuit = PZModularMultiplierOOP(
+                dirty_anc_available,
+                clean_anc_available,
+                n,
+                p,
+                0
+            ).get_circuit()
 
-                constant_mod_adder = PZModularMultiplierOOP(
-                    dirty_anc_available,
-                    clean_anc_available,
-                    n,
-                    p,
-                    0
-                )
+            # Registers: x, y, r, then the ancillas (which have to be clean again).
+            register_x = list(range(0, n))
+            register_y = list(range(n, 2 * n))
+            register_r = list(range(2 * n, 3 * n))
 
-                # Circuit init
-                register_x = QuantumRegister(n, 'x')
-                register_y = QuantumRegister(n, 'y')
-                register_r = QuantumRegister(n, 'r')
-                register_g = QuantumRegister(dirty_anc_available, 'g')
-                register_anc = QuantumRegister(clean_anc_available, 'anc')
+            # All pairs (x, y) at once.
+            verify_exhaustively(
+                circuit,
+                [register_x, register_y, register_r],
+                lambda x, y, r: (x, y, (x * y) % p),
+                domains=[range(p), range(p), [0]]
+            )
 
-                classical_register_x = ClassicalRegister(len(register_x), 'cl_x')
-                classical_register_y = ClassicalRegister(len(register_y), 'cl_y')
-                classical_register_r = ClassicalRegister(len(register_x), 'cl_r')
-                classical_register_g = ClassicalRegister(len(register_g), 'cl_g')
-                classical_register_anc = ClassicalRegister(len(register_anc), 'cl_anc')
-                circuit = QuantumCircuit(register_x, register_y, register_r, register_g, register_anc,
-                                         classical_register_x, classical_register_y, classical_register_r,
-                                         classical_register_g, classical_register_anc)
-                # Encoding
-                circuit.append(binary_encoding(n, x_value), register_x)
-                circuit.append(binary_encoding(n, y_value), register_y)
-                # Operation
-                circuit.append(
-                    constant_mod_adder.get_circuit(),
-                    list(register_x) +
-                    list(register_y) +
-                    list(register_r) +
-                    list(register_g) +
-                    list(register_anc)
-                )
-                # Measurements
-                circuit.measure(register_x, classical_register_x)
-                circuit.measure(register_y, classical_register_y)
-                circuit.measure(register_r, classical_register_r)
-                circuit.measure(register_g, classical_register_g)
-                circuit.measure(register_anc, classical_register_anc)
+    def test_controlled_modular_multiplication(self):
+        CircuitChooser()._name_filter = custom_name_filter(
+            {"TTKAdderIP", "HRSIncrementer", "HRSConstantAdderIP", "HRSConstantModularAdderIP",
+             "RNSLModularAdderIP", "RNSLModularDoublerIP", "HRSComparator", "FullSubtractionComparator"}
+        )
+        for p in [7, 11]:
+            n = math.ceil(math.log2(p))
+            circuit = PZModularMultiplierOOP(0, 2, n, p, 1).get_circuit()
 
-                counts = execute_circuit(circuit).get_counts()
-                self.assertEqual(len(counts), 1)
-                # extract x
-                key_value = list(counts.items())[0]
+            # Registers: c, x, y, r, then the ancillas (which have to be clean again).
+            register_c = [0]
+            register_x = list(range(1, n + 1))
+            register_y = list(range(n + 1, 2 * n + 1))
+            register_r = list(range(2 * n + 1, 3 * n + 1))
 
-                self.assertEqual(key_value[0].split(" ")[0], "0" * len(register_anc))
-                self.assertEqual(key_value[0].split(" ")[1], "0" * len(register_g))
-                self.assertEqual(int(key_value[0].split(" ")[2], 2), (x_value * y_value) % p)
-                self.assertEqual(int(key_value[0].split(" ")[3], 2), y_value)
-                self.assertEqual(int(key_value[0].split(" ")[4], 2), x_value)
-                self.assertEqual(key_value[1], 1024)
+            verify_exhaustively(
+                circuit,
+                [register_c, register_x, register_y, register_r],
+                lambda c, x, y, r: (c, x, y, c * ((x * y) % p)),
+                domains=[range(2), range(p), range(p), [0]]
+            )
 
 
 if __name__ == '__main__':
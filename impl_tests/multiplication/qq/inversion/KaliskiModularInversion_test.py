@@ -0,0 +1,54 @@
+import math
+import unittest
+
+import numpy as np
+
+from api.CircuitChooser import CircuitChooser
+from api.CircuitNotSupportedError import CircuitNotSupportedError
+from api.NameFilters import custom_name_filter
+from impl.multiplication.qq.inversion.KaliskiModularInversion import KaliskiModularInversion
+from impl.util.classical_simulation import verify_exhaustively
+
+
+class KaliskiModularInversionTests(unittest.TestCase):
+
+    def setUp(self):
+        CircuitChooser().clear_caches()
+        CircuitChooser()._name_filter = custom_name_filter(
+            {"TTKAdderIP", "BasicIncrementer", "BasicConstantAdderIP", "CDKMComparator", "HRSComparator",
+             "RNSLModularNegationIP", "RNSLModularDoublerIP"}
+        )
+
+    def test_modular_inversion(self):
+        for p in [7, 11, 13, 17]:
+            n = math.ceil(math.log2(p))
+            for c in [0, 1]:
+                dirty_anc_available = 1
+                clean_anc_available = 12 * n + 5
+                modular_inverter = KaliskiModularInversion(dirty_anc_available, clean_anc_available, n, p, c)
+                circuit = modular_inverter.get_circuit()
+
+                register_c = list(range(0, c))
+                register_x = list(range(c, c + n))
+                register_r = list(range(c + n, c + 2 * n))
+                register_g = list(range(c + 2 * n, c + 2 * n + dirty_anc_available))
+                inverses = np.array([pow(x, -1, p) if x > 0 else 0 for x in range(0, p)])
+
+                if c == 0:
+                    verify_exhaustively(circuit, [register_x, register_r],
+                                        lambda x, r: (x, inverses[x]),
+                                        domains=[range(0, p), [0]], dirty=register_g, seed=0)
+                else:
+                    verify_exhaustively(circuit, [register_c, register_x, register_r],
+                                        lambda ctrl, x, r: (ctrl, x, inverses[x] * ctrl),
+                                        domains=[[0, 1], range(0, p), [0]], dirty=register_g, seed=0)
+
+    def test_not_supported(self):
+        with self.assertRaises(CircuitNotSupportedError):
+            KaliskiModularInversion(0, 12 * 4 + 4, 4, 12, 0)
+        with self.assertRaises(CircuitNotSupportedError):
+            KaliskiModularInversion(0, 12 * 4 + 4, 4, 13, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+
+from qiskit import QuantumCircuit
+
+import resource_estimation.automatic_optimisation as automatic_optimisation
+from resource_estimation.automatic_optimisation import auto_opt, configure_pass_manager, get_backend, \
+    get_pass_manager, get_pass_manager_configuration
+
+
+class AutomaticOptimisationTests(unittest.TestCase):
+
+    def setUp(self):
+        configuration = get_pass_manager_configuration()
+        self.addCleanup(configure_pass_manager, **configuration)
+
+    def test_backend_is_built_once(self):
+        backend = get_backend()
+        self.assertIsNotNone(backend)
+        self.assertIs(get_backend(), backend)
+        # Changing the pass manager does not rebuild the backend.
+        configure_pass_manager(optimization_level=1)
+        self.assertIs(get_backend(), backend)
+
+    def test_configure_invalidates_pass_manager(self):
+        pass_manager = get_pass_manager()
+        self.assertIs(get_pass_manager(), pass_manager)
+
+        configure_pass_manager(basis_gates=['u', 'cx'])
+        self.assertIsNone(automatic_optimisation._pass_manager)
+        self.assertIsNot(get_pass_manager(), pass_manager)
+        self.assertEqual(get_pass_manager_configuration()["basis_gates"], ['u', 'cx'])
+
+        circuit = QuantumCircuit(3)
+        circuit.h(0)
+        circuit.ccx(0, 1, 2)
+        self.assertLessEqual(set(auto_opt(circuit).count_ops().keys()), {'u', 'cx'})
+
+    def test_invalid_optimization_level(self):
+        pass_manager = get_pass_manager()
+        with self.assertRaises(ValueError):
+            configure_pass_manager(optimization_level=4)
+        self.assertIs(get_pass_manager(), pass_manager)
+
+
+if __name__ == '__main__':
+    unittest.main()
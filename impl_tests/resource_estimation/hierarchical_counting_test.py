@@ -0,0 +1,75 @@
+import unittest
+from unittest import mock
+
+from qiskit import QuantumCircuit
+
+import resource_estimation.hierarchical_counting as hierarchical_counting
+from api.CircuitChooser import CircuitChooser
+from api.Metrics import metric_bundle_circuit
+from api.NameFilters import custom_name_filter
+from impl.classical_ec.elliptic_curves import get_curve, point_doubling
+from impl.shors.Shors_ECDLP import shors_ecdlp
+from resource_estimation.automatic_optimisation import configure_pass_manager, get_pass_manager_configuration
+from resource_estimation.hierarchical_counting import hierarchical_resources
+
+
+class HierarchicalCountingTests(unittest.TestCase):
+
+    def setUp(self):
+        chooser = CircuitChooser()
+        chooser.clear_caches()
+        self.addCleanup(setattr, chooser, "_name_filter", chooser._name_filter)
+        # Without optimisation the transpiled blocks do not depend on their surroundings.
+        configuration = get_pass_manager_configuration()
+        self.addCleanup(chooser.configure_pass_manager, **configuration)
+        chooser.configure_pass_manager(optimization_level=0)
+
+    def test_repeated_block_walked_once(self):
+        block = QuantumCircuit(3, name="block")
+        block.ccx(0, 1, 2)
+        block.cx(2, 0)
+        block.h(1)
+        block_instruction = block.to_instruction()
+        circuit = QuantumCircuit(5)
+        for i in range(0, 10):
+            circuit.append(block_instruction, [i % 3, i % 3 + 1, i % 3 + 2])
+
+        with mock.patch.object(hierarchical_counting, "_block_resources",
+                               wraps=hierarchical_counting._block_resources) as block_resources:
+            resources = hierarchical_resources(circuit)
+        walked = [call.args[0] for call in block_resources.call_args_list]
+        self.assertEqual(len(walked), 2)
+        self.assertIs(walked[1], block_instruction.definition)
+
+        flat = metric_bundle_circuit(circuit)
+        self.assertEqual(resources["gate_count"], flat["gate_count"])
+        self.assertEqual(resources["cz_count"], flat["cz_count"])
+
+    def test_ecdlp_totals(self):
+        CircuitChooser()._name_filter = custom_name_filter(
+            {"TTKAdderIP", "HRSIncrementer", "BasicConstantAdderIP",
+             "RNSLModularNegationIP", "HRSConstantModularAdderIP", "RNSLModularAdderIP",
+             "RNSLModularDoublerIP", "RNSLModularSquaringOOP", "HRSConstantModularMultiplierIP",
+             "HRSConstantModularMultiplierOOP", "FermatModularInversion", "PZModularMultiplierOOP",
+             "HRSComparator", "FullSubtractionComparator", "RNSLECPointAdderIP"
+             }
+        )
+        # (x^3 + 3) mod 7
+        p = 7
+        curve = get_curve(0, 3, p)
+        points = ([point_doubling(curve, (1, 5), 2 ** i) for i in range(0, 4)] +
+                  [point_doubling(curve, (2, 2), 2 ** i) for i in range(0, 4)])
+        circuit = shors_ecdlp(points, p, with_modular_inversion=False)
+
+        resources = hierarchical_resources(circuit)
+        flat = metric_bundle_circuit(circuit)
+        # Multi-controlled gates are synthesized with the idle qubits of their surroundings, so the
+        # blocks are not exactly the same as in the flattened circuit.
+        for key in ["gate_count", "gate_depth", "cz_count", "cz_depth"]:
+            self.assertLess(abs(resources[key] - flat[key]), 0.15 * flat[key], key)
+        self.assertEqual(resources["count_ops"]["measure"], 2 * 3 + 2)
+        self.assertEqual(resources["gate_count"], sum(resources["count_ops"].values()))
+
+
+if __name__ == '__main__':
+    unittest.main()
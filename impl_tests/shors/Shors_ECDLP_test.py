@@ -0,0 +1,76 @@
+import unittest
+
+from api.CircuitChooser import CircuitChooser
+from api.NameFilters import custom_name_filter
+from impl.classical_ec.elliptic_curves import get_curve, point_doubling
+from impl.ec_point_addition.qc.WindowedECPointAdderIP import WindowedECPointAdderIP
+from impl.multiplication.qq.inversion.FermatModularInversion import FermatModularInversion
+from impl.multiplication.qq.inversion.KaliskiModularInversion import KaliskiModularInversion
+from impl.shors.Shors_ECDLP import shors_ecdlp
+
+component_names = {"TTKAdderIP", "HRSIncrementer", "BasicConstantAdderIP",
+                   "RNSLModularNegationIP", "HRSConstantModularAdderIP", "RNSLModularAdderIP",
+                   "RNSLModularDoublerIP", "RNSLModularSquaringOOP", "HRSConstantModularMultiplierIP",
+                   "HRSConstantModularMultiplierOOP", "PZModularMultiplierOOP",
+                   "HRSComparator", "FullSubtractionComparator", "CDKMComparator", "BasicIncrementer",
+                   "RNSLECPointAdderIP"}
+
+
+class ShorsECDLPTests(unittest.TestCase):
+
+    def setUp(self):
+        chooser = CircuitChooser()
+        chooser.clear_caches()
+        self.addCleanup(setattr, chooser, "_name_filter", chooser._name_filter)
+        # (x^3 + 3) mod 7
+        self.p = 7
+        curve = get_curve(0, 3, self.p)
+        self.points = ([point_doubling(curve, (1, 5), 2 ** i) for i in range(0, 4)] +
+                       [point_doubling(curve, (2, 2), 2 ** i) for i in range(0, 4)])
+
+    def _inverters(self) -> set[type]:
+        return {type(component) for key, component in CircuitChooser().decision_cache.items()
+                if key[0] == "QQModInversionOOP"}
+
+    def test_kaliski_inversion(self):
+        CircuitChooser()._name_filter = custom_name_filter(component_names | {"KaliskiModularInversion"})
+        n = 3
+        circuit = shors_ecdlp(self.points, self.p, with_modular_inversion=True, reserve_inversion_ancillas=True)
+        # Control, point and the ancillas of the point addition and Kaliski's inversion.
+        self.assertEqual(circuit.num_qubits, 1 + 2 * n + 2 * n + 12 * n + 5)
+        self.assertEqual(self._inverters(), {KaliskiModularInversion})
+
+    def test_simulatable_inversion(self):
+        CircuitChooser()._name_filter = custom_name_filter(component_names | {"FermatModularInversion",
+                                                                              "KaliskiModularInversion"})
+        n = 3
+        # Without the ancillas of Kaliski's inversion, the circuit keeps its width.
+        circuit = shors_ecdlp(self.points, self.p, with_modular_inversion=True)
+        self.assertEqual(circuit.num_qubits, 1 + 2 * n + 2 * n + 2)
+        self.assertEqual(self._inverters(), {FermatModularInversion})
+
+    def test_max_qubits(self):
+        CircuitChooser()._name_filter = custom_name_filter(component_names | {"FermatModularInversion"})
+        n = 3
+        # The extra qubits are cut to the limit, the required ones raise.
+        circuit = shors_ecdlp(self.points, self.p, with_modular_inversion=True, extra_qubits=100, max_qubits=28)
+        self.assertEqual(circuit.num_qubits, 28)
+        with self.assertRaises(ValueError):
+            shors_ecdlp(self.points, self.p, with_modular_inversion=True, reserve_inversion_ancillas=True,
+                        max_qubits=28)
+
+    def test_windowed_point_addition(self):
+        CircuitChooser()._name_filter = custom_name_filter(component_names | {"FermatModularInversion",
+                                                                              "WindowedECPointAdderIP"})
+        # 2n + 2 = 8 exponent qubits in windows of 3, 3 and 2.
+        shors_ecdlp(self.points, self.p, with_modular_inversion=False, window_size=3)
+        adders = [component for key, component in CircuitChooser().decision_cache.items()
+                  if key[0] == "QCWindowedECPointAdderIP"]
+        self.assertTrue(all(isinstance(adder, WindowedECPointAdderIP) for adder in adders))
+        self.assertEqual([adder.ec_points for adder in adders],
+                         [tuple(self.points[0:3]), tuple(self.points[3:6]), tuple(self.points[6:8])])
+        self.assertNotIn("QCECPointAdderIP", [key[0] for key in CircuitChooser().decision_cache])
+
+
+if __name__ == '__main__':
+    unittest.main()
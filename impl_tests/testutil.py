@@ -3,6 +3,8 @@ from qiskit import QuantumCircuit
 from qiskit.transpiler.preset_passmanagers import generate_preset_pass_manager
 from qiskit_aer import AerSimulator
 
+from impl.util.classical_simulation import simulate_classical
+
 caches = set()
 
 
@@ -36,4 +38,17 @@ def num_non_idle_qubits(qc: QuantumCircuit):
     for gate in qc.data:
         for qubit in gate.qubits:
             gate_count[qubit] = True
-    return list(gate_count.values()).count(True)
\ No newline at end of file
+    return list(gate_count.values()).count(True)
+
+def execute_circuit_classically(circuit: QuantumCircuit, shots=1024) -> dict[str, int]:
+    """
+    Drop-in for execute_circuit(circuit).get_counts() on reversible classical circuits (see classical_simulation.py),
+    the circuit must start in the all-zero state and all shots have the same outcome.
+    """
+    _, clbit_state = simulate_classical(circuit)
+    bits = bin(clbit_state)[2:].zfill(circuit.num_clbits)[::-1]
+    key = " ".join(
+        "".join(bits[circuit.find_bit(clbit).index] for clbit in reversed(register))
+        for register in reversed(circuit.cregs)
+    )
+    return {key: shots}
@@ -0,0 +1,168 @@
+import unittest
+from random import Random
+
+import numpy as np
+from qiskit import QuantumRegister, QuantumCircuit, ClassicalRegister
+from qiskit.quantum_info import Statevector
+
+from api.CircuitChooser import CircuitChooser
+from impl.addition.qq.TTKAdderIP import TTKAdderIP
+from impl.encoding.binary_encoding import binary_encoding
+from impl.util.classical_simulation import simulate_classical, compile_classical, simulate_classical_batch, \
+    pack_registers, unpack_register, verify_exhaustively
+from impl_tests.testutil import execute_circuit, execute_circuit_classically
+
+
+def simulate_statevector(circuit: QuantumCircuit, qubit_state: int) -> int:
+    prepared = QuantumCircuit(circuit.num_qubits)
+    for i in range(circuit.num_qubits):
+        if (qubit_state >> i) & 1:
+            prepared.x(i)
+    prepared.append(circuit, range(circuit.num_qubits))
+    return int(np.argmax(np.abs(Statevector(prepared).data)))
+
+
+class ClassicalSimulationTests(unittest.TestCase):
+
+    def setUp(self):
+        CircuitChooser().clear_caches()
+
+    def test_random_permutation_circuits(self):
+        random = Random()
+        n = 6
+        for i in range(0, 10):
+            inner = QuantumCircuit(n)
+            for j in range(0, 20):
+                qubits = random.sample(range(n), random.randint(1, 4))
+                if random.randint(0, 3) == 0 and len(qubits) >= 3:
+                    inner.cswap(qubits[0], qubits[1], qubits[2])
+                elif random.randint(0, 3) == 0 and len(qubits) == 2:
+                    inner.swap(qubits[0], qubits[1])
+                elif len(qubits) == 1:
+                    inner.x(qubits[0])
+                else:
+                    inner.mcx(qubits[:-1], qubits[-1], ctrl_state=random.randint(0, 2 ** (len(qubits) - 1) - 1))
+            # Nested, controlled and reversed blocks.
+            circuit = QuantumCircuit(n + 1)
+            circuit.append(inner.to_gate(), range(n))
+            circuit.append(inner.control(1), [n] + list(range(n)))
+            circuit.append(inner.control(1).reverse_ops(), [n] + list(range(n)))
+            circuit.append(inner.inverse(), range(n))
+
+            for k in range(0, 5):
+                qubit_state = random.randint(0, 2 ** (n + 1) - 1)
+                self.assertEqual(simulate_classical(circuit, qubit_state)[0],
+                                 simulate_statevector(circuit, qubit_state))
+
+    def test_controlled_reversed_blocks(self):
+        # Increments a 2-bit register, which is not self-inverse.
+        increment = QuantumCircuit(2, name="increment")
+        increment.cx(0, 1)
+        increment.x(0)
+        decrement = increment.reverse_ops()
+        self.assertEqual(decrement.name, "increment_reverse")
+
+        blocks = [
+            (increment.control(1), 1, 1),
+            (increment.control(1).reverse_ops(), 1, -1),
+            # The base gate comes from a reversed circuit, only the controlled gate may be reversed.
+            (decrement.control(1), 1, -1),
+            (decrement.control(1).reverse_ops(), 1, 1),
+            (decrement.control(1).reverse_ops().reverse_ops(), 1, -1),
+            (decrement.control(1, ctrl_state=0).reverse_ops(), 0, 1),
+        ]
+        for block, ctrl_state, step in blocks:
+            circuit = QuantumCircuit(3)
+            circuit.append(block, [2, 0, 1])
+            for x in range(0, 4):
+                for control in range(0, 2):
+                    active = control == ctrl_state
+                    expected = ((x + step * active) % 4) | (control << 2)
+                    self.assertEqual(simulate_classical(circuit, x | (control << 2))[0], expected)
+                    self.assertEqual(simulate_statevector(circuit, x | (control << 2)), expected)
+
+    def test_large_controlled_addition(self):
+        # 2n + 1 = 129 qubits, far beyond a statevector simulation.
+        n = 64
+        operations = compile_classical(TTKAdderIP(0, 0, n, 1, False, False).get_circuit())
+        for i in range(0, 10):
+            control = Random().randint(0, 1)
+            x_value = Random().randint(0, 2 ** n - 1)
+            y_value = Random().randint(0, 2 ** n - 1)
+
+            state, _ = simulate_classical(operations, control | (x_value << 1) | (y_value << (n + 1)))
+
+            self.assertEqual(state & 1, control)
+            self.assertEqual((state >> 1) & (2 ** n - 1), x_value)
+            self.assertEqual(state >> (n + 1), (x_value * control + y_value) % 2 ** n)
+
+    def test_counts_match_execute_circuit(self):
+        n = 4
+        x_value = Random().randint(0, 2 ** n - 1)
+        register_x = QuantumRegister(n, 'x')
+        register_y = QuantumRegister(n, 'y')
+        classical_register_x = ClassicalRegister(n, 'cl_x')
+        classical_register_y = ClassicalRegister(n, 'cl_y')
+        classical_register_anc = ClassicalRegister(0, 'cl_anc')
+        circuit = QuantumCircuit(register_x, register_y, classical_register_x, classical_register_y,
+                                 classical_register_anc)
+        circuit.append(binary_encoding(n, x_value), register_x)
+        circuit.append(TTKAdderIP(0, 0, n, 0, False, False).get_circuit(), list(register_x) + list(register_y))
+        circuit.measure(register_x, classical_register_x)
+        circuit.measure(register_y, classical_register_y)
+
+        self.assertEqual(execute_circuit_classically(circuit), execute_circuit(circuit).get_counts())
+
+    def test_batch_matches_single_simulation(self):
+        n = 8
+        operations = compile_classical(TTKAdderIP(0, 0, n, 1, False, True).get_circuit())
+        num_qubits = 2 * n + 2
+        qubit_states = np.array([Random().randint(0, 2 ** num_qubits - 1) for i in range(0, 100)], dtype=np.uint64)
+
+        output_planes = simulate_classical_batch(operations, pack_registers(num_qubits, [list(range(num_qubits))],
+                                                                            [qubit_states]))
+
+        self.assertEqual(
+            list(unpack_register(output_planes, list(range(num_qubits)), len(qubit_states))),
+            [simulate_classical(operations, int(qubit_state))[0] for qubit_state in qubit_states]
+        )
+
+    def test_verify_exhaustively(self):
+        n = 4
+        circuit = TTKAdderIP(0, 0, n, 0, False, False).get_circuit()
+        register_x = list(range(0, n))
+        register_y = list(range(n, 2 * n))
+
+        self.assertEqual(verify_exhaustively(circuit, [register_x, register_y],
+                                             lambda x, y: (x, (x + y) % 2 ** n)), 2 ** (2 * n))
+        with self.assertRaises(AssertionError):
+            verify_exhaustively(circuit, [register_x, register_y], lambda x, y: (x, (x - y) % 2 ** n))
+
+    def test_verify_exhaustively_64_bit_register(self):
+        # Flips the most significant bit, i.e. adds 2^63 mod 2^64.
+        circuit = QuantumCircuit(64)
+        circuit.x(63)
+        domain = [0, 1, 2 ** 63 - 1, 2 ** 63, 2 ** 64 - 1]
+        self.assertEqual(verify_exhaustively(circuit, [list(range(0, 64))], lambda x: ((x + 2 ** 63) % 2 ** 64,),
+                                             domains=[domain]), len(domain))
+        with self.assertRaises(AssertionError):
+            verify_exhaustively(circuit, [list(range(0, 64))], lambda x: (x,), domains=[domain])
+
+    def test_verify_exhaustively_32_bit_product(self):
+        # The product of two 32-bit values does not fit into int64, the reference gets Python ints.
+        circuit = QuantumCircuit(64)
+        domain = [0, 1, 2 ** 31, 2 ** 32 - 1]
+        self.assertEqual(verify_exhaustively(circuit, [list(range(0, 32)), list(range(32, 64))],
+                                             lambda x, y: (x, y + (x * y) // 2 ** 64),
+                                             domains=[domain, domain]), len(domain) ** 2)
+
+    def test_non_classical_gate(self):
+        circuit = QuantumCircuit(2)
+        circuit.x(0)
+        circuit.h(1)
+        with self.assertRaises(ValueError):
+            simulate_classical(circuit)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+from random import Random
+
+from qiskit import QuantumCircuit, QuantumRegister
+from qiskit.quantum_info import Operator
+
+from api.CircuitChooser import CircuitChooser
+from api.CostModel import validate_cost_model
+from impl.addition.qc.incrementer.BasicIncrementer import BasicIncrementer
+from impl.addition.qc.incrementer.HRSIncrementer import HRSIncrementer
+from impl.addition.qq.CDKMAdderIP import CDKMAdderIP
+from impl.addition.qq.TTKAdderIP import TTKAdderIP
+from impl.util.classical_simulation import simulate_classical
+from impl.util.controlled_circuit import controlled_circuit
+
+
+class ControlledCircuitTests(unittest.TestCase):
+
+    def setUp(self):
+        CircuitChooser().clear_caches()
+
+    def test_random_circuits(self):
+        random = Random()
+        n = 5
+        for i in range(0, 5):
+            inner = QuantumCircuit(n)
+            for j in range(0, 15):
+                qubits = random.sample(range(n), random.randint(1, 3))
+                if len(qubits) == 3 and random.randint(0, 2) == 0:
+                    inner.cswap(qubits[0], qubits[1], qubits[2])
+                elif len(qubits) == 2 and random.randint(0, 2) == 0:
+                    inner.swap(qubits[0], qubits[1])
+                elif len(qubits) == 1:
+                    inner.x(qubits[0])
+                else:
+                    inner.mcx(qubits[:-1], qubits[-1], ctrl_state=random.randint(0, 2 ** (len(qubits) - 1) - 1))
+            # Nested blocks and a gate which is not classical.
+            register_q = QuantumRegister(n, 'q')
+            circuit = QuantumCircuit(register_q)
+            circuit.append(inner.to_gate(), register_q)
+            circuit.h(register_q[0])
+            circuit.append(inner.to_gate(), register_q)
+
+            for c in range(1, 3):
+                register_c = QuantumRegister(c, 'c')
+                controlled = controlled_circuit(circuit, register_c)
+                self.assertTrue(controlled.has_register(register_q))
+                self.assertTrue(Operator(controlled).equiv(Operator(circuit.control(c))))
+
+    def test_controlled_components(self):
+        for n in range(1, 6):
+            for c in range(1, 3):
+                for overflow_qubit in [False, True]:
+                    for component in [TTKAdderIP(0, 0, n, c, False, overflow_qubit),
+                                      CDKMAdderIP(0, 1, n, c, False, overflow_qubit),
+                                      BasicIncrementer(0, 0, n, 0, c, overflow_qubit),
+                                      HRSIncrementer(n, 0, n, 0, c, overflow_qubit)]:
+                        model, counted = validate_cost_model(component)
+                        self.assertEqual(model, counted)
+
+    def test_controlled_addition(self):
+        n = 6
+        for i in range(0, 10):
+            c = Random().randint(1, 2)
+            control = Random().randint(0, 2 ** c - 1)
+            x_value = Random().randint(0, 2 ** n - 1)
+            y_value = Random().randint(0, 2 ** n - 1)
+            for component in [TTKAdderIP(0, 0, n, c, False, False), CDKMAdderIP(0, 1, n, c, False, False)]:
+                state, _ = simulate_classical(component.get_circuit(),
+                                              control | (x_value << c) | (y_value << (n + c)))
+                active = control == 2 ** c - 1
+                self.assertEqual(state & (2 ** c - 1), control)
+                self.assertEqual((state >> c) & (2 ** n - 1), x_value)
+                self.assertEqual((state >> (n + c)) & (2 ** n - 1), (x_value * active + y_value) % 2 ** n)
+                self.assertEqual(state >> (2 * n + c), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+
+from qiskit import QuantumCircuit
+
+from api.CircuitChooser import CircuitChooser
+from api.Metrics import toffoli_count_metric
+from api.NameFilters import custom_name_filter
+from impl.addition.qc.HRSConstantAdderIP import HRSConstantAdderIP
+from impl.addition.qc.incrementer.GidneyIncrementer import GidneyIncrementer
+from impl.addition.qc.incrementer.HRSIncrementer import HRSIncrementer
+from impl.util.dirty_ancilla_check import check_ancilla_restoration, check_registry
+
+
+class CorruptingIncrementer(HRSIncrementer):
+    """
+    HRSIncrementer which leaves a copy of x[0] in its first borrowed qubit.
+    """
+
+    def get_circuit(self, *args) -> QuantumCircuit:
+        circuit = super().get_circuit().copy()
+        circuit.cx(self.register_x[0], self.register_g[0])
+        return circuit
+
+
+class WidenedIncrementer(HRSIncrementer):
+    """
+    HRSIncrementer whose circuit has an extra qubit, so its registers cannot be located.
+    """
+
+    def get_circuit(self, *args) -> QuantumCircuit:
+        incrementer = super().get_circuit()
+        circuit = QuantumCircuit(incrementer.num_qubits + 1)
+        circuit.append(incrementer, range(0, incrementer.num_qubits))
+        return circuit
+
+
+class ClassicalNameFilter:
+    """
+    Name filter without the rotation based adders, which are not classical circuits.
+    Otherwise they are chosen for their Toffoli count and the components using them cannot be checked.
+    """
+
+    def __call__(self, name: str) -> bool:
+        return name not in {"DraperAdderIP", "OTUSAdderIP", "BeauregardConstantAdderIP"}
+
+
+class DirtyAncillaCheckTests(unittest.TestCase):
+
+    def setUp(self):
+        chooser = CircuitChooser()
+        chooser.clear_caches()
+        self.addCleanup(setattr, chooser, "_metric", chooser._metric)
+        self.addCleanup(setattr, chooser, "_name_filter", chooser._name_filter)
+
+    def test_restoring_components(self):
+        CircuitChooser()._name_filter = custom_name_filter({"TTKAdderIP", "GidneyIncrementer", "HRSIncrementer"})
+        n = 32
+        for c in [0, 1]:
+            self.assertEqual(check_ancilla_restoration(GidneyIncrementer(n + 1, 0, n, 0, c)), [])
+            self.assertEqual(check_ancilla_restoration(HRSIncrementer(n, 0, n, 0, c)), [])
+            self.assertEqual(check_ancilla_restoration(HRSConstantAdderIP(1, 0, n, 2 ** n - 3, c)), [])
+
+    def test_corrupting_component(self):
+        n = 8
+        problems = check_ancilla_restoration(CorruptingIncrementer(n, 0, n))
+        self.assertEqual(len(problems), 1)
+        self.assertTrue(problems[0].startswith("borrowed qubit g[0]"))
+
+    def test_check_registry(self):
+        CircuitChooser()._metric = toffoli_count_metric
+        CircuitChooser()._name_filter = ClassicalNameFilter()
+        # Every circuit type at a small size, the multipliers take too long to build at n = 32.
+        self.assertEqual(check_registry([4], seed=0), {})
+
+        self.assertEqual(check_registry([8, 16, 32], circuit_types=["QCIncrementer", "QCAdderIP", "QQAdderIP",
+                                                                    "QCComparator", "QQComparator",
+                                                                    "QCModularNegationIP", "QCModDoublerIP"],
+                                        seed=0), {})
+
+    def test_check_registry_reports_unlocatable_registers(self):
+        chooser = CircuitChooser()
+        chooser._metric = toffoli_count_metric
+        self.addCleanup(chooser.registry.__setitem__, "QCIncrementer", list(chooser.registry["QCIncrementer"]))
+        chooser.registry["QCIncrementer"] = [WidenedIncrementer]
+
+        failures = check_registry([4], ancilla_budgets=[(4, 0)], circuit_types=["QCIncrementer"], c_values=[0], seed=0)
+        self.assertEqual(list(failures.keys()), [("QCIncrementer", "WidenedIncrementer", (4, 0, 0), 4, 0)])
+        self.assertTrue(failures[("QCIncrementer", "WidenedIncrementer", (4, 0, 0), 4, 0)][0]
+                        .startswith("checking the circuit failed with ValueError: Cannot locate the registers"))
+
+if __name__ == '__main__':
+    unittest.main()
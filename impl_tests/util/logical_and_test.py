@@ -0,0 +1,40 @@
+import unittest
+
+from qiskit import QuantumCircuit
+from qiskit.quantum_info import Operator, Statevector
+
+from api.CostModel import logical_cost_circuit
+from impl.util.classical_simulation import simulate_classical
+from impl.util.logical_and import LogicalAndGate, LogicalAndUncomputeGate
+
+
+class LogicalAndTests(unittest.TestCase):
+
+    def test_compute(self):
+        circuit = QuantumCircuit(3)
+        circuit.append(LogicalAndGate(), [0, 1, 2])
+        for a in range(0, 2):
+            for b in range(0, 2):
+                state = Statevector.from_int(a | (b << 1), 8).evolve(circuit)
+                self.assertAlmostEqual(abs(state.data[a | (b << 1) | ((a & b) << 2)]), 1)
+                self.assertEqual(simulate_classical(circuit, a | (b << 1))[0], a | (b << 1) | ((a & b) << 2))
+
+    def test_uncompute(self):
+        circuit = QuantumCircuit(3)
+        circuit.append(LogicalAndGate(), [0, 1, 2])
+        circuit.append(LogicalAndUncomputeGate(), [0, 1, 2])
+        self.assertTrue(Operator(circuit).equiv(Operator(QuantumCircuit(3))))
+        # Reversing turns the compute into the uncompute.
+        self.assertEqual([instruction.operation.name for instruction in circuit.reverse_ops().data],
+                         ["logical_and", "logical_and_dg"])
+        self.assertTrue(Operator(circuit.reverse_ops()).equiv(Operator(QuantumCircuit(3))))
+
+    def test_logical_cost(self):
+        circuit = QuantumCircuit(3)
+        circuit.append(LogicalAndGate(), [0, 1, 2])
+        circuit.append(LogicalAndUncomputeGate(), [0, 1, 2])
+        self.assertEqual(+logical_cost_circuit(circuit), {2: 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import math
+import unittest
+from random import Random
+
+from impl.util.modular_inversion_coefficients import get_coeffs, get_coeffs_by_expansion, multinomial, \
+    multinomial_mod, binomial_mod, iter_coeffs, coefficient_sparsity
+
+
+class ModularInversionCoefficientsTests(unittest.TestCase):
+
+    def test_matches_expansion(self):
+        for p in [7, 11, 13, 17, 19]:
+            for remove_larger_subsets in [False, True]:
+                self.assertEqual(list(get_coeffs(p, remove_larger_subsets).items()),
+                                 list(get_coeffs_by_expansion(p, remove_larger_subsets).items()))
+
+    def test_polynomial_inverts(self):
+        for p in [7, 31, 251, 1021, 65521]:
+            n = math.ceil(math.log2(p))
+            coeffs = get_coeffs(p, remove_larger_subsets=True)
+            self.assertTrue(all(sum(1 << j for j in subset) < p and max(subset) < n for subset in coeffs))
+            for i in range(0, 20):
+                x_value = Random().randint(1, p - 1)
+                value = sum(coeff for subset, coeff in coeffs.items()
+                            if all((x_value >> j) & 1 for j in subset)) % p
+                self.assertEqual(value, pow(x_value, -1, p))
+
+    def test_nonzero_stream(self):
+        for p in [7, 31, 251, 1021]:
+            nonzero = [(subset, coeff) for subset, coeff in get_coeffs(p, remove_larger_subsets=True).items()
+                       if coeff != 0]
+            self.assertEqual(list(iter_coeffs(p, remove_larger_subsets=True, skip_zero=True)), nonzero)
+            sparsity = coefficient_sparsity(p)
+            self.assertEqual(sparsity["nonzero"], len(nonzero))
+            self.assertEqual(sparsity["subsets"], p - 1)
+        # x^5 mod 7 has only 3 non-zero coefficients of the 6 subsets.
+        self.assertEqual(coefficient_sparsity(7)["density"], 0.5)
+
+    def test_exact_multinomials(self):
+        for p in [2, 3, 7, 13, 101]:
+            for i in range(0, 50):
+                params = [Random().randint(0, 3 * p) for j in range(0, Random().randint(1, 4))]
+                self.assertEqual(multinomial_mod(params, p), multinomial(params) % p)
+                n = Random().randint(0, 10 * p)
+                k = Random().randint(0, n)
+                self.assertEqual(binomial_mod(n, k, p), math.comb(n, k) % p)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,14 +1,65 @@
 from qiskit import QuantumCircuit, generate_preset_pass_manager
-from qiskit_aer import AerSimulator
 
-backend = AerSimulator()
+# Configuration of the pass manager used by auto_opt, see configure_pass_manager.
+_configuration = {
+    "basis_gates": ['rx', 'ry', 'rz', 'cz'],  # Universal gate-set: rotational.
+    "optimization_level": 3,
+    "seed": None,
+}
+
+# Built on first use, as constructing them is slow and many callers never transpile anything.
+_backend = None
+_pass_manager = None
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        from qiskit_aer import AerSimulator
+        _backend = AerSimulator()
+    return _backend
+
+
+def get_pass_manager():
+    global _pass_manager
+    if _pass_manager is None:
+        _pass_manager = generate_preset_pass_manager(
+            optimization_level=_configuration["optimization_level"],
+            basis_gates=_configuration["basis_gates"],
+            # approximation_degree=0.99, # Uncomment for approximation.
+            backend=get_backend(),
+            seed_transpiler=_configuration["seed"],
+        )
+    return _pass_manager
+
+
+def get_pass_manager_configuration() -> dict:
+    """
+    :return: Copy of the current configuration, can be passed to configure_pass_manager (e.g. in another process).
+    """
+    return {key: (list(value) if isinstance(value, list) else value) for key, value in _configuration.items()}
+
+
+def configure_pass_manager(basis_gates: list[str] = None, optimization_level: int = None, seed: int = None):
+    """
+    Changes the configuration of the pass manager used by auto_opt, it is rebuilt on its next use.
+    Metric values computed with the previous configuration are not invalidated here,
+    use CircuitChooser().configure_pass_manager to also clear those.
+    :param basis_gates: Basis gates to transpile to, None to keep the current ones.
+    :param optimization_level: Preset optimization level (0 to 3), None to keep the current one.
+    :param seed: Seed of the transpiler's stochastic passes, None to keep the current one.
+    """
+    global _pass_manager
+    if optimization_level is not None and optimization_level not in range(4):
+        raise ValueError(f"Optimization level must be between 0 and 3, got {optimization_level}.")
+    if basis_gates is not None:
+        _configuration["basis_gates"] = list(basis_gates)
+    if optimization_level is not None:
+        _configuration["optimization_level"] = optimization_level
+    if seed is not None:
+        _configuration["seed"] = seed
+    _pass_manager = None
 
-pass_manager = generate_preset_pass_manager(
-    optimization_level=3,
-    basis_gates=['rx', 'ry', 'rz', 'cz'],  # Universal gate-set: rotational.
-    # approximation_degree=0.99, # Uncomment for approximation.
-    backend=backend,
-)
 
 # # from https://quantumcomputing.stackexchange.com/questions/25672/remove-inactive-qubits-from-qiskit-circuit
 # def remove_idle_wires(circ : QuantumCircuit):
@@ -22,7 +73,7 @@ pass_manager = generate_preset_pass_manager(
 #     return dag_to_circuit(dag)
 
 def auto_opt(circuit: QuantumCircuit) -> QuantumCircuit:
-    circuit = pass_manager.run(circuit)
+    circuit = get_pass_manager().run(circuit)
     return circuit
 
 # Too bad performance to use in resource analysis :(
@@ -0,0 +1,134 @@
+import hashlib
+from collections import Counter
+
+from qiskit import QuantumCircuit
+from qiskit.circuit import ControlFlowOp
+
+from api.StructuralHash import is_composite_operation
+from resource_estimation.automatic_optimisation import auto_opt
+
+
+# Resources of a block: (gate counts, depth, cz depth, indices of the qubits it acts on).
+
+
+def hierarchical_resources(circuit: QuantumCircuit) -> dict:
+    """
+    Estimates the resources of a circuit after automatic optimisation, without transpiling the flattened circuit.
+
+    The instruction hierarchy (e.g. appended component circuits) is walked, where an instruction appended
+    several times is only walked once, and every distinct block, identified by a structural digest,
+    is only evaluated once:
+    Blocks consisting only of standard gates are transpiled with auto_opt, all other blocks are composed from
+    the resources of their sub-blocks.
+    Counts are summed and depths are composed by scheduling each block as a barrier on the qubits it acts on.
+    As blocks are optimised separately, the values deviate slightly from transpiling the flattened circuit
+    (no optimisation across block boundaries, but also none of its heuristic losses on huge circuits).
+    Control flow (e.g. conditional resets) is counted as a single operation, as in the transpiled circuit.
+
+    :param circuit: The circuit.
+    :return: Dictionary with the keys gate_count, gate_depth, cz_count, cz_depth and count_ops.
+    """
+    memo = {}
+    digest, resources = _block_resources(circuit, memo, {})
+    counts, depth, cz_depth, active = resources
+    return {
+        "gate_count": sum(counts.values()),
+        "gate_depth": depth,
+        "cz_count": counts.get('cz', 0),
+        "cz_depth": cz_depth,
+        "count_ops": dict(counts),
+    }
+
+
+def _primitive_digest(operation) -> str:
+    if isinstance(operation, ControlFlowOp):
+        # Never shared, the blocks of control flow are not digested.
+        return f"{operation.name}@{id(operation)}"
+    return (f"{operation.name}|{operation.num_qubits}|{operation.num_clbits}|{operation.params}"
+            f"|{getattr(operation, 'ctrl_state', None)}")
+
+
+def _transpiled_resources(circuit: QuantumCircuit, active: tuple) -> tuple:
+    optimized = auto_opt(circuit)
+    return (
+        Counter(dict(optimized.count_ops())),
+        optimized.depth(),
+        optimized.depth(lambda gate: gate[0].name in ['cz']),
+        active
+    )
+
+
+def _primitive_resources(operation, memo: dict) -> tuple:
+    if isinstance(operation, ControlFlowOp):
+        # Its condition refers to bits of the enclosing circuit, transpilation keeps it as a single operation.
+        return Counter({operation.name: 1}), 1, 0, tuple(range(operation.num_qubits))
+    digest = _primitive_digest(operation)
+    if digest not in memo:
+        circuit = QuantumCircuit(operation.num_qubits, operation.num_clbits)
+        circuit.append(operation, range(operation.num_qubits), range(operation.num_clbits))
+        memo[digest] = _transpiled_resources(circuit, tuple(range(operation.num_qubits)))
+    return memo[digest]
+
+
+def _block_resources(circuit: QuantumCircuit, memo: dict, walked: dict) -> (str, tuple):
+    """
+    :param memo: Resources by digest, so that structurally identical blocks are only transpiled once.
+    :param walked: Operation, digest and resources by id of the operation, so that every block
+     (e.g. an instruction appended several times) is only walked once.
+    :return: The digest and the resources of the circuit.
+    """
+    qubit_indices = {qubit: i for i, qubit in enumerate(circuit.qubits)}
+    clbit_indices = {clbit: i for i, clbit in enumerate(circuit.clbits)}
+
+    entries = []
+    is_leaf = True
+    for instruction in circuit.data:
+        operation = instruction.operation
+        qubits = tuple(qubit_indices[qubit] for qubit in instruction.qubits)
+        clbits = tuple(clbit_indices[clbit] for clbit in instruction.clbits)
+        if is_composite_operation(operation):
+            is_leaf = False
+            if id(operation) not in walked:
+                # Keep the operation alive, as its id could otherwise be reused.
+                walked[id(operation)] = (operation, *_block_resources(operation.definition, memo, walked))
+            _, digest, resources = walked[id(operation)]
+        else:
+            # Only evaluated if this block is not a leaf.
+            digest, resources = _primitive_digest(operation), None
+        entries.append((digest, resources, operation, qubits, clbits))
+
+    digest = hashlib.sha1(repr((
+        circuit.num_qubits,
+        circuit.num_clbits,
+        [(entry[0], entry[3], entry[4]) for entry in entries]
+    )).encode()).hexdigest()
+
+    if digest in memo:
+        return digest, memo[digest]
+
+    active = tuple(sorted({qubit for entry in entries for qubit in entry[3]}))
+
+    if is_leaf:
+        resources = _transpiled_resources(circuit, active)
+    else:
+        counts = Counter()
+        times = [0] * circuit.num_qubits
+        cz_times = [0] * circuit.num_qubits
+        for _, sub_resources, operation, qubits, _ in entries:
+            if sub_resources is None:
+                sub_resources = _primitive_resources(operation, memo)
+            sub_counts, sub_depth, sub_cz_depth, sub_active = sub_resources
+            counts.update(sub_counts)
+
+            sub_qubits = [qubits[i] for i in sub_active]
+            if len(sub_qubits) == 0:
+                continue
+            start = max(times[qubit] for qubit in sub_qubits)
+            cz_start = max(cz_times[qubit] for qubit in sub_qubits)
+            for qubit in sub_qubits:
+                times[qubit] = start + sub_depth
+                cz_times[qubit] = cz_start + sub_cz_depth
+        resources = (counts, max(times, default=0), max(cz_times, default=0), active)
+
+    memo[digest] = resources
+    return digest, resources
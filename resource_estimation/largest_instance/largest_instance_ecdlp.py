@@ -58,7 +58,7 @@ for j in range(0, n + 1):
 simulator = AerSimulator()
 
 CircuitChooser()._metric = gate_count_metric
-circuit = generate_preset_pass_manager(backend=simulator, optimization_level=3).run(shors_ecdlp(points, p))
+circuit = generate_preset_pass_manager(backend=simulator, optimization_level=3).run(shors_ecdlp(points, p, max_qubits=simulator.num_qubits))
 
 # Allow circuit to run on our backend.
 job = simulator.run(circuit, shots=shots)
@@ -12,8 +12,8 @@ sys.path.insert(0, "../")
 
 from api.CircuitChooser import CircuitChooser
 from api.Metrics import gate_count_metric, gate_depth_metric, cz_count_metric, cz_depth_metric, \
-    gate_count_metric_circuit, cz_count_metric_circuit, gate_depth_metric_circuit, \
-    cz_depth_metric_circuit  # , t_count_metric_circuit, t_depth_metric_circuit
+    metric_bundle_circuit  # , t_count_metric_circuit, t_depth_metric_circuit
+from api.PersistentCache import enable_persistent_cache
 from impl.shors.Shors_DLP import shors_dlp
 from impl_tests.testutil import num_non_idle_qubits
 
@@ -25,14 +25,15 @@ choice_metrics = {
     "cz_count": cz_count_metric,
     "cz_depth": cz_depth_metric,
 }
-eval_metrics = {
-    "gate_count": gate_count_metric_circuit,
-    "gate_depth": gate_depth_metric_circuit,
-    "cz_count": cz_count_metric_circuit,
-    "cz_depth": cz_depth_metric_circuit,
-    # "t_count": t_count_metric_circuit,
-    # "t_depth": t_depth_metric_circuit,
-}
+# Evaluated from a single transpilation of the final circuit.
+eval_metrics = [
+    "gate_count",
+    "gate_depth",
+    "cz_count",
+    "cz_depth",
+    # "t_count",
+    # "t_depth",
+]
 n = int(sys.argv[1])  # Number of bits.
 choice_metric_key = sys.argv[2]  # metric
 # gate_count
@@ -53,6 +54,10 @@ if not os.path.exists(results_directory):
 
 filename = f"{results_directory}/{choice_metric_key}_{n}.json"
 
+# Optionally reuse metric values and selections from earlier runs (also across processes).
+if os.environ.get("DLP_CACHE_PATH") is not None:
+    enable_persistent_cache(os.environ["DLP_CACHE_PATH"])
+
 if os.path.exists(filename):
     print("Terminating due to already existing output file.")
     sys.exit(0)
@@ -96,14 +101,15 @@ for g, b, p in instances:
     else:
         raise ValueError(f"Width '{width}' is not supported.")
 
-    for key, eval_metric in eval_metrics.items():
-        full_results[key].append(eval_metric(circuit))
+    bundle = metric_bundle_circuit(circuit)
+    for key in eval_metrics:
+        full_results[key].append(bundle[key])
 
     full_results["qubit_count"].append(num_non_idle_qubits(circuit))
 
 total_time = time.time() - start_time
 
-for key, eval_metric in eval_metrics.items():
+for key in eval_metrics:
     full_results[key + "_average"] = sum(full_results[key]) / len(full_results[key])
 
 data = {
@@ -9,8 +9,9 @@ sys.path.insert(0, "../")
 
 from api.CircuitChooser import CircuitChooser
 from api.Metrics import gate_count_metric, gate_depth_metric, cz_count_metric, cz_depth_metric, \
-    gate_count_metric_circuit, cz_count_metric_circuit, gate_depth_metric_circuit, \
-    cz_depth_metric_circuit  # , t_count_metric_circuit, t_depth_metric_circuit
+    metric_bundle_circuit  # , t_count_metric_circuit, t_depth_metric_circuit
+from api.PersistentCache import enable_persistent_cache
+from resource_estimation.hierarchical_counting import hierarchical_resources
 from impl.shors.Shors_ECDLP import shors_ecdlp
 from impl_tests.testutil import num_non_idle_qubits
 from impl.classical_ec.elliptic_curves import point_doubling, get_curve
@@ -23,14 +24,15 @@ choice_metrics = {
     "cz_count": cz_count_metric,
     "cz_depth": cz_depth_metric,
 }
-eval_metrics = {
-    "gate_count": gate_count_metric_circuit,
-    "gate_depth": gate_depth_metric_circuit,
-    "cz_count": cz_count_metric_circuit,
-    "cz_depth": cz_depth_metric_circuit,
-    # "t_count": t_count_metric_circuit,
-    # "t_depth": t_depth_metric_circuit,
-}
+# Evaluated from a single transpilation of the final circuit.
+eval_metrics = [
+    "gate_count",
+    "gate_depth",
+    "cz_count",
+    "cz_depth",
+    # "t_count",
+    # "t_depth",
+]
 n = int(sys.argv[1])  # Number of bits.
 choice_metric_key = sys.argv[2]  # metric
 # gate_count
@@ -51,6 +53,10 @@ if not os.path.exists(results_directory):
 
 filename = f"{results_directory}/{choice_metric_key}_{n}.json"
 
+# Optionally reuse metric values and selections from earlier runs (also across processes).
+if os.environ.get("ECDLP_CACHE_PATH") is not None:
+    enable_persistent_cache(os.environ["ECDLP_CACHE_PATH"])
+
 if os.path.exists(filename):
     print("Terminating due to already existing output file.")
     sys.exit(0)
@@ -107,14 +113,19 @@ for elliptic_curve, P, Q in instances:
     else:
         raise ValueError(f"Width '{width}' is not supported.")
 
-    for key, eval_metric in eval_metrics.items():
-        full_results[key].append(eval_metric(circuit))
+    if os.environ.get("ECDLP_HIERARCHICAL_COUNTING") is not None:
+        # Count every distinct sub-circuit once instead of transpiling the flattened circuit (for large n).
+        resources = hierarchical_resources(circuit)
+    else:
+        resources = metric_bundle_circuit(circuit)
+    for key in eval_metrics:
+        full_results[key].append(resources[key])
 
     full_results["qubit_count"].append(num_non_idle_qubits(circuit))
 
 total_time = time.time() - start_time
 
-for key, eval_metric in eval_metrics.items():
+for key in eval_metrics:
     full_results[key + "_average"] = sum(full_results[key]) / len(full_results[key])
 
 # make instances serializable: